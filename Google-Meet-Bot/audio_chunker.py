@@ -0,0 +1,128 @@
+import os
+import re
+import tempfile
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Leave room for the WAV header so a chunk never lands exactly on the limit
+WAV_HEADER_ALLOWANCE = 4096
+
+
+@dataclass
+class AudioChunk:
+    """A slice of a recording, with its position in the original file"""
+    path: str
+    start_seconds: float
+    end_seconds: float
+
+
+class AudioChunker:
+    """Split oversized recordings at quiet points into upload-sized, overlapping chunks"""
+
+    def __init__(self, max_chunk_bytes=None):
+        if max_chunk_bytes is None:
+            max_chunk_bytes = int(os.getenv('MAX_AUDIO_SIZE_BYTES', 20 * 1024 * 1024))
+        self.max_chunk_bytes = max_chunk_bytes
+        self.overlap_seconds = float(os.getenv('CHUNK_OVERLAP_SECONDS', 1.5))
+        self.search_seconds = float(os.getenv('CHUNK_SEARCH_SECONDS', 20))
+        self.frame_ms = 50
+
+    def frame_energies(self, data, frame_length, block_frames=1200):
+        """RMS energy per frame, computed block by block so memory stays flat"""
+        total_frames = len(data) // frame_length
+        energies = np.empty(total_frames, dtype=np.float32)
+        for first in range(0, total_frames, block_frames):
+            last = min(first + block_frames, total_frames)
+            block = np.asarray(data[first * frame_length:last * frame_length], dtype=np.float32)
+            if block.ndim > 1:
+                block = block.mean(axis=1)
+            frames = block.reshape(last - first, frame_length)
+            energies[first:last] = np.sqrt(np.mean(frames * frames, axis=1))
+        return energies
+
+    def plan_cuts(self, energies, frame_length, total_samples, max_samples, overlap_samples, search_samples):
+        """Pick (start, end) sample ranges that end in the quietest frame of each search window"""
+        ranges = []
+        start = 0
+        while start < total_samples:
+            ideal_cut = start + max_samples - overlap_samples
+            if start + max_samples >= total_samples:
+                ranges.append((start, total_samples))
+                break
+
+            window_start = max(start + overlap_samples + frame_length, ideal_cut - search_samples)
+            first_frame = window_start // frame_length
+            last_frame = max(first_frame + 1, ideal_cut // frame_length)
+            window = energies[first_frame:last_frame]
+            if len(window):
+                cut = (first_frame + int(np.argmin(window))) * frame_length + frame_length // 2
+            else:
+                cut = ideal_cut
+            cut = min(cut, ideal_cut)
+
+            ranges.append((start, min(cut + overlap_samples, total_samples)))
+            start = cut
+        return ranges
+
+    def split(self, audio_file_path, output_dir=None) -> List[AudioChunk]:
+        """Return the chunks to upload; a recording under the limit comes back unchanged"""
+        from scipy.io import wavfile
+
+        sample_rate, data = wavfile.read(audio_file_path, mmap=True)
+        total_samples = len(data)
+        channels = 1 if data.ndim == 1 else data.shape[1]
+        bytes_per_sample = data.dtype.itemsize * channels
+        duration = total_samples / sample_rate
+
+        max_samples = (self.max_chunk_bytes - WAV_HEADER_ALLOWANCE) // bytes_per_sample
+        if total_samples <= max_samples:
+            return [AudioChunk(audio_file_path, 0.0, duration)]
+
+        frame_length = max(1, int(sample_rate * self.frame_ms / 1000))
+        overlap_samples = int(self.overlap_seconds * sample_rate)
+        search_samples = int(self.search_seconds * sample_rate)
+        if overlap_samples * 4 >= max_samples:
+            overlap_samples = max_samples // 8
+        search_samples = min(search_samples, max_samples // 4)
+
+        energies = self.frame_energies(data, frame_length)
+        ranges = self.plan_cuts(energies, frame_length, total_samples,
+                                max_samples, overlap_samples, search_samples)
+
+        if output_dir is None:
+            output_dir = tempfile.mkdtemp(prefix='audio_chunks_')
+        stem = os.path.splitext(os.path.basename(audio_file_path))[0]
+
+        chunks = []
+        for index, (start, end) in enumerate(ranges):
+            chunk_path = os.path.join(output_dir, f'{stem}_chunk{index:03d}.wav')
+            wavfile.write(chunk_path, sample_rate, np.asarray(data[start:end]))
+            chunks.append(AudioChunk(chunk_path, start / sample_rate, end / sample_rate))
+        return chunks
+
+
+def _normalize_word(word):
+    return re.sub(r"[^\w']", '', word.lower())
+
+
+def stitch_transcripts(texts, max_overlap_words=30, min_overlap_words=2):
+    """Join chunk transcripts in order, dropping words repeated across each overlap"""
+    words = []
+    for text in texts:
+        if not text:
+            continue
+        incoming = text.split()
+        if words:
+            tail = [_normalize_word(w) for w in words[-max_overlap_words:]]
+            head = [_normalize_word(w) for w in incoming[:max_overlap_words]]
+            for size in range(min(len(tail), len(head)), min_overlap_words - 1, -1):
+                if tail[-size:] == head[:size] and any(head[:size]):
+                    incoming = incoming[size:]
+                    break
+        words.extend(incoming)
+    return ' '.join(words)
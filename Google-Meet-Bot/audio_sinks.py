@@ -0,0 +1,54 @@
+import shutil
+import subprocess
+import sys
+
+
+def pulse_available():
+    """True on Linux hosts where pactl and parec can reach a PulseAudio/PipeWire server"""
+    if not sys.platform.startswith('linux'):
+        return False
+    if not (shutil.which('pactl') and shutil.which('parec')):
+        return False
+    return subprocess.run(['pactl', 'info'], stdout=subprocess.DEVNULL,
+                          stderr=subprocess.DEVNULL).returncode == 0
+
+
+class PulseSink:
+    """A PulseAudio null-sink owned by one meeting session.
+
+    Chrome started with PULSE_SINK=<name> plays only into this sink, and
+    "<name>.monitor" carries exactly that audio, so several bots on one host
+    never hear each other.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.module_index = None
+
+    @property
+    def monitor(self):
+        return f'{self.name}.monitor'
+
+    def create(self):
+        output = subprocess.run(
+            ['pactl', 'load-module', 'module-null-sink', f'sink_name={self.name}',
+             f'sink_properties=device.description={self.name}'],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        self.module_index = output.strip()
+        print(f"[AUDIO_SINK] Created {self.name} (module {self.module_index})")
+        return self
+
+    def remove(self):
+        if self.module_index is None:
+            return
+        subprocess.run(['pactl', 'unload-module', self.module_index],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        print(f"[AUDIO_SINK] Removed {self.name}")
+        self.module_index = None
+
+    def __enter__(self):
+        return self.create()
+
+    def __exit__(self, *exc):
+        self.remove()
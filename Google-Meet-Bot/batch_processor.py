@@ -0,0 +1,284 @@
+"""Re-run transcription and analysis over archived recordings.
+
+Takes a directory of recordings (e.g. the backend's audio_files) or a manifest
+and runs the pipeline over a thread or process pool. At most --workers items
+run at once. Each input gets one result JSON in the output directory, written
+atomically. The result records a fingerprint of the settings that shape it
+(models, prompts, compaction, transcription backend). A rerun skips inputs whose
+result is already complete for the current fingerprint, so an interrupted batch
+resumes where it stopped. Changing GPT_MODEL or a prompt reprocesses everything;
+unchanged audio still hits the transcription cache, so only the GPT analysis is
+paid for again.
+
+    python batch_processor.py ../meetmind-backend/audio_files --output-dir results/ --workers 8
+    python cli.py batch manifest.json --executor process --workers 4
+"""
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from dotenv import load_dotenv
+
+import tracing
+from disk_cache import make_key
+
+load_dotenv()
+
+TRANSCRIPT_EXTENSIONS = ('.txt', '.md')
+# What the analysis methods return instead of raising when GPT fails
+ANALYSIS_FALLBACK_MARKERS = ('unavailable due to processing error', '(analysis unavailable)')
+
+_local = threading.local()
+
+
+def discover_inputs(source, pattern='*.wav'):
+    """Input paths from a directory (matched with pattern, ** recurses) or a manifest.
+
+    A manifest is a JSON list of paths or {"path": ...} objects, or a text file with
+    one path per line. Relative paths are resolved against the manifest's folder.
+    Returns (base directory, paths).
+    """
+    if os.path.isdir(source):
+        paths = glob.glob(os.path.join(source, pattern), recursive=True)
+        return source, sorted(path for path in paths if os.path.isfile(path))
+    base = os.path.dirname(os.path.abspath(source))
+    with open(source, 'r', encoding='utf-8') as f:
+        if source.lower().endswith('.json'):
+            entries = [entry['path'] if isinstance(entry, dict) else entry for entry in json.load(f)]
+        else:
+            entries = [line.strip() for line in f if line.strip() and not line.lstrip().startswith('#')]
+    return base, [entry if os.path.isabs(entry) else os.path.join(base, entry) for entry in entries]
+
+
+def result_name(path, base):
+    """Stable, collision-free result file name for an input"""
+    relative = os.path.relpath(os.path.abspath(path), os.path.abspath(base))
+    if relative.startswith(os.pardir):
+        relative = os.path.abspath(path).lstrip(os.sep)
+    stem = relative.replace(os.sep, '__').replace(':', '')
+    return f"{stem}.json"
+
+
+def settings_fingerprint(stt):
+    """Hash of every setting that changes a result; a new fingerprint means reprocess"""
+    import speech_to_text
+
+    prompts = {name: value for name, value in vars(speech_to_text).items() if name.endswith('_PROMPT')}
+    return make_key(
+        stt.transcription_backend.identity(),
+        stt.WHISPER_LANGUAGE,
+        stt.GPT_MODEL,
+        stt.ANALYSIS_MODE,
+        prompts,
+        speech_to_text.MEETING_MINUTES_SCHEMA,
+        stt.TRANSCRIPT_COMPACTION and (stt.compactor.remove_fillers, stt.compactor.min_loop_repeats,
+                                       stt.compactor.max_loop_words),
+    )[:16]
+
+
+def is_done(result_path, fingerprint):
+    try:
+        with open(result_path, 'r', encoding='utf-8') as f:
+            result = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return result.get('status') == 'ok' and result.get('fingerprint') == fingerprint
+
+
+def write_result(result_path, result):
+    directory = os.path.dirname(os.path.abspath(result_path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=2, ensure_ascii=False, default=str)
+    os.replace(tmp_path, result_path)
+
+
+def _worker_stt():
+    """One SpeechToText per worker thread (or process); instances keep per-run state"""
+    stt = getattr(_local, 'stt', None)
+    if stt is None:
+        from speech_to_text import SpeechToText
+
+        stt = _local.stt = SpeechToText()
+    return stt
+
+
+def _init_process_worker(requests_per_minute, tokens_per_minute):
+    # Every process has its own gateway, so each gets an equal slice of the budget
+    os.environ['OPENAI_RPM'] = str(requests_per_minute)
+    os.environ['OPENAI_TPM'] = str(tokens_per_minute)
+
+
+def process_item(path, result_path, fingerprint):
+    """Transcribe (unless the input is a transcript) and analyze one input; returns its result"""
+    from speech_to_text import read_wav_header
+
+    started = time.perf_counter()
+    result = {
+        'input': path,
+        'fingerprint': fingerprint,
+        'started_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'audio_seconds': None,
+    }
+    try:
+        stt = _worker_stt()
+        # The instance is reused across items; don't report the previous item's numbers
+        stt.analysis_timings = {}
+        stt.last_compaction = None
+        if path.lower().endswith(TRANSCRIPT_EXTENSIONS):
+            with open(path, 'r', encoding='utf-8') as f:
+                transcription = f.read()
+        else:
+            sample_rate, channels, bits, data_bytes = read_wav_header(path)
+            result['audio_seconds'] = data_bytes / float(sample_rate * channels * (bits // 8))
+            transcription = stt.transcribe_recording(path)
+            if transcription is None:
+                raise RuntimeError("transcription failed")
+        summary = stt.analyze_transcription(transcription, save=False)
+        failed = [key for key, value in summary.items()
+                  if any(marker in str(value) for marker in ANALYSIS_FALLBACK_MARKERS)]
+        result.update({
+            'status': 'partial' if failed else 'ok',
+            'summary': summary,
+            'transcription': transcription,
+            'timings': stt.analysis_timings,
+            'compaction': stt.last_compaction.to_dict() if stt.last_compaction is not None else None,
+        })
+        if failed:
+            result['error'] = f"analysis failed for: {', '.join(failed)}"
+    except Exception as e:
+        traceback.print_exc()
+        result.update({'status': 'failed', 'error': f"{type(e).__name__}: {e}"})
+    result['seconds'] = time.perf_counter() - started
+    write_result(result_path, result)
+    return {key: result[key] for key in ('input', 'status', 'seconds', 'audio_seconds')}
+
+
+def throughput_stats(outcomes, wall_seconds, skipped):
+    seconds = sorted(outcome['seconds'] for outcome in outcomes)
+    audio_seconds = sum(outcome['audio_seconds'] or 0 for outcome in outcomes)
+    statuses = [outcome['status'] for outcome in outcomes]
+    return {
+        'processed': len(outcomes),
+        'ok': statuses.count('ok'),
+        'partial': statuses.count('partial'),
+        'failed': statuses.count('failed'),
+        'skipped': skipped,
+        'wall_seconds': wall_seconds,
+        'items_per_minute': len(outcomes) / wall_seconds * 60 if wall_seconds else 0.0,
+        'audio_hours': audio_seconds / 3600,
+        # Hours of audio processed per hour of wall time
+        'audio_speedup': audio_seconds / wall_seconds if wall_seconds else 0.0,
+        'item_seconds_p50': statistics.median(seconds) if seconds else None,
+        'item_seconds_p95': seconds[min(len(seconds) - 1, int(len(seconds) * 0.95))] if seconds else None,
+    }
+
+
+def run_batch(paths, base, output_dir, workers, executor='thread', force=False):
+    """Process paths with at most `workers` in flight; returns the throughput summary"""
+    from speech_to_text import SpeechToText
+
+    os.makedirs(output_dir, exist_ok=True)
+    fingerprint = settings_fingerprint(SpeechToText())
+    pending = []
+    skipped = 0
+    for path in paths:
+        result_path = os.path.join(output_dir, result_name(path, base))
+        if not force and is_done(result_path, fingerprint):
+            skipped += 1
+        else:
+            pending.append((path, result_path))
+    print(f"[BATCH] {len(paths)} inputs: {skipped} already done, {len(pending)} to process "
+          f"({workers} {executor} workers, settings {fingerprint})", flush=True)
+
+    if executor == 'process':
+        share = max(1, workers)
+        # Spawn, not fork: the parent already runs the gateway's event loop thread
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                   initializer=_init_process_worker,
+                                   initargs=(int(os.getenv('OPENAI_RPM', 500)) // share,
+                                             int(os.getenv('OPENAI_TPM', 200000)) // share))
+    else:
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='batch')
+
+    outcomes = []
+    started = time.perf_counter()
+    queue = iter(pending)
+    in_flight = set()
+    with pool:
+        while True:
+            # Submit lazily so thousands of inputs never sit in the pool's queue at once
+            for path, result_path in queue:
+                in_flight.add(pool.submit(process_item, path, result_path, fingerprint))
+                if len(in_flight) >= workers * 2:
+                    break
+            if not in_flight:
+                break
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                outcome = future.result()
+                outcomes.append(outcome)
+                tracing.count(f'batch.{outcome["status"]}')
+                elapsed = time.perf_counter() - started
+                print(f"[BATCH] {len(outcomes)}/{len(pending)} {outcome['status']} "
+                      f"{os.path.basename(outcome['input'])} in {outcome['seconds']:.1f}s "
+                      f"({len(outcomes) / elapsed * 60:.1f} items/min)", flush=True)
+
+    stats = throughput_stats(outcomes, time.perf_counter() - started, skipped)
+    stats.update({'fingerprint': fingerprint, 'workers': workers, 'executor': executor})
+    write_result(os.path.join(output_dir, 'batch_summary.json'), stats)
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="cli.py batch",
+                                     description="Reprocess archived recordings or transcripts in parallel")
+    parser.add_argument("source", help="Directory of recordings, or a manifest (.json list or one path per line)")
+    parser.add_argument("--output-dir", dest="output_dir", default=os.getenv('BATCH_OUTPUT_DIR', 'batch_results'),
+                        help="Where per-input result JSON and batch_summary.json are written")
+    parser.add_argument("--pattern", default=os.getenv('BATCH_PATTERN', '*.wav'),
+                        help="Glob for directory sources ('**/*.wav' recurses, '*.txt' for transcripts)")
+    parser.add_argument("--workers", type=int, default=int(os.getenv('BATCH_WORKERS', 4)),
+                        help="Inputs processed at the same time")
+    parser.add_argument("--executor", choices=["thread", "process"], default=os.getenv('BATCH_EXECUTOR', 'thread'),
+                        help="'process' for CPU-bound setups (local Whisper, heavy preprocessing)")
+    parser.add_argument("--limit", type=int, default=None, help="Only process the first N inputs")
+    parser.add_argument("--force", action="store_true", help="Reprocess inputs that already have a result")
+    args = parser.parse_args(argv)
+
+    if sys.platform == 'win32':
+        try:
+            sys.stdout.reconfigure(encoding='utf-8')
+        except Exception:
+            pass
+
+    base, paths = discover_inputs(args.source, args.pattern)
+    if args.limit is not None:
+        paths = paths[:args.limit]
+    if not paths:
+        raise SystemExit(f"No inputs found in {args.source}")
+
+    tracing.start_run('batch')
+    try:
+        stats = run_batch(paths, base, args.output_dir, max(1, args.workers), args.executor, args.force)
+    finally:
+        tracing.finish_run()
+    print(f"[BATCH] Done: {stats['ok']} ok, {stats['partial']} partial, {stats['failed']} failed, "
+          f"{stats['skipped']} skipped in {stats['wall_seconds']:.1f}s "
+          f"({stats['items_per_minute']:.1f} items/min, {stats['audio_speedup']:.1f}x real time)", flush=True)
+    print(f"[BATCH] Results in {os.path.abspath(args.output_dir)}", flush=True)
+    if stats['failed']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
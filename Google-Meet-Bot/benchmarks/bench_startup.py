@@ -0,0 +1,145 @@
+"""Startup cost of the CLI entry points and imports, each in a fresh interpreter.
+
+Every case is timed over several cold runs (median wall time). One extra run
+under ``python -X importtime`` lists which heavy stacks got imported. The
+analysis-only cases must never import the browser or audio stacks; if they do,
+the benchmark fails.
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --repeat 10 --baseline benchmarks/results/startup-20240101-120000.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BOT_DIR = os.path.dirname(BENCH_DIR)
+SRC_DIR = os.path.join(BOT_DIR, 'src')
+
+# name -> (python arguments, modules it must not import)
+CASES = {
+    'interpreter': (['-c', 'pass'], []),
+    'cli --help': (['cli.py', '--help'], ['selenium', 'sounddevice', 'scipy', 'openai']),
+    'cli analyze --help': (['cli.py', 'analyze', '--help'], ['selenium', 'sounddevice', 'scipy', 'openai']),
+    'import speech_to_text': (['-c', 'import speech_to_text'], ['selenium', 'sounddevice', 'scipy']),
+    'import join_google_meet': (['-c', 'import join_google_meet'], []),
+    'package import': (['-c', 'import google_meet_bot'], ['selenium', 'sounddevice', 'scipy', 'openai']),
+    'package analyze --help': (['-m', 'google_meet_bot', 'analyze', '--help'],
+                               ['selenium', 'sounddevice', 'scipy', 'openai']),
+}
+# Top-level packages worth reporting when they show up in an import trace
+HEAVY_MODULES = ['selenium', 'sounddevice', 'scipy', 'numpy', 'openai', 'tiktoken', 'psutil', 'faster_whisper']
+
+
+def child_env():
+    path = os.pathsep.join(filter(None, [SRC_DIR, os.environ.get('PYTHONPATH')]))
+    return dict(os.environ, PYTHONPATH=path)
+
+
+def time_case(arguments, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        process = subprocess.run([sys.executable] + arguments, cwd=BOT_DIR, env=child_env(),
+                                 stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        samples.append(time.perf_counter() - started)
+        if process.returncode != 0:
+            return None, process.stderr.strip().splitlines()[-1:] or ['failed']
+    return samples, None
+
+
+def import_profile(arguments):
+    """Import microseconds per heavy top-level package, from -X importtime"""
+    process = subprocess.run([sys.executable, '-X', 'importtime'] + arguments, cwd=BOT_DIR, env=child_env(),
+                             stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    loaded = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        own, _, name = line[len('import time:'):].split('|', 2)
+        # Summing each module's own time counts a package once, however its submodules nest
+        package = name.strip().split('.')[0]
+        if package in HEAVY_MODULES and own.strip().isdigit():
+            loaded[package] = loaded.get(package, 0) + int(own)
+    return loaded
+
+
+def compare(results, baseline, tolerance):
+    previous = {case['case']: case for case in baseline.get('cases', [])}
+    regressions = []
+    for case in results['cases']:
+        before = previous.get(case['case'])
+        if before is None or case.get('median_seconds') is None or not before.get('median_seconds'):
+            continue
+        now, then = case['median_seconds'], before['median_seconds']
+        if now > then * (1 + tolerance):
+            regressions.append(f"{case['case']}: {then * 1000:.0f} ms -> {now * 1000:.0f} ms "
+                               f"(+{(now / then - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure CLI and import startup time")
+    parser.add_argument("--repeat", type=int, default=5, help="Cold runs per case (median is reported)")
+    parser.add_argument("--cases", default=','.join(CASES), help="Comma-separated case names")
+    parser.add_argument("--output", default=None, help="Result JSON (default: benchmarks/results/startup-<time>.json)")
+    parser.add_argument("--baseline", help="Earlier result JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown before flagging")
+    args = parser.parse_args()
+
+    results = {
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'cases': [],
+    }
+    problems = []
+    for name in [name.strip() for name in args.cases.split(',') if name.strip()]:
+        if name not in CASES:
+            raise SystemExit(f"Unknown case: {name} (choose from {', '.join(CASES)})")
+        arguments, forbidden = CASES[name]
+        samples, error = time_case(arguments, args.repeat)
+        if samples is None:
+            print(f"[BENCH] {name}: failed ({error[0]})", flush=True)
+            results['cases'].append({'case': name, 'error': error[0]})
+            continue
+        loaded = import_profile(arguments)
+        median = statistics.median(samples)
+        results['cases'].append({
+            'case': name,
+            'median_seconds': median,
+            'min_seconds': min(samples),
+            'imports_ms': {module: micros / 1000 for module, micros in loaded.items()},
+        })
+        heavy = ', '.join(f"{module} {micros / 1000:.0f} ms" for module, micros in
+                          sorted(loaded.items(), key=lambda item: -item[1]) if micros >= 1000) or 'none'
+        print(f"[BENCH] {name}: {median * 1000:.0f} ms median (min {min(samples) * 1000:.0f} ms); "
+              f"heavy imports: {heavy}", flush=True)
+        for module in forbidden:
+            if module in loaded:
+                problems.append(f"{name} imported {module}")
+
+    output = args.output or os.path.join(BENCH_DIR, 'results', f"startup-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"[BENCH] Results written to {output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            problems += compare(results, json.load(f), args.tolerance)
+    for message in problems:
+        print(f"[BENCH] ⚠️ Regression: {message}")
+    if problems:
+        sys.exit(1)
+    print("[BENCH] ✅ Startup within limits")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""Local stand-in for the OpenAI transcription and chat endpoints.
+
+Answers /v1/audio/transcriptions and /v1/chat/completions with synthetic
+content after a configurable delay, and counts requests and bytes so
+benchmarks can report exactly what the pipeline would have uploaded.
+
+    python benchmarks/mock_openai.py --port 8799 --transcription-latency 2 --chat-latency 1.5
+    OPENAI_BASE_URL=http://127.0.0.1:8799/v1 OPENAI_API_KEY=mock python cli.py ...
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+WORDS = ("we agreed to ship the release next week and review the budget with the design team "
+         "before the customer call while marketing prepares the launch notes and support updates "
+         "the onboarding guide").split()
+
+
+def synthetic_text(words):
+    out = []
+    for i in range(words):
+        out.append(WORDS[i % len(WORDS)])
+        if i % 15 == 14:
+            out[-1] += '.'
+    return ' '.join(out).capitalize() + '.'
+
+
+class MockStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.transcription_requests = 0
+            self.chat_requests = 0
+            self.bytes_uploaded = 0
+            self.audio_bytes = 0
+            self.prompt_chars = 0
+
+    def add(self, **counts):
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'transcription_requests': self.transcription_requests,
+                'chat_requests': self.chat_requests,
+                'bytes_uploaded': self.bytes_uploaded,
+                'audio_bytes': self.audio_bytes,
+                'prompt_chars': self.prompt_chars,
+            }
+
+
+def make_handler(stats, transcription_latency, chat_latency, seconds_per_mb, bytes_per_word):
+    class MockHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status, body, content_type='application/json'):
+            if not isinstance(body, bytes):
+                body = json.dumps(body).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _read_body(self):
+            length = int(self.headers.get('Content-Length', 0))
+            body = self.rfile.read(length)
+            stats.add(bytes_uploaded=length)
+            return body
+
+        def do_GET(self):
+            if self.path.rstrip('/') == '/stats':
+                return self._send(200, stats.snapshot())
+            self._send(404, {'error': 'not found'})
+
+        def do_POST(self):
+            path = self.path.split('?')[0].rstrip('/')
+            if path == '/reset':
+                stats.reset()
+                return self._send(200, {'status': 'ok'})
+            body = self._read_body()
+            if path.endswith('/audio/transcriptions'):
+                return self._transcription(body)
+            if path.endswith('/chat/completions'):
+                return self._chat(json.loads(body or b'{}'))
+            self._send(404, {'error': 'not found'})
+
+        def _transcription(self, body):
+            stats.add(transcription_requests=1, audio_bytes=len(body))
+            time.sleep(transcription_latency + seconds_per_mb * len(body) / 2**20)
+            text = synthetic_text(max(5, len(body) // bytes_per_word))
+            if b'name="response_format"\r\n\r\ntext' in body:
+                return self._send(200, text.encode('utf-8'), 'text/plain; charset=utf-8')
+            self._send(200, {'text': text})
+
+        def _chat(self, request):
+            prompt_chars = sum(len(str(message.get('content', ''))) for message in request.get('messages', []))
+            stats.add(chat_requests=1, prompt_chars=prompt_chars)
+            time.sleep(chat_latency)
+            if (request.get('response_format') or {}).get('type') == 'json_schema':
+                content = json.dumps({
+                    'abstract_summary': synthetic_text(40),
+                    'key_points': [synthetic_text(10) for _ in range(3)],
+                    'action_items': [synthetic_text(8) for _ in range(2)],
+                    'sentiment': 'Positive',
+                })
+            else:
+                content = synthetic_text(60)
+            self._send(200, {
+                'id': 'chatcmpl-mock',
+                'object': 'chat.completion',
+                'created': int(time.time()),
+                'model': request.get('model', 'mock'),
+                'choices': [{'index': 0, 'finish_reason': 'stop',
+                             'message': {'role': 'assistant', 'content': content}}],
+                'usage': {'prompt_tokens': prompt_chars // 4, 'completion_tokens': len(content) // 4,
+                          'total_tokens': (prompt_chars + len(content)) // 4},
+            })
+
+    return MockHandler
+
+
+def start_server(host='127.0.0.1', port=0, transcription_latency=0.0, chat_latency=0.0,
+                 seconds_per_mb=0.0, bytes_per_word=2000):
+    """Start the mock on a background thread; returns (server, stats, base_url)"""
+    stats = MockStats()
+    handler = make_handler(stats, transcription_latency, chat_latency, seconds_per_mb, bytes_per_word)
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="mock-openai", daemon=True).start()
+    return server, stats, f"http://{host}:{server.server_address[1]}/v1"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a local OpenAI stand-in for benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8799)
+    parser.add_argument("--transcription-latency", type=float, default=1.0, help="Seconds per transcription request")
+    parser.add_argument("--chat-latency", type=float, default=1.0, help="Seconds per chat completion")
+    parser.add_argument("--seconds-per-mb", type=float, default=0.2, help="Extra transcription delay per uploaded MB")
+    args = parser.parse_args()
+
+    server, _, base_url = start_server(args.host, args.port, args.transcription_latency,
+                                       args.chat_latency, args.seconds_per_mb)
+    print(f"[MOCK_OPENAI] Serving on {base_url} (GET /stats, POST /reset)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
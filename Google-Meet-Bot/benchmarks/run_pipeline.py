@@ -0,0 +1,237 @@
+"""End-to-end benchmark of SpeechToText.transcribe against a local OpenAI stand-in.
+
+Every case runs in its own interpreter with cold caches, so wall time and peak
+RSS are per case. The mock server counts the bytes the pipeline uploads.
+Results are written as JSON; pass --baseline to compare with an earlier run
+and exit non-zero on regressions.
+
+    python benchmarks/run_pipeline.py                       # bundled WAVs + 10 and 60 min synthetic
+    python benchmarks/run_pipeline.py --cases synthetic:180 --transcription-latency 3
+    python benchmarks/run_pipeline.py --baseline benchmarks/results/pipeline-20240101-120000.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:  # Windows: peak RSS is not reported
+    resource = None
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from mock_openai import start_server  # noqa: E402
+from synth_audio import write_synthetic_meeting  # noqa: E402
+
+DEFAULT_CASES = "test_audio.wav,test_recording.wav,synthetic:10,synthetic:60"
+RESULT_MARKER = "[BENCH_RESULT] "
+
+# SpeechToText methods timed in the child (cumulative seconds and call count)
+TIMED_METHODS = [
+    'transcribe_recording', 'downmix_resample', 'trim_silence', 'encode_for_upload',
+    'transcribe_audio', 'compact_transcript', 'analyze_transcription', 'meeting_minutes', '_complete',
+]
+# Settings recorded with each run so results are only compared like for like
+RECORDED_SETTINGS = [
+    'AUDIO_PREPROCESS', 'UPLOAD_FORMAT', 'VAD_TRIM', 'TRANSCRIBE_WORKERS', 'ANALYSIS_MODE',
+    'PARALLEL_ANALYSIS', 'ANALYSIS_WORKERS', 'MAX_AUDIO_SIZE_BYTES', 'GPT_MODEL', 'TRANSCRIPT_COMPACTION',
+]
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes on Linux
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 1024
+
+
+def run_child(audio_path):
+    """Run one transcription in this process and print the measurements as one JSON line"""
+    sys.path.insert(0, BOT_DIR)
+    import functools
+    import threading
+
+    import tracing
+    from speech_to_text import SpeechToText
+
+    stages = {}
+    lock = threading.Lock()
+
+    def timed(name, method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started
+                with lock:
+                    stage = stages.setdefault(name, {'seconds': 0.0, 'calls': 0})
+                    stage['seconds'] += elapsed
+                    stage['calls'] += 1
+        return wrapper
+
+    started = time.perf_counter()
+    stt = SpeechToText()
+    init_seconds = time.perf_counter() - started
+    for name in TIMED_METHODS:
+        if hasattr(stt, name):
+            setattr(stt, name, timed(name, getattr(stt, name)))
+    stt.chunker.split = timed('chunker.split', stt.chunker.split)
+
+    started = time.perf_counter()
+    result = stt.transcribe(audio_path)
+    wall = time.perf_counter() - started
+    print(RESULT_MARKER + json.dumps({
+        'init_seconds': init_seconds,
+        'wall_seconds': wall,
+        'stages': stages,
+        'analysis_timings': stt.analysis_timings,
+        'trace_stages': tracing.tracer.stage_summary(),
+        'trace_counters': dict(tracing.tracer.counters),
+        'peak_rss_mb': peak_rss_mb(),
+        'result_fields': sorted(result),
+        'summary_chars': len(str(result.get('abstract_summary', ''))),
+    }), flush=True)
+
+
+def resolve_case(case, work_dir):
+    if case.startswith('synthetic:'):
+        minutes = float(case.split(':', 1)[1])
+        path = os.path.join(work_dir, f'synthetic_{minutes:g}min.wav')
+        if not os.path.exists(path):
+            print(f"[BENCH] Writing {minutes:g} min synthetic recording...", flush=True)
+            write_synthetic_meeting(path, minutes)
+        return path
+    path = case if os.path.isabs(case) else os.path.join(BOT_DIR, case)
+    if not os.path.exists(path):
+        raise SystemExit(f"Benchmark input not found: {path}")
+    return path
+
+
+def run_case(case, audio_path, base_url, stats, keep_cache, verbose):
+    env = dict(os.environ, OPENAI_BASE_URL=base_url, OPENAI_API_KEY='mock', PYTHONUNBUFFERED='1')
+    if not keep_cache:
+        cache_dir = tempfile.mkdtemp(prefix='bench_cache_')
+        env['TRANSCRIPTION_CACHE_DIR'] = os.path.join(cache_dir, 'transcriptions')
+        env['ANALYSIS_CACHE_DIR'] = os.path.join(cache_dir, 'analyses')
+    stats.reset()
+    started = time.perf_counter()
+    process = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', audio_path],
+                             cwd=BOT_DIR, env=env, capture_output=True, text=True, encoding='utf-8')
+    elapsed = time.perf_counter() - started
+    if verbose or process.returncode != 0:
+        sys.stdout.write(process.stdout)
+        sys.stderr.write(process.stderr)
+    measurements = None
+    for line in process.stdout.splitlines():
+        if line.startswith(RESULT_MARKER):
+            measurements = json.loads(line[len(RESULT_MARKER):])
+    if measurements is None:
+        raise RuntimeError(f"{case}: benchmark child failed (exit {process.returncode})")
+    measurements.update({
+        'case': case,
+        'audio_path': audio_path,
+        'audio_bytes': os.path.getsize(audio_path),
+        'process_seconds': elapsed,
+        'openai': stats.snapshot(),
+    })
+    return measurements
+
+
+def compare(results, baseline, tolerance):
+    """Regression messages for cases that got slower, bigger or uploaded more than the baseline"""
+    previous = {case['case']: case for case in baseline.get('cases', [])}
+    regressions = []
+    for case in results['cases']:
+        before = previous.get(case['case'])
+        if before is None:
+            continue
+        checks = [
+            ('wall_seconds', case['wall_seconds'], before['wall_seconds']),
+            ('peak_rss_mb', case.get('peak_rss_mb'), before.get('peak_rss_mb')),
+            ('bytes_uploaded', case['openai']['bytes_uploaded'], before['openai']['bytes_uploaded']),
+        ]
+        for metric, now, then in checks:
+            if now is not None and then and now > then * (1 + tolerance):
+                regressions.append(f"{case['case']}: {metric} {then:.1f} -> {now:.1f} (+{(now / then - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the transcription pipeline offline")
+    parser.add_argument("--cases", default=DEFAULT_CASES,
+                        help="Comma-separated WAV paths (relative to the bot folder) or synthetic:<minutes>")
+    parser.add_argument("--transcription-latency", type=float, default=0.5, help="Mock seconds per transcription")
+    parser.add_argument("--chat-latency", type=float, default=0.5, help="Mock seconds per chat completion")
+    parser.add_argument("--seconds-per-mb", type=float, default=0.1, help="Mock transcription delay per uploaded MB")
+    parser.add_argument("--work-dir", default=os.path.join(tempfile.gettempdir(), 'meetmind-bench'),
+                        help="Where synthetic recordings are generated and reused")
+    parser.add_argument("--output", default=None, help="Result JSON (default: benchmarks/results/pipeline-<time>.json)")
+    parser.add_argument("--baseline", help="Earlier result JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown/growth before flagging")
+    parser.add_argument("--keep-cache", action="store_true", help="Use the normal caches instead of cold ones")
+    parser.add_argument("--verbose", action="store_true", help="Show the pipeline's own output")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        return run_child(args.child)
+
+    os.makedirs(args.work_dir, exist_ok=True)
+    server, stats, base_url = start_server(transcription_latency=args.transcription_latency,
+                                           chat_latency=args.chat_latency,
+                                           seconds_per_mb=args.seconds_per_mb)
+    print(f"[BENCH] Mock OpenAI at {base_url}", flush=True)
+
+    results = {
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'mock': {'transcription_latency': args.transcription_latency,
+                 'chat_latency': args.chat_latency, 'seconds_per_mb': args.seconds_per_mb},
+        'settings': {name: os.getenv(name) for name in RECORDED_SETTINGS if os.getenv(name) is not None},
+        'cases': [],
+    }
+    try:
+        for case in [case.strip() for case in args.cases.split(',') if case.strip()]:
+            audio_path = resolve_case(case, args.work_dir)
+            measurement = run_case(case, audio_path, base_url, stats, args.keep_cache, args.verbose)
+            results['cases'].append(measurement)
+            openai_stats = measurement['openai']
+            rss = measurement['peak_rss_mb']
+            rss_text = f", peak RSS {rss:.0f} MB" if rss is not None else ""
+            print(f"[BENCH] {case}: {measurement['wall_seconds']:.2f}s{rss_text}, "
+                  f"uploaded {openai_stats['bytes_uploaded'] / 2**20:.2f} MB in "
+                  f"{openai_stats['transcription_requests']} transcription and "
+                  f"{openai_stats['chat_requests']} chat requests", flush=True)
+    finally:
+        server.shutdown()
+
+    output = args.output or os.path.join(BENCH_DIR, 'results', f"pipeline-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"[BENCH] Results written to {output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for message in regressions:
+            print(f"[BENCH] ⚠️ Regression: {message}")
+        if regressions:
+            sys.exit(1)
+        print("[BENCH] ✅ No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
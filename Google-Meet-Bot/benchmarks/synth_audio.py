@@ -0,0 +1,53 @@
+"""Synthetic meeting recordings for benchmarks.
+
+Writes speech-like bursts (amplitude-modulated harmonics) separated by pauses
+and occasional long silences, block by block, so multi-hour files never have
+to fit in memory. Defaults match what AudioRecorder produces.
+
+    python benchmarks/synth_audio.py --minutes 180 --output /tmp/meeting_3h.wav
+"""
+import argparse
+import wave
+
+import numpy as np
+
+
+def write_synthetic_meeting(path, minutes, sample_rate=44100, channels=2, seed=0, block_seconds=10):
+    rng = np.random.default_rng(seed)
+    total = int(minutes * 60 * sample_rate)
+    block_frames = int(block_seconds * sample_rate)
+    with wave.open(path, 'wb') as out:
+        out.setnchannels(channels)
+        out.setsampwidth(2)
+        out.setframerate(sample_rate)
+        written = 0
+        while written < total:
+            frames = min(block_frames, total - written)
+            t = (written + np.arange(frames)) / sample_rate
+            pitch = 110 + 40 * rng.random()
+            voice = sum(np.sin(2 * np.pi * pitch * k * t) / k for k in range(1, 5))
+            syllables = 0.5 * (1 + np.sin(2 * np.pi * 4 * t)) ** 2
+            # Talk for ~70% of each block, then pause; every sixth block is silent
+            talking = (t % block_seconds) < block_seconds * 0.7
+            if (written // block_frames) % 6 == 5:
+                talking[:] = False
+            signal = 0.25 * voice * syllables * talking + 0.002 * rng.standard_normal(frames)
+            pcm = (np.clip(signal, -1, 1) * 32767).astype(np.int16)
+            out.writeframes(np.repeat(pcm[:, None], channels, axis=1).tobytes())
+            written += frames
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic meeting recording")
+    parser.add_argument("--minutes", type=float, required=True)
+    parser.add_argument("--output", required=True)
+    parser.add_argument("--sample-rate", type=int, default=44100)
+    parser.add_argument("--channels", type=int, default=2)
+    args = parser.parse_args()
+    write_synthetic_meeting(args.output, args.minutes, args.sample_rate, args.channels)
+    print(f"[SYNTH] Wrote {args.minutes:g} min to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
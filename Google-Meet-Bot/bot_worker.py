@@ -0,0 +1,321 @@
+"""Resident bot worker.
+
+Keeps selenium, scipy, sounddevice and the OpenAI client loaded in one long-lived
+process and accepts meeting/analyze jobs over a local HTTP API, so each meeting no
+longer pays interpreter start-up and import costs.
+
+    POST /jobs                 {"type": "meeting", "meet_link": ..., "duration": 60, "bot_name": ...}
+                               {"type": "analyze", "audio_path": ...}
+    GET  /jobs/<id>            job status and result
+    GET  /jobs/<id>/events     progress events as NDJSON, streamed until the job finishes
+    GET  /health               worker status
+"""
+import argparse
+import itertools
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from dotenv import load_dotenv
+
+import tracing
+from driver_pool import DriverPool
+from join_google_meet import JoinGoogleMeet, session_profile_dir
+from live_transcriber import LiveTranscriber
+from openai_gateway import get_gateway
+from speech_to_text import SpeechToText
+
+load_dotenv()
+
+
+class Job:
+    """One unit of work plus the ordered progress events it has produced"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, params):
+        self.id = f"job-{next(self._ids)}-{int(time.time())}"
+        self.type = params.get('type', 'meeting')
+        self.params = params
+        self.status = 'queued'
+        self.result = None
+        self.error = None
+        self.finished_at = None
+        self.events = []
+        self._changed = threading.Condition()
+        self.emit('queued', job_type=self.type)
+
+    @property
+    def finished(self):
+        return self.status in ('completed', 'failed')
+
+    def emit(self, event, **fields):
+        record = {'event': event, 'job': self.id, 'time': time.time()}
+        record.update(fields)
+        with self._changed:
+            self.events.append(record)
+            self._changed.notify_all()
+
+    def finish(self, status, result=None, error=None):
+        self.result = result
+        self.error = error
+        self.status = status
+        self.finished_at = time.monotonic()
+        self.emit(status, result=result, error=error)
+
+    def wait_for_events(self, after, timeout=15):
+        """Block until there are events past index 'after' or the job is finished"""
+        with self._changed:
+            self._changed.wait_for(lambda: len(self.events) > after or self.finished, timeout)
+            return self.events[after:]
+
+    def snapshot(self):
+        return {
+            'id': self.id,
+            'type': self.type,
+            'status': self.status,
+            'result': self.result,
+            'error': self.error,
+            'events': len(self.events),
+        }
+
+
+class BotWorker:
+    """Runs jobs on a bounded pool, sharing warm state between them"""
+
+    def __init__(self, max_jobs, browsers=0):
+        self.max_jobs = max_jobs
+        self.driver_pool = None
+        if browsers > 0:
+            self.driver_pool = DriverPool(browsers)
+            self.driver_pool.start(background=True)
+        self.jobs = {}
+        # Finished jobs stay queryable for a while, then are dropped with their results and events
+        self.job_ttl = float(os.getenv('BOT_WORKER_JOB_TTL', 3600))
+        self.max_finished_jobs = int(os.getenv('BOT_WORKER_MAX_FINISHED_JOBS', 100))
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_jobs, thread_name_prefix='bot-job')
+        # One gateway for every job keeps HTTP connections alive and shares the rate budget
+        self.openai_client = get_gateway()
+
+    def submit(self, params):
+        job = Job(params)
+        with self._lock:
+            self._evict()
+            self.jobs[job.id] = job
+        self._pool.submit(self._run, job)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            self._evict()
+            return self.jobs.get(job_id)
+
+    def _evict(self):
+        """Drop finished jobs past BOT_WORKER_JOB_TTL, then the oldest beyond BOT_WORKER_MAX_FINISHED_JOBS"""
+        now = time.monotonic()
+        finished = sorted((job for job in self.jobs.values() if job.finished), key=lambda job: job.finished_at)
+        expired = [job for job in finished if now - job.finished_at > self.job_ttl]
+        expired += finished[len(expired):max(len(expired), len(finished) - self.max_finished_jobs)]
+        for job in expired:
+            del self.jobs[job.id]
+
+    def status(self):
+        with self._lock:
+            jobs = list(self.jobs.values())
+        return {
+            'status': 'ok',
+            'max_jobs': self.max_jobs,
+            'running': sum(1 for job in jobs if job.status == 'running'),
+            'queued': sum(1 for job in jobs if job.status == 'queued'),
+            'finished': sum(1 for job in jobs if job.finished),
+        }
+
+    def _run(self, job):
+        job.status = 'running'
+        job.emit('started')
+        started = time.perf_counter()
+        # Each job traces into its own tracer, exported and released when the job ends
+        with tracing.run(job.type):
+            try:
+                if job.type == 'analyze':
+                    result = self._analyze(job)
+                elif job.type == 'meeting':
+                    result = self._meeting(job)
+                else:
+                    raise ValueError(f"Unknown job type: {job.type}")
+                result['elapsed_seconds'] = time.perf_counter() - started
+                job.finish('completed', result=result)
+            except Exception as e:
+                traceback.print_exc()
+                job.finish('failed', error=str(e))
+
+    def _stage(self, job, stage, **fields):
+        print(f"[WORKER] {job.id} → {stage}", flush=True)
+        job.emit('stage', stage=stage, **fields)
+
+    def _analyze(self, job):
+        audio_path = job.params['audio_path']
+        if not os.path.exists(audio_path):
+            raise FileNotFoundError(audio_path)
+        self._stage(job, 'transcribing', audio_path=audio_path)
+        stt = SpeechToText(client=self.openai_client)
+        summary = stt.transcribe(audio_path)
+        return {'audio_path': audio_path, 'summary': summary, 'timings': stt.analysis_timings}
+
+    def _meeting(self, job):
+        params = job.params
+        if not params.get('meet_link'):
+            raise ValueError("meet_link is required")
+        duration = int(params.get('duration', 60))
+        audio_path = params.get('audio_path') or os.path.join(tempfile.mkdtemp(), 'output.wav')
+        job.emit('audio_path', audio_path=audio_path)
+
+        stt = SpeechToText(client=self.openai_client)
+        live = LiveTranscriber(stt) if params.get('live') else None
+
+        def on_segment(index, path):
+            job.emit('segment', index=index, path=path)
+            if live is not None:
+                live.submit(index, path)
+
+        if self.driver_pool is not None:
+            self._stage(job, 'browser')
+            bot = self.driver_pool.checkout(timeout=float(os.getenv('BOT_WORKER_CHECKOUT_TIMEOUT', 30)))
+        else:
+            self._stage(job, 'login')
+            # Jobs run side by side and Chrome will not share a user-data-dir
+            bot = JoinGoogleMeet(profile_dir=session_profile_dir(job.id))
+            bot.Glogin()
+        try:
+            self._stage(job, 'joining', meet_link=params['meet_link'])
+            bot.joinMeetingWithName(params['meet_link'], params.get('bot_name', 'MeetMind Bot'))
+            self._stage(job, 'recording', duration=duration)
+            bot.recordMeeting(audio_path, duration, on_segment=on_segment)
+        finally:
+            self._stage(job, 'leaving')
+            if self.driver_pool is not None:
+                bot.leaveMeeting(quit_browser=False)
+                self.driver_pool.release(bot)
+            else:
+                try:
+                    bot.leaveMeeting()
+                finally:
+                    shutil.rmtree(bot.profile_dir, ignore_errors=True)
+
+        result = {'audio_path': audio_path, 'summary': None}
+        if not os.path.exists(audio_path):
+            raise RuntimeError(f"Audio file not created at {audio_path}")
+        if params.get('analyze', True):
+            self._stage(job, 'transcribing')
+            transcription = live.finish() if live else None
+            if transcription:
+                self._stage(job, 'analyzing')
+                result['summary'] = stt.analyze_transcription(transcription)
+            else:
+                result['summary'] = stt.transcribe(audio_path)
+            result['timings'] = stt.analysis_timings
+        return result
+
+
+def make_handler(worker):
+    class WorkerHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            print(f"[WORKER_HTTP] {self.address_string()} {format % args}", flush=True)
+
+        def _send_json(self, status, payload):
+            body = json.dumps(payload, default=str).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            parts = [part for part in self.path.split('?')[0].split('/') if part]
+            if parts == ['health']:
+                return self._send_json(200, worker.status())
+            if len(parts) >= 2 and parts[0] == 'jobs':
+                job = worker.get(parts[1])
+                if job is None:
+                    return self._send_json(404, {'error': 'unknown job'})
+                if len(parts) == 2:
+                    return self._send_json(200, job.snapshot())
+                if parts[2:] == ['events']:
+                    return self._stream_events(job)
+            self._send_json(404, {'error': 'not found'})
+
+        def do_POST(self):
+            if self.path.rstrip('/') != '/jobs':
+                return self._send_json(404, {'error': 'not found'})
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+                params = json.loads(self.rfile.read(length) or b'{}')
+            except ValueError:
+                return self._send_json(400, {'error': 'invalid JSON body'})
+            job = worker.submit(params)
+            self._send_json(202, {'id': job.id, 'events': f'/jobs/{job.id}/events'})
+
+        def _stream_events(self, job):
+            # NDJSON over a plain response that ends when the job does
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/x-ndjson')
+            self.send_header('Connection', 'close')
+            self.end_headers()
+            sent = 0
+            try:
+                while True:
+                    events = job.wait_for_events(sent)
+                    for event in events:
+                        self.wfile.write((json.dumps(event, default=str) + '\n').encode('utf-8'))
+                    self.wfile.flush()
+                    sent += len(events)
+                    if job.finished and sent >= len(job.events):
+                        break
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+            self.close_connection = True
+
+    return WorkerHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a resident Google Meet bot worker")
+    parser.add_argument("--host", default=os.getenv('BOT_WORKER_HOST', '127.0.0.1'), help="Address to bind")
+    parser.add_argument("--port", type=int, default=int(os.getenv('BOT_WORKER_PORT', 8765)), help="Port to bind")
+    parser.add_argument("--max-jobs", dest="max_jobs", type=int, default=int(os.getenv('BOT_WORKER_MAX_JOBS', 2)),
+                        help="Jobs run at the same time; the rest wait in the queue")
+    parser.add_argument("--browsers", type=int, default=None,
+                        help="Signed-in Chrome sessions kept warm (default: BOT_WORKER_BROWSERS or --max-jobs; 0 disables)")
+    args = parser.parse_args()
+    if args.browsers is None:
+        args.browsers = int(os.getenv('BOT_WORKER_BROWSERS', args.max_jobs))
+
+    if sys.platform == 'win32':
+        try:
+            sys.stdout.reconfigure(encoding='utf-8')
+        except Exception:
+            pass
+
+    worker = BotWorker(args.max_jobs, args.browsers)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(worker))
+    print(f"[WORKER] Listening on http://{args.host}:{args.port} (max {args.max_jobs} jobs)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("[WORKER] Shutting down", flush=True)
+    finally:
+        server.server_close()
+        if worker.driver_pool is not None:
+            worker.driver_pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import base64
+import os
+
+import numpy as np
+from dotenv import load_dotenv
+
+from driver_lock import driver_lock
+
+load_dotenv()
+
+# Runs in the Meet tab before any page script (Page.addScriptToEvaluateOnNewDocument).
+# Every remote WebRTC audio track is mixed in a WebAudio graph running at the capture
+# rate, so the browser does the resampling and we only ever ship mono int16 PCM.
+CAPTURE_JS = r"""
+(() => {
+    if (window.__meetmindAudio) return;
+    const SAMPLE_RATE = %(sample_rate)d;
+    const MAX_BUFFERED = SAMPLE_RATE * %(max_buffer_seconds)d;
+    const state = {chunks: [], buffered: 0, dropped: 0, tracks: 0, context: null, mix: null};
+    window.__meetmindAudio = state;
+
+    function graph() {
+        if (state.context) return state.context;
+        const context = new AudioContext({sampleRate: SAMPLE_RATE});
+        const mix = context.createGain();
+        const processor = context.createScriptProcessor(4096, 1, 1);
+        const mute = context.createGain();
+        mute.gain.value = 0;  // the processor only runs when connected; keep it inaudible
+        processor.onaudioprocess = event => {
+            const input = event.inputBuffer.getChannelData(0);
+            if (state.buffered + input.length > MAX_BUFFERED) {
+                state.dropped += input.length;
+                return;
+            }
+            const pcm = new Int16Array(input.length);
+            for (let i = 0; i < input.length; i++) {
+                const s = Math.max(-1, Math.min(1, input[i]));
+                pcm[i] = s < 0 ? s * 0x8000 : s * 0x7fff;
+            }
+            state.chunks.push(pcm);
+            state.buffered += pcm.length;
+        };
+        mix.connect(processor);
+        processor.connect(mute);
+        mute.connect(context.destination);
+        state.context = context;
+        state.mix = mix;
+        return context;
+    }
+
+    function tap(track) {
+        if (track.kind !== 'audio') return;
+        const context = graph();
+        context.resume();
+        context.createMediaStreamSource(new MediaStream([track])).connect(state.mix);
+        state.tracks += 1;
+    }
+
+    const NativePeerConnection = window.RTCPeerConnection;
+    if (NativePeerConnection) {
+        window.RTCPeerConnection = function (...args) {
+            const connection = new NativePeerConnection(...args);
+            connection.addEventListener('track', event => tap(event.track));
+            return connection;
+        };
+        window.RTCPeerConnection.prototype = NativePeerConnection.prototype;
+        Object.setPrototypeOf(window.RTCPeerConnection, NativePeerConnection);
+    }
+
+    state.drain = () => {
+        const pcm = new Int16Array(state.buffered);
+        let offset = 0;
+        for (const chunk of state.chunks) {
+            pcm.set(chunk, offset);
+            offset += chunk.length;
+        }
+        state.chunks = [];
+        state.buffered = 0;
+        const bytes = new Uint8Array(pcm.buffer);
+        let binary = '';
+        for (let i = 0; i < bytes.length; i += 0x8000) {
+            binary += String.fromCharCode.apply(null, bytes.subarray(i, i + 0x8000));
+        }
+        const dropped = state.dropped;
+        state.dropped = 0;
+        return {pcm: btoa(binary), dropped: dropped, tracks: state.tracks};
+    };
+})();
+"""
+
+DRAIN_JS = "return window.__meetmindAudio ? window.__meetmindAudio.drain() : null;"
+
+
+class BrowserAudioTap:
+    """Captures the remote audio of one Meet tab from inside the browser.
+
+    No loopback device or desktop audio stack is needed, each tab is captured on
+    its own, and the samples arrive already mono at the capture rate.
+    """
+
+    def __init__(self, driver, sample_rate=None):
+        if sample_rate is None:
+            sample_rate = int(os.getenv('BROWSER_CAPTURE_SAMPLE_RATE', 16000))
+        self.driver = driver
+        self.sample_rate = sample_rate
+        self.poll_seconds = float(os.getenv('BROWSER_CAPTURE_POLL_SECONDS', 0.5))
+        self.max_buffer_seconds = int(os.getenv('BROWSER_CAPTURE_BUFFER_SECONDS', 60))
+        self.tracks = 0
+        self.dropped_frames = 0
+
+    def install(self):
+        """Register the capture script for every document this tab loads from now on"""
+        source = CAPTURE_JS % {'sample_rate': self.sample_rate, 'max_buffer_seconds': self.max_buffer_seconds}
+        with driver_lock(self.driver):
+            self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': source})
+        print(f"[BROWSER_AUDIO] Capture script installed ({self.sample_rate} Hz mono)")
+
+    def drain(self):
+        """All PCM captured since the last drain, as an (n, 1) int16 array"""
+        # The meeting monitor scripts the same tab from its own thread
+        with driver_lock(self.driver):
+            result = self.driver.execute_script(DRAIN_JS)
+        if not result:
+            return np.zeros((0, 1), dtype=np.int16)
+        self.tracks = result.get('tracks', 0)
+        self.dropped_frames += result.get('dropped', 0)
+        pcm = np.frombuffer(base64.b64decode(result['pcm']), dtype=np.int16)
+        return pcm.reshape(-1, 1)
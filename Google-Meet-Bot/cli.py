@@ -1,10 +1,89 @@
 import argparse
+import json
 import os
 import tempfile
 import sys
 
-from join_google_meet import JoinGoogleMeet
-from speech_to_text import SpeechToText
+import tracing
+from events import open_event_stream
+
+# The browser, audio and OpenAI stacks are imported where they are used, so
+# `analyze` and --help start without selenium, sounddevice/PortAudio or scipy.
+
+
+def _format_field(value):
+    """Keep a result field on one line so each marker stays parseable"""
+    if isinstance(value, list):
+        if not value:
+            return 'None'
+        return ' '.join(f"{i}. {item}" for i, item in enumerate(value, 1))
+    return value
+
+
+def _print_result(result):
+    print("\n" + "="*60, flush=True)
+    print("[TRANSCRIPTION_COMPLETE]", flush=True)
+    print("="*60, flush=True)
+    
+    # IMPORTANT: Print each field on separate line with marker
+    print(f"[SUMMARY] {_format_field(result.get('abstract_summary', 'N/A'))}", flush=True)
+    print(f"[KEY_POINTS] {_format_field(result.get('key_points', 'N/A'))}", flush=True)
+    print(f"[ACTION_ITEMS] {_format_field(result.get('action_items', 'N/A'))}", flush=True)
+    
+    print("="*60, flush=True)
+
+
+def _add_event_arguments(parser):
+    parser.add_argument("--events", dest="events", choices=["none", "json"], default=os.getenv('CLI_EVENTS', 'none'),
+                        help="Also write NDJSON progress events and the final result to --events-fd")
+    parser.add_argument("--events-fd", dest="events_fd", type=int, default=int(os.getenv('CLI_EVENTS_FD', 3)),
+                        help="File descriptor for --events json (1 moves the log to stderr)")
+
+
+def analyze(argv):
+    """Transcribe and analyze an existing recording, or analyze a transcript, without joining a meeting"""
+    parser = argparse.ArgumentParser(prog="cli.py analyze",
+                                     description="Analyze an existing recording or transcript (no browser or audio device needed)")
+    parser.add_argument("input", help="WAV recording, or a transcript text file (.txt/.md or --transcript)")
+    parser.add_argument("--transcript", dest="transcript", action="store_true",
+                        help="Treat the input as a transcript rather than audio")
+    parser.add_argument("--output", dest="output", help="Also write the result JSON to this path")
+    _add_event_arguments(parser)
+    args = parser.parse_args(argv)
+    events = open_event_stream(args.events, args.events_fd)
+    run_id = tracing.start_run('analyze')
+    is_transcript = args.transcript or args.input.lower().endswith(('.txt', '.md'))
+    events.emit('started', input=args.input, transcript=is_transcript)
+
+    try:
+        from speech_to_text import SpeechToText
+
+        stt = SpeechToText()
+        with events.stage('analysis'):
+            if is_transcript:
+                with open(args.input, 'r', encoding='utf-8') as f:
+                    result = stt.analyze_transcription(f.read())
+            else:
+                result = stt.transcribe(args.input)
+        events.emit('result', input=args.input,
+                    timings=dict(events.timings, **{f'analysis.{name}': seconds
+                                                    for name, seconds in stt.analysis_timings.items()}),
+                    **result)
+        _print_result(result)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(result, f, indent=2, ensure_ascii=False)
+            print(f"[OUTPUT] {args.output}", flush=True)
+        print("[PROCESS_COMPLETE] Analysis finished successfully", flush=True)
+        events.emit('complete', status='ok', timings=events.timings)
+    except Exception as e:
+        print(f"[ERROR] Analysis failed: {str(e)}", flush=True)
+        events.emit('complete', status='failed', error=str(e), timings=events.timings)
+        sys.exit(1)
+    finally:
+        for path in tracing.finish_run():
+            events.emit('trace', path=path, run_id=run_id)
+        events.close()
 
 
 def main():
@@ -14,11 +93,30 @@ def main():
         except:
             pass
     
-    parser = argparse.ArgumentParser(description="Join Google Meet, record, and transcribe")
+    if len(sys.argv) > 1 and sys.argv[1] == 'analyze':
+        return analyze(sys.argv[2:])
+    if len(sys.argv) > 1 and sys.argv[1] == 'batch':
+        from batch_processor import main as batch_main
+        return batch_main(sys.argv[2:])
+    
+    parser = argparse.ArgumentParser(description="Join Google Meet, record, and transcribe",
+                                     epilog="Use 'cli.py analyze --help' to process an existing recording or transcript, "
+                                            "or 'cli.py batch --help' to reprocess many.")
     parser.add_argument("--meet-link", dest="meet_link", required=True, help="Google Meet link")
     parser.add_argument("--duration", dest="duration", type=int, default=60, help="Recording duration in seconds")
     parser.add_argument("--bot-name", dest="bot_name", default="MeetMind Bot", help="Bot display name")
+    parser.add_argument("--live", dest="live", action="store_true",
+                        default=os.getenv('LIVE_TRANSCRIPTION', 'false').lower() == 'true',
+                        help="Transcribe finished audio segments while the meeting is still running")
+    _add_event_arguments(parser)
     args = parser.parse_args()
+    
+    from join_google_meet import JoinGoogleMeet
+    from live_transcriber import LiveTranscriber
+    from speech_to_text import SpeechToText
+    
+    events = open_event_stream(args.events, args.events_fd)
+    run_id = tracing.start_run('meeting')
 
     temp_dir = tempfile.mkdtemp()
     audio_path = os.path.join(temp_dir, "output.wav")
@@ -27,19 +125,36 @@ def main():
     print(f"[AUDIO_PATH] {audio_path}", flush=True)
     print(f"[BOT_NAME] {args.bot_name}", flush=True)
     print(f"[DURATION] {args.duration} seconds", flush=True)
+    events.emit('started', audio_path=audio_path, bot_name=args.bot_name,
+                duration=args.duration, meet_link=args.meet_link)
 
     try:
+        live = None
+        if args.live:
+            live = LiveTranscriber(SpeechToText())
+            print("[LIVE] Live transcription enabled", flush=True)
+
+        def on_segment(index, path):
+            events.emit('segment', index=index, path=path)
+            if live is not None:
+                live.submit(index, path)
+
         # Join meeting and record
-        bot = JoinGoogleMeet()
-        bot.Glogin()
-        bot.joinMeetingWithName(args.meet_link, args.bot_name)  # Use user's name
-        bot.recordMeeting(audio_path, args.duration)
+        with events.stage('login'):
+            bot = JoinGoogleMeet()
+            bot.Glogin()
+        with events.stage('joining'):
+            bot.joinMeetingWithName(args.meet_link, args.bot_name)  # Use user's name
+        events.emit('join_timings', phases=bot.join_timings)
+        with events.stage('recording', duration=args.duration), events.ticker('recording', total=args.duration):
+            bot.recordMeeting(audio_path, args.duration, on_segment=on_segment)
         
         # Check if host left
         if bot.checkIfHostLeft():
             print("[INFO] Host left, ending session", flush=True)
         
-        bot.leaveMeeting()
+        with events.stage('leaving'):
+            bot.leaveMeeting()
 
         # Verify audio file exists
         if not os.path.exists(audio_path):
@@ -47,46 +162,55 @@ def main():
             print("[SUMMARY] Recording failed - no audio file", flush=True)
             print("[KEY_POINTS] N/A", flush=True)
             print("[ACTION_ITEMS] N/A", flush=True)
+            events.emit('error', stage='recording', message=f"Audio file not created at {audio_path}")
+            events.emit('complete', status='failed', error=f"Audio file not created at {audio_path}",
+                        timings=events.timings)
             sys.exit(1)
         
         file_size = os.path.getsize(audio_path) / (1024 * 1024)
         print(f"[AUDIO_FILE_SIZE] {file_size:.2f} MB", flush=True)
+        events.emit('audio', path=audio_path, size_bytes=os.path.getsize(audio_path), end_reason=bot.end_reason)
 
         # Transcribe and analyze
         print("\n[TRANSCRIPTION] Starting AI analysis...", flush=True)
         try:
-            stt = SpeechToText()
-            result = stt.transcribe(audio_path)
-            
-            print("\n" + "="*60, flush=True)
-            print("[TRANSCRIPTION_COMPLETE]", flush=True)
-            print("="*60, flush=True)
-            
-            # IMPORTANT: Print each field on separate line with marker
-            summary_text = result.get('abstract_summary', 'N/A')
-            print(f"[SUMMARY] {summary_text}", flush=True)
-            
-            key_points_text = result.get('key_points', 'N/A')
-            print(f"[KEY_POINTS] {key_points_text}", flush=True)
-            
-            action_items_text = result.get('action_items', 'N/A')
-            print(f"[ACTION_ITEMS] {action_items_text}", flush=True)
+            with events.stage('analysis'):
+                transcription = live.finish() if live else None
+                if transcription:
+                    stt = live.stt
+                    result = stt.analyze_transcription(transcription)
+                else:
+                    if live:
+                        print("[LIVE] No live transcript available, transcribing full recording", flush=True)
+                    stt = live.stt if live else SpeechToText()
+                    result = stt.transcribe(audio_path)
+            events.emit('result', audio_path=audio_path, end_reason=bot.end_reason,
+                        timings=dict(events.timings, **{f'analysis.{name}': seconds
+                                                        for name, seconds in stt.analysis_timings.items()}),
+                        **result)
             
-            print("="*60, flush=True)
+            _print_result(result)
             
         except Exception as e:
             print(f"[TRANSCRIPTION_ERROR] {str(e)}", flush=True)
+            events.emit('error', stage='analysis', message=str(e))
             print(f"[SUMMARY] Transcription failed but audio was recorded", flush=True)
             print(f"[KEY_POINTS] Audio recording available", flush=True)
             print(f"[ACTION_ITEMS] Check audio file for details", flush=True)
         
         print("[PROCESS_COMPLETE] Bot finished successfully", flush=True)
+        events.emit('complete', status='ok', timings=events.timings)
         
     except Exception as e:
         print(f"[ERROR] Bot execution failed: {str(e)}", flush=True)
+        events.emit('complete', status='failed', error=str(e), timings=events.timings)
         import traceback
         traceback.print_exc()
         sys.exit(1)
+    finally:
+        for path in tracing.finish_run():
+            events.emit('trace', path=path, run_id=run_id)
+        events.close()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,123 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+
+def file_digest(file_path, block_size=1024 * 1024):
+    """SHA-256 of a file's content, read in blocks"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def make_key(*parts):
+    """Stable cache key from any JSON-serializable parts"""
+    payload = json.dumps(parts, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class DiskCache:
+    """JSON values stored one file per key, capped in size with least-recently-used eviction.
+
+    Recency is tracked with file modification times, so the cache survives restarts
+    and can be shared by several processes pointing at the same directory. Entries
+    older than ttl_seconds (if set) are treated as misses and removed.
+
+    The cache is best-effort: a directory that cannot be created or written to
+    logs a warning and turns every lookup into a miss, never an error.
+    """
+
+    def __init__(self, directory, max_bytes, ttl_seconds=None):
+        self.directory = os.path.expanduser(directory)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._warned = False
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+        except OSError as e:
+            self._warn(e)
+
+    def _warn(self, error):
+        if not self._warned:
+            self._warned = True
+            print(f"⚠️ Cache at {self.directory} is not writable, continuing without caching: {error}")
+
+    def _path(self, key):
+        return os.path.join(self.directory, f'{key}.json')
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            expired = (self.ttl_seconds is not None
+                       and time.time() - entry['created_at'] > self.ttl_seconds)
+            if expired:
+                os.remove(path)
+                self._count(False)
+                return None
+            os.utime(path, None)
+            self._count(True)
+            return entry['value']
+        except (OSError, ValueError, KeyError, TypeError):
+            self._count(False)
+            return None
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses}
+
+    def set(self, key, value):
+        """Store value; returns False (after a warning) when the cache cannot be written"""
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'created_at': time.time(), 'value': value}, f, ensure_ascii=False)
+            os.replace(tmp_path, self._path(key))
+            self.evict()
+        except OSError as e:
+            if tmp_path is not None and os.path.exists(tmp_path):
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+            self._warn(e)
+            return False
+        return True
+
+    def evict(self):
+        """Drop least-recently-used entries until the cache fits in max_bytes"""
+        with self._lock:
+            entries = []
+            total = 0
+            for entry in os.scandir(self.directory):
+                if not entry.name.endswith('.json'):
+                    continue
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    pass
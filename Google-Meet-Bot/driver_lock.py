@@ -0,0 +1,21 @@
+"""One lock per WebDriver session.
+
+A WebDriver session runs one command at a time, and neither selenium nor
+chromedriver serialise calls made from different threads. The browser audio
+tap (recorder thread) and the meeting monitor (its own thread) both script the
+same tab, so each takes the driver's lock around its call.
+"""
+import threading
+import weakref
+
+_locks = weakref.WeakKeyDictionary()
+_guard = threading.Lock()
+
+
+def driver_lock(driver):
+    """The lock shared by every caller of this driver, created on first use"""
+    with _guard:
+        lock = _locks.get(driver)
+        if lock is None:
+            lock = _locks[driver] = threading.Lock()
+        return lock
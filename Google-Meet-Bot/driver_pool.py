@@ -0,0 +1,125 @@
+import os
+import queue
+import shutil
+import threading
+import time
+
+from join_google_meet import JoinGoogleMeet, session_profile_dir
+
+
+class DriverPool:
+    """Pre-launched, already signed-in Chrome sessions that meetings check out and return.
+
+    Every slot owns its own Chrome user-data-dir (Chrome refuses to share one between
+    running instances), so the Google session survives in the profile and a relaunched
+    browser usually skips the login flow entirely.
+    """
+
+    def __init__(self, size, profile_root=None):
+        if profile_root is None:
+            profile_root = os.getenv('CHROME_PROFILE_ROOT', '~/.cache/google-meet-bot/chrome-profiles')
+        self.size = size
+        self.profile_root = os.path.expanduser(profile_root)
+        self.retry_seconds = float(os.getenv('DRIVER_POOL_RETRY_SECONDS', 5))
+        self.retry_max_seconds = float(os.getenv('DRIVER_POOL_RETRY_MAX_SECONDS', 300))
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._all = []
+        self._closed = False
+        self._closing = threading.Event()
+
+    def _profile_dir(self, slot):
+        return os.path.join(self.profile_root, f'profile-{slot}')
+
+    def _launch(self, slot):
+        started = time.perf_counter()
+        bot = JoinGoogleMeet(profile_dir=self._profile_dir(slot))
+        bot.pool_slot = slot
+        try:
+            # Glogin reports failure instead of raising; an unauthenticated browser is no use to a meeting
+            if not bot.Glogin():
+                raise RuntimeError("Google login failed")
+            bot.driver.get('about:blank')
+        except Exception:
+            # Don't leave a half-started Chrome holding the slot's profile
+            try:
+                bot.driver.quit()
+            except Exception:
+                pass
+            raise
+        print(f"[POOL] Slot {slot} ready in {time.perf_counter() - started:.1f}s")
+        with self._lock:
+            self._all.append(bot)
+        self._idle.put(bot)
+
+    def start(self, background=True):
+        """Launch and sign in every slot; with background=True this returns immediately"""
+        os.makedirs(self.profile_root, exist_ok=True)
+        threads = [threading.Thread(target=self._launch_safely, args=(slot,), daemon=True)
+                   for slot in range(self.size)]
+        for thread in threads:
+            thread.start()
+        if not background:
+            for thread in threads:
+                thread.join()
+
+    def _launch_safely(self, slot):
+        """Launch a slot, retrying with exponential backoff until it starts or the pool closes"""
+        attempt = 0
+        while not self._closing.is_set():
+            try:
+                self._launch(slot)
+                return
+            except Exception as e:
+                delay = min(self.retry_max_seconds, self.retry_seconds * 2 ** attempt)
+                print(f"[POOL] ⚠️ Slot {slot} failed to start ({e}), retrying in {delay:.0f}s")
+                attempt += 1
+                if self._closing.wait(delay):
+                    return
+
+    def checkout(self, timeout=None):
+        """Take a warm browser; falls back to launching one if none frees up in time"""
+        try:
+            bot = self._idle.get(timeout=timeout)
+            print(f"[POOL] Checked out slot {bot.pool_slot}")
+            return bot
+        except queue.Empty:
+            print("[POOL] ⚠️ No warm browser available, launching a fresh one")
+            # The slots' profiles are all held by running browsers, so this one gets its own
+            bot = JoinGoogleMeet(profile_dir=session_profile_dir('checkout', self.profile_root))
+            bot.pool_slot = None
+            bot.Glogin()
+            return bot
+
+    def release(self, bot):
+        """Return a browser after its meeting; a broken one is replaced in the background"""
+        if bot.pool_slot is None or self._closed:
+            bot.driver.quit()
+            if bot.pool_slot is None:
+                shutil.rmtree(bot.profile_dir, ignore_errors=True)
+            return
+        try:
+            bot.driver.get('about:blank')
+            self._idle.put(bot)
+            print(f"[POOL] Returned slot {bot.pool_slot}")
+        except Exception as e:
+            print(f"[POOL] ⚠️ Slot {bot.pool_slot} unhealthy ({e}), relaunching")
+            with self._lock:
+                if bot in self._all:
+                    self._all.remove(bot)
+            try:
+                bot.driver.quit()
+            except Exception:
+                pass
+            threading.Thread(target=self._launch_safely, args=(bot.pool_slot,), daemon=True).start()
+
+    def close(self):
+        self._closed = True
+        self._closing.set()
+        with self._lock:
+            bots, self._all = self._all, []
+        for bot in bots:
+            try:
+                bot.driver.quit()
+            except Exception:
+                pass
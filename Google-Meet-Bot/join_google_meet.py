@@ -1,160 +1,252 @@
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import time
 import os
+import tempfile
 from dotenv import load_dotenv
 
+import tracing
+from browser_audio import BrowserAudioTap
+from meeting_monitor import MeetingMonitor, probe_meeting_state
 from record_audio import AudioRecorder
 
 load_dotenv()
 
+# True once the pre-join screen has rendered its name field or a join button
+PREJOIN_READY_JS = r"""
+if (document.querySelector('input[placeholder*="Your name"], input[aria-label*="Your name"]')) return true;
+for (const el of document.querySelectorAll('button, [role="button"]')) {
+    const text = (el.innerText || '').trim().toLowerCase();
+    if (text.includes('ask to join') || text.includes('join now')) return true;
+}
+return false;
+"""
+
+# Sets the name, turns mic and camera off and clicks join in one WebDriver round trip
+JOIN_HELPER_JS = r"""
+const botName = arguments[0];
+const result = {name: false, mic: 'not_found', camera: 'not_found', join: null};
+const visible = el => !!(el && el.offsetParent !== null);
+
+const nameInput = document.querySelector('input[placeholder*="Your name"], input[aria-label*="Your name"]');
+if (nameInput && botName && nameInput.value !== botName) {
+    const setter = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set;
+    setter.call(nameInput, botName);
+    nameInput.dispatchEvent(new Event('input', {bubbles: true}));
+    result.name = true;
+}
+
+function turnOff(keyword) {
+    for (const el of document.querySelectorAll('[aria-label]')) {
+        const label = el.getAttribute('aria-label').toLowerCase();
+        if (!label.includes(keyword) || !visible(el)) continue;
+        const muted = el.getAttribute('data-is-muted');
+        if (muted === 'true' || label.startsWith('turn on')) return 'already_off';
+        if (muted === 'false' || label.startsWith('turn off')) { el.click(); return 'turned_off'; }
+    }
+    return 'not_found';
+}
+result.mic = turnOff('microphone');
+result.camera = turnOff('camera');
+
+for (const el of document.querySelectorAll('button, [role="button"]')) {
+    const text = (el.innerText || '').trim().toLowerCase();
+    if (visible(el) && (text.includes('ask to join') || text.includes('join now'))) {
+        el.click();
+        result.join = text;
+        break;
+    }
+}
+if (!result.join) {
+    const fallback = document.querySelector('button[jsname="Qx7uuf"]');
+    if (visible(fallback)) { fallback.click(); result.join = 'jsname=Qx7uuf'; }
+}
+return result;
+"""
+
+# True once we are in the call (the leave button only exists inside a meeting)
+IN_CALL_JS = r"""
+return !!document.querySelector('button[aria-label*="Leave call"], button[aria-label*="Leave meeting"], button[jsname="CQylAd"]');
+"""
+
+
+def session_profile_dir(name, root=None):
+    """A fresh Chrome user-data-dir under root (CHROME_PROFILE_ROOT) for one concurrent browser.
+
+    Chrome refuses to share a user-data-dir between running instances, so every browser
+    launched next to others needs its own; the caller removes it once the browser quits.
+    """
+    if root is None:
+        root = os.getenv('CHROME_PROFILE_ROOT', '~/.cache/google-meet-bot/chrome-profiles')
+    root = os.path.expanduser(root)
+    os.makedirs(root, exist_ok=True)
+    return tempfile.mkdtemp(prefix=f'{name}-', dir=root)
+
+
+def chrome_options(profile_dir=None):
+    """Chrome options for the bot; profile_dir keeps cookies (and the Google session) between runs"""
+    opt = Options()
+    opt.add_argument('--disable-blink-features=AutomationControlled')
+    opt.add_argument('--start-maximized')
+    opt.add_argument('--use-fake-ui-for-media-stream')
+    opt.add_argument('--disable-infobars')
+    # Lets the in-browser capture's AudioContext run without a user gesture
+    opt.add_argument('--autoplay-policy=no-user-gesture-required')
+    if os.getenv('CHROME_HEADLESS', 'false').lower() == 'true':
+        opt.add_argument('--headless=new')
+    opt.add_experimental_option("excludeSwitches", ["enable-automation"])
+    opt.add_experimental_option('useAutomationExtension', False)
+    if profile_dir:
+        opt.add_argument(f'--user-data-dir={os.path.abspath(os.path.expanduser(profile_dir))}')
+    
+    # Auto-allow mic/camera permissions
+    opt.add_experimental_option("prefs", {
+        "profile.default_content_setting_values.media_stream_mic": 1,
+        "profile.default_content_setting_values.media_stream_camera": 1,
+        "profile.default_content_setting_values.geolocation": 1,
+        "profile.default_content_setting_values.notifications": 1
+    })
+    return opt
+
+
 class JoinGoogleMeet:
-    def __init__(self):
+    def __init__(self, driver=None, profile_dir=None, audio_sink=None):
         self.mail_address = os.getenv('EMAIL_ID')
         self.password = os.getenv('EMAIL_PASSWORD')
+        # With a PulseAudio sink, Chrome plays into it and we record its monitor source
+        self.audio_sink = audio_sink
         
-        # Chrome options
-        opt = Options()
-        opt.add_argument('--disable-blink-features=AutomationControlled')
-        opt.add_argument('--start-maximized')
-        opt.add_argument('--use-fake-ui-for-media-stream')
-        opt.add_argument('--disable-infobars')
-        opt.add_experimental_option("excludeSwitches", ["enable-automation"])
-        opt.add_experimental_option('useAutomationExtension', False)
-        
-        # Auto-allow mic/camera permissions
-        opt.add_experimental_option("prefs", {
-            "profile.default_content_setting_values.media_stream_mic": 1,
-            "profile.default_content_setting_values.media_stream_camera": 1,
-            "profile.default_content_setting_values.geolocation": 1,
-            "profile.default_content_setting_values.notifications": 1
-        })
-        
-        self.driver = webdriver.Chrome(options=opt)
+        if driver is None:
+            if profile_dir is None:
+                profile_dir = os.getenv('CHROME_PROFILE_DIR')
+            service = None
+            if audio_sink:
+                service = Service(env=dict(os.environ, PULSE_SINK=audio_sink))
+            driver = webdriver.Chrome(options=chrome_options(profile_dir), service=service)
+        self.driver = driver
+        self.profile_dir = profile_dir
         self.wait = WebDriverWait(self.driver, 20)
+        self.capture_backend = os.getenv('CAPTURE_BACKEND', 'system').lower()
+        self.browser_tap = None
+        if self.capture_backend == 'browser':
+            self.browser_tap = BrowserAudioTap(self.driver)
+            self.browser_tap.install()
+        self.join_ready_timeout = float(os.getenv('JOIN_READY_TIMEOUT', 30))
+        self.admit_timeout = float(os.getenv('JOIN_ADMIT_TIMEOUT', 120))
+        self.join_timings = {}
+        self.monitor_meeting = os.getenv('MEETING_MONITOR', 'true').lower() == 'true'
+        self.end_reason = None
+        self.recorder = None
 
+    def isLoggedIn(self):
+        """True if the browser profile already holds a Google session"""
+        self.driver.get('https://myaccount.google.com/')
+        try:
+            WebDriverWait(self.driver, 10).until(
+                lambda d: 'myaccount.google.com' in d.current_url or 'accounts.google.com' in d.current_url
+            )
+        except TimeoutException:
+            return False
+        return 'myaccount.google.com' in self.driver.current_url
+
+    @tracing.traced('browser.login')
     def Glogin(self):
+        """Sign in to Google; returns True once signed in, False (after logging why) if login failed"""
+        if self.profile_dir and self.isLoggedIn():
+            print("[LOGIN] ✅ Reusing signed-in browser profile")
+            return True
+        
         print("[LOGIN] Starting Google login...")
         self.driver.get('https://accounts.google.com/ServiceLogin')
-        time.sleep(2)
 
         try:
             # Email input
             email_input = self.wait.until(
-                EC.presence_of_element_located((By.ID, "identifierId"))
+                EC.element_to_be_clickable((By.ID, "identifierId"))
             )
             email_input.send_keys(self.mail_address)
             email_input.send_keys(Keys.RETURN)
-            time.sleep(3)
 
             # Password input
             password_input = self.wait.until(
-                EC.presence_of_element_located((By.NAME, "Passwd"))
+                EC.element_to_be_clickable((By.NAME, "Passwd"))
             )
             password_input.send_keys(self.password)
             password_input.send_keys(Keys.RETURN)
-            time.sleep(5)
+            
+            # The password page is replaced once Google accepts the credentials
+            self.wait.until(EC.staleness_of(password_input))
             
             print("[LOGIN] ✅ Gmail login successful")
+            return True
         except Exception as e:
             print(f"[LOGIN_ERROR] ❌ {str(e)}")
+            return False
 
+    def _phase(self, name, started):
+        elapsed = time.perf_counter() - started
+        self.join_timings[name] = elapsed
+        tracing.gauge(f'join.{name}_seconds', elapsed)
+        return time.perf_counter()
+
+    def _try_join(self, bot_name):
+        result = self.driver.execute_script(JOIN_HELPER_JS, bot_name)
+        return result if result and result.get('join') else False
+
+    @tracing.traced('browser.join')
     def joinMeetingWithName(self, meet_link, bot_name="Diva"):
+        """Join with condition-based waits; per-phase durations end up in self.join_timings"""
+        self.join_timings = {}
+        poll = WebDriverWait(self.driver, self.join_ready_timeout, poll_frequency=0.25)
+        
         print(f"[MEET] Navigating to: {meet_link}")
+        started = phase_start = time.perf_counter()
         self.driver.get(meet_link)
-        time.sleep(5)
+        phase_start = self._phase('navigate', phase_start)
         
         try:
-            # 1. Set bot name (if name input exists)
-            try:
-                name_input = self.wait.until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, 'input[placeholder*="Your name"]'))
-                )
-                name_input.clear()
-                name_input.send_keys(bot_name)
+            # 1. Wait for the pre-join screen instead of sleeping a fixed time
+            poll.until(lambda d: d.execute_script(PREJOIN_READY_JS))
+            phase_start = self._phase('prejoin_ready', phase_start)
+
+            # 2. Name, mic, camera and join button in one script call (retried until join is clicked)
+            result = poll.until(lambda d: self._try_join(bot_name))
+            phase_start = self._phase('controls_and_join', phase_start)
+            if result.get('name'):
                 print(f"[NAME] ✅ Set name to: {bot_name}")
-            except:
+            else:
                 print("[NAME] ℹ️ Name input not found (already logged in)")
+            print(f"[MIC] Microphone: {result.get('mic')}")
+            print(f"[CAMERA] Camera: {result.get('camera')}")
+            print(f"[JOIN] ✅ Clicked join button ({result.get('join')})")
 
-            # 2. Turn OFF Microphone (before joining)
-            try:
-                mic_buttons = self.driver.find_elements(By.CSS_SELECTOR, 'div[data-is-muted="false"]')
-                for btn in mic_buttons:
-                    aria_label = btn.get_attribute('aria-label')
-                    if aria_label and 'microphone' in aria_label.lower():
-                        btn.click()
-                        print("[MIC] ✅ Microphone turned OFF")
-                        time.sleep(1)
-                        break
-            except Exception as e:
-                print(f"[MIC] ⚠️ Could not toggle mic: {e}")
-
-            # 3. Turn OFF Camera (before joining)
-            try:
-                cam_buttons = self.driver.find_elements(By.CSS_SELECTOR, 'div[data-is-muted="false"]')
-                for btn in cam_buttons:
-                    aria_label = btn.get_attribute('aria-label')
-                    if aria_label and 'camera' in aria_label.lower():
-                        btn.click()
-                        print("[CAMERA] ✅ Camera turned OFF")
-                        time.sleep(1)
-                        break
-            except Exception as e:
-                print(f"[CAMERA] ⚠️ Could not toggle camera: {e}")
-
-            time.sleep(2)
-
-            # 4. Click "Ask to Join" or "Join now" button
+            # 3. Wait to be admitted rather than assuming 10 seconds is enough
             try:
-                # Try multiple selectors
-                join_selectors = [
-                    'button[jsname="Qx7uuf"]',  # Ask to join
-                    'button:has-text("Ask to join")',
-                    'button:has-text("Join now")',
-                    'span:has-text("Ask to join")',
-                    'span:has-text("Join now")'
-                ]
-                
-                joined = False
-                for selector in join_selectors:
-                    try:
-                        join_button = self.driver.find_element(By.CSS_SELECTOR, selector)
-                        if join_button.is_displayed():
-                            join_button.click()
-                            print("[JOIN] ✅ Clicked join button")
-                            joined = True
-                            break
-                    except:
-                        continue
-                
-                if not joined:
-                    # Try finding by text
-                    buttons = self.driver.find_elements(By.TAG_NAME, 'button')
-                    for button in buttons:
-                        if 'ask to join' in button.text.lower() or 'join now' in button.text.lower():
-                            button.click()
-                            print("[JOIN] ✅ Clicked join button (found by text)")
-                            joined = True
-                            break
-                
-                if not joined:
-                    print("[JOIN] ⚠️ Could not find join button")
-                    
-            except Exception as e:
-                print(f"[JOIN_ERROR] ❌ {str(e)}")
-
-            time.sleep(10)  # Wait for meeting to connect
-            print("[JOIN] ✅ Successfully joined meeting")
+                WebDriverWait(self.driver, self.admit_timeout, poll_frequency=0.5).until(
+                    lambda d: d.execute_script(IN_CALL_JS)
+                )
+                self._phase('admitted', phase_start)
+                print("[JOIN] ✅ Successfully joined meeting")
+            except TimeoutException:
+                self._phase('admit_timeout', phase_start)
+                print(f"[JOIN] ⚠️ Not admitted within {self.admit_timeout}s, continuing anyway")
             
+        except TimeoutException:
+            print(f"[JOIN] ⚠️ Could not find join controls within {self.join_ready_timeout}s")
         except Exception as e:
             print(f"[MEET_ERROR] ❌ {str(e)}")
+        
+        self.join_timings['total'] = time.perf_counter() - started
+        print("[JOIN_TIMINGS] " + ", ".join(f"{name}={seconds:.2f}s" for name, seconds in self.join_timings.items()))
 
-    def recordMeeting(self, audio_path, duration):
+    @tracing.traced('meeting.record')
+    def recordMeeting(self, audio_path, duration, on_segment=None):
         """Record meeting audio and keep browser open"""
         print(f"\n{'='*60}")
         print(f"[RECORDING] 🎤 Starting recording")
@@ -163,32 +255,49 @@ class JoinGoogleMeet:
         print(f"{'='*60}\n")
         
         # Start audio recording in background
-        recorder = AudioRecorder()
+        recorder = AudioRecorder(pulse_source=f"{self.audio_sink}.monitor" if self.audio_sink else None,
+                                 browser_tap=self.browser_tap)
+        self.recorder = recorder
+        self.end_reason = None
+        
+        # Watch the page while recording so an ended meeting stops the recorder early
+        monitor = None
+        if self.monitor_meeting:
+            monitor = MeetingMonitor(self.driver, recorder.stop).start()
         
         try:
-            # Record audio (this will block for 'duration' seconds)
-            recorder.get_audio(audio_path, duration)
-            print(f"\n[RECORDING] ✅ Recording completed!")
+            # Record audio (blocks for 'duration' seconds unless the meeting ends first)
+            recorder.get_audio(audio_path, duration, on_segment=on_segment)
+            if recorder.stop_reason:
+                self.end_reason = recorder.stop_reason
+                print(f"\n[RECORDING] ✅ Recording stopped early: {recorder.stop_reason}")
+            else:
+                print(f"\n[RECORDING] ✅ Recording completed!")
             print(f"[AUDIO_SAVED] {audio_path}")
             
         except Exception as e:
             print(f"[RECORDING_ERROR] ❌ {str(e)}")
+        finally:
+            if monitor is not None:
+                monitor.stop()
 
     def checkIfHostLeft(self):
         """Check if host has left the meeting"""
+        if self.end_reason:
+            return True
         try:
-            # Check for "Host has ended the meeting" message
-            messages = self.driver.find_elements(By.TAG_NAME, 'span')
-            for msg in messages:
-                if 'host' in msg.text.lower() and ('ended' in msg.text.lower() or 'left' in msg.text.lower()):
-                    print("[MEETING] ℹ️ Host has left the meeting")
-                    return True
-        except:
+            # One script probe instead of reading every <span> over WebDriver
+            state = probe_meeting_state(self.driver)
+            if state.get('ended') or not state.get('in_call'):
+                print("[MEETING] ℹ️ Host has left the meeting")
+                return True
+        except Exception:
             pass
         return False
 
-    def leaveMeeting(self):
-        """Leave the meeting and close browser"""
+    @tracing.traced('browser.leave')
+    def leaveMeeting(self, quit_browser=True):
+        """Leave the meeting and close browser (or keep it open for reuse)"""
         try:
             print("\n[LEAVE] Leaving meeting...")
             
@@ -213,9 +322,10 @@ class JoinGoogleMeet:
         except Exception as e:
             print(f"[LEAVE_ERROR] ⚠️ {str(e)}")
         finally:
-            time.sleep(2)
-            self.driver.quit()
-            print("[BROWSER] ✅ Browser closed")
+            if quit_browser:
+                time.sleep(2)
+                self.driver.quit()
+                print("[BROWSER] ✅ Browser closed")
 
     def AskToJoin(self, audio_path, duration):
         """Main method: Join meeting, record, and leave"""
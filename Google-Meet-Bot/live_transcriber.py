@@ -0,0 +1,60 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import tracing
+
+
+class LiveTranscriber:
+    """Transcribe recorder segments in the background while the meeting is still running.
+
+    Pass ``submit`` as the recorder's ``on_segment`` callback. Each finalized segment is
+    queued for transcription straight away, so when the bot leaves only the tail segment
+    is still outstanding.
+    """
+
+    def __init__(self, speech_to_text, workers=1):
+        self.stt = speech_to_text
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="live-transcribe")
+        self._futures = {}
+        self._segment_paths = {}
+        self._lock = threading.Lock()
+
+    def submit(self, index, segment_path):
+        print(f"[LIVE] Queued segment {index} for transcription")
+        with self._lock:
+            self._segment_paths[index] = segment_path
+            self._futures[index] = self._pool.submit(tracing.bind(self._transcribe_segment), index, segment_path)
+
+    def _transcribe_segment(self, index, segment_path):
+        started = time.perf_counter()
+        try:
+            text = self.stt.transcribe_recording(segment_path)
+        except Exception as e:
+            print(f"[LIVE] ⚠️ Segment {index} error: {e}")
+            text = None
+        status = "done" if text is not None else "failed"
+        print(f"[LIVE] Segment {index} {status} in {time.perf_counter() - started:.1f}s")
+        return text
+
+    def finish(self):
+        """Wait for outstanding segments and return the joined transcript.
+
+        Returns None if any segment still fails after its retry, so the caller
+        transcribes the full recording instead of using a transcript with a hole.
+        """
+        with self._lock:
+            futures = sorted(self._futures.items())
+        pending = sum(1 for _, future in futures if not future.done())
+        print(f"[LIVE] Waiting on {pending} of {len(futures)} segments")
+        texts = [future.result() for _, future in futures]
+        self._pool.shutdown(wait=True)
+        for position, (index, _) in enumerate(futures):
+            if texts[position] is None:
+                print(f"[LIVE] Retrying segment {index}")
+                texts[position] = self._transcribe_segment(index, self._segment_paths[index])
+        if any(text is None for text in texts):
+            print("[LIVE] ⚠️ Live transcript incomplete")
+            return None
+        # Segments are cut back to back, with no overlap to de-duplicate
+        return ' '.join(text.strip() for text in texts if text.strip())
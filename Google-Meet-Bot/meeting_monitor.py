@@ -0,0 +1,138 @@
+import os
+import threading
+import time
+
+from dotenv import load_dotenv
+
+from driver_lock import driver_lock
+
+load_dotenv()
+
+# Installs (once per page) a MutationObserver that latches end-of-meeting messages,
+# then reports the whole meeting state in a single WebDriver round trip. Only
+# dialogs and alerts are scanned, so a chat message or caption that happens to
+# say "meeting ended" does not end the recording.
+MEETING_STATE_JS = r"""
+const ENDED_PHRASES = [
+    'you left the meeting', 'the meeting has ended', 'meeting ended',
+    'you\'ve been removed from the meeting', 'you have been removed from the meeting',
+    'removed you from the meeting', 'host has ended', 'ended the meeting for everyone',
+    'return to home screen'
+];
+const REGIONS = '[role="dialog"], [role="alertdialog"], [role="alert"]';
+function scan(node) {
+    const element = node && (node.nodeType === 1 ? node : node.parentElement);
+    if (!element) return null;
+    const regions = Array.from(element.querySelectorAll(REGIONS));
+    const enclosing = element.closest(REGIONS);
+    if (enclosing) regions.push(enclosing);
+    for (const region of regions) {
+        const text = (region.innerText || '').toLowerCase();
+        for (const phrase of ENDED_PHRASES) {
+            if (text.includes(phrase)) return phrase;
+        }
+    }
+    return null;
+}
+if (!window.__meetmindMonitor) {
+    const state = {ended: null};
+    window.__meetmindMonitor = state;
+    const observer = new MutationObserver(mutations => {
+        if (state.ended) return;
+        for (const mutation of mutations) {
+            for (const node of mutation.addedNodes) {
+                const phrase = scan(node);
+                if (phrase) { state.ended = phrase; return; }
+            }
+        }
+    });
+    observer.observe(document.body, {childList: true, subtree: true});
+    state.ended = scan(document.body);
+}
+const inCall = !!document.querySelector(
+    'button[aria-label*="Leave call"], button[aria-label*="Leave meeting"], button[jsname="CQylAd"]');
+const tiles = new Set();
+for (const el of document.querySelectorAll('[data-participant-id]')) {
+    tiles.add(el.getAttribute('data-participant-id'));
+}
+return {ended: window.__meetmindMonitor.ended, in_call: inCall, participants: tiles.size};
+"""
+
+
+def probe_meeting_state(driver):
+    """Ended message, in-call flag and participant count from one script call"""
+    # Shared with the browser audio tap, which drains the same tab from the recorder thread
+    with driver_lock(driver):
+        return driver.execute_script(MEETING_STATE_JS) or {}
+
+
+class MeetingMonitor:
+    """Polls the meeting page next to the recorder and calls on_end once the meeting is over.
+
+    The meeting counts as over when Meet shows an end/removal message, when the
+    leave button disappears after the bot was in the call (still waiting in the
+    lobby is not an end), or when the bot has been alone for longer than the grace
+    period after others were present.
+    """
+
+    def __init__(self, driver, on_end, poll_seconds=None, alone_grace_seconds=None):
+        if poll_seconds is None:
+            poll_seconds = float(os.getenv('MEETING_MONITOR_POLL_SECONDS', 2))
+        if alone_grace_seconds is None:
+            alone_grace_seconds = float(os.getenv('MEETING_ALONE_GRACE_SECONDS', 60))
+        self.driver = driver
+        self.on_end = on_end
+        self.poll_seconds = poll_seconds
+        self.alone_grace_seconds = alone_grace_seconds
+        self.end_reason = None
+        self.seen_in_call = False
+        self.seen_others = False
+        self.alone_since = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="meeting-monitor", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_seconds + 5)
+
+    def check(self, state):
+        """End reason for one probe result, or None while the meeting is still on"""
+        if state.get('ended'):
+            return f"meeting ended ({state['ended']})"
+        if not state.get('in_call'):
+            # Without a Leave button we are either gone or still in the lobby; only the first ends it
+            return "no longer in the call" if self.seen_in_call else None
+        self.seen_in_call = True
+        participants = state.get('participants') or 0
+        if participants > 1:
+            self.seen_others = True
+            self.alone_since = None
+            return None
+        if not self.seen_others:
+            # Nobody else has joined yet; do not end a meeting that has not started
+            return None
+        if self.alone_since is None:
+            self.alone_since = time.monotonic()
+        if time.monotonic() - self.alone_since >= self.alone_grace_seconds:
+            return "no other participants left"
+        return None
+
+    def _run(self):
+        while not self._stop.wait(self.poll_seconds):
+            try:
+                state = probe_meeting_state(self.driver)
+            except Exception as e:
+                print(f"[MONITOR] ⚠️ Probe failed: {e}")
+                continue
+            reason = self.check(state)
+            if reason:
+                self.end_reason = reason
+                print(f"[MONITOR] ℹ️ {reason}, stopping recording")
+                self.on_end(reason)
+                return
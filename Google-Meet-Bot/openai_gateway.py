@@ -0,0 +1,213 @@
+"""Process-wide OpenAI access shared by every SpeechToText instance.
+
+One AsyncOpenAI client runs on a background event loop, so all meetings in a
+process reuse the same pool of keep-alive connections. Every request first takes
+its share of a per-model requests/tokens-per-minute budget, and retryable
+failures (429, timeouts, connection errors, 5xx) are retried with exponential
+backoff and full jitter. A 429 also pauses that model's budget for the advertised
+Retry-After and halves its rate, which then recovers gradually on success.
+
+The gateway mirrors the parts of the OpenAI client the pipeline uses
+(``chat.completions.create`` and ``audio.transcriptions.create``), so it is a
+drop-in replacement for a synchronous client.
+"""
+import asyncio
+import os
+import random
+import threading
+import time
+from types import SimpleNamespace
+
+import openai
+from openai import AsyncOpenAI
+from dotenv import load_dotenv
+
+import tracing
+from transcript_windows import count_tokens
+
+load_dotenv()
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+def is_retryable(error):
+    if isinstance(error, (openai.APITimeoutError, openai.APIConnectionError, openai.RateLimitError,
+                          openai.InternalServerError)):
+        return True
+    return isinstance(error, openai.APIStatusError) and error.status_code in RETRYABLE_STATUS
+
+
+def retry_after_seconds(error):
+    """Server-advised wait from Retry-After / retry-after-ms headers, if any"""
+    response = getattr(error, 'response', None)
+    if response is None:
+        return None
+    headers = response.headers
+    try:
+        if headers.get('retry-after-ms'):
+            return float(headers['retry-after-ms']) / 1000
+        if headers.get('retry-after'):
+            return float(headers['retry-after'])
+    except ValueError:
+        pass
+    return None
+
+
+class RateLimiter:
+    """Requests- and tokens-per-minute token buckets with an adaptive rate scale.
+
+    Runs on the gateway's event loop only. A limit of 0 disables that bucket.
+    """
+
+    def __init__(self, requests_per_minute, tokens_per_minute):
+        self.rpm = requests_per_minute
+        self.tpm = tokens_per_minute
+        self.scale = 1.0
+        self._requests = float(requests_per_minute)
+        self._tokens = float(tokens_per_minute)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now):
+        elapsed = now - self._updated
+        self._updated = now
+        if self.rpm:
+            self._requests = min(self.rpm * self.scale, self._requests + elapsed * self.rpm * self.scale / 60)
+        if self.tpm:
+            self._tokens = min(self.tpm * self.scale, self._tokens + elapsed * self.tpm * self.scale / 60)
+
+    async def acquire(self, tokens):
+        """Wait until one request and `tokens` tokens fit in the budget, then take them"""
+        if self.tpm:
+            # A request larger than the whole budget still has to run eventually
+            tokens = min(tokens, self.tpm * self.scale)
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                wait = self._paused_until - now
+                if wait <= 0:
+                    wait = 0.0
+                    if self.rpm and self._requests < 1:
+                        wait = (1 - self._requests) * 60 / (self.rpm * self.scale)
+                    if self.tpm and self._tokens < tokens:
+                        wait = max(wait, (tokens - self._tokens) * 60 / (self.tpm * self.scale))
+                    if wait == 0.0:
+                        self._requests -= 1
+                        self._tokens -= tokens
+                        return tokens
+                tracing.count('openai.rate_limit_wait_seconds', wait)
+                await asyncio.sleep(wait)
+
+    def settle(self, reserved, used):
+        """Return over-reserved tokens (or charge the shortfall) once real usage is known"""
+        if self.tpm:
+            self._tokens = min(self.tpm * self.scale, self._tokens + reserved - used)
+
+    def throttled(self, pause_seconds):
+        self._paused_until = max(self._paused_until, time.monotonic() + pause_seconds)
+        self.scale = max(0.1, self.scale * 0.5)
+
+    def succeeded(self):
+        self.scale = min(1.0, self.scale + 0.05)
+
+
+class OpenAIGateway:
+    """Shared async client, per-model budgets and retries behind a synchronous facade"""
+
+    def __init__(self, api_key=None):
+        self.max_retries = int(os.getenv('OPENAI_MAX_RETRIES', 6))
+        self.retry_base_seconds = float(os.getenv('OPENAI_RETRY_BASE_SECONDS', 1.0))
+        self.retry_max_seconds = float(os.getenv('OPENAI_RETRY_MAX_SECONDS', 60.0))
+        self.requests_per_minute = int(os.getenv('OPENAI_RPM', 500))
+        self.tokens_per_minute = int(os.getenv('OPENAI_TPM', 200000))
+        self.completion_token_reserve = int(os.getenv('OPENAI_COMPLETION_TOKEN_RESERVE', 1000))
+        self.max_concurrency = int(os.getenv('OPENAI_MAX_CONCURRENCY', 16))
+        timeout = float(os.getenv('OPENAI_TIMEOUT', 600))
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="openai-gateway", daemon=True)
+        self._thread.start()
+
+        async def setup():
+            # Retries are ours (with a shared budget), so the SDK's own are switched off
+            self._client = AsyncOpenAI(api_key=api_key, max_retries=0, timeout=timeout)
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._run(setup())
+        self._limiters = {}
+
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create_chat_completion))
+        self.audio = SimpleNamespace(transcriptions=SimpleNamespace(create=self.create_transcription))
+
+    def _run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(_traced(tracing.current(), coroutine), self._loop).result()
+
+    def _limiter(self, model):
+        if model not in self._limiters:
+            self._limiters[model] = RateLimiter(self.requests_per_minute, self.tokens_per_minute)
+        return self._limiters[model]
+
+    def backoff_seconds(self, attempt):
+        """Full jitter: uniform in [0, min(max, base * 2**attempt)]"""
+        return random.uniform(0, min(self.retry_max_seconds, self.retry_base_seconds * 2 ** attempt))
+
+    async def _call(self, model, tokens, send):
+        limiter = self._limiter(model)
+        attempt = 0
+        while True:
+            reserved = await limiter.acquire(tokens)
+            try:
+                async with self._slots:
+                    response = await send()
+            except Exception as e:
+                limiter.settle(reserved, 0)
+                if not is_retryable(e) or attempt >= self.max_retries:
+                    raise
+                delay = self.backoff_seconds(attempt)
+                if isinstance(e, openai.RateLimitError) or getattr(e, 'status_code', None) == 429:
+                    advised = retry_after_seconds(e)
+                    limiter.throttled(advised if advised is not None else delay)
+                    delay = max(delay, advised or 0)
+                    tracing.count('openai.rate_limited')
+                tracing.count('openai.retries')
+                print(f"⏳ OpenAI {type(e).__name__}, retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            limiter.succeeded()
+            usage = getattr(response, 'usage', None)
+            if usage is not None and getattr(usage, 'total_tokens', None) is not None:
+                limiter.settle(reserved, usage.total_tokens)
+            return response
+
+    def create_chat_completion(self, **kwargs):
+        model = kwargs['model']
+        prompt_text = ''.join(str(message.get('content', '')) for message in kwargs.get('messages', []))
+        tokens = count_tokens(prompt_text, model) + kwargs.get('max_tokens', self.completion_token_reserve)
+        return self._run(self._call(model, tokens, lambda: self._client.chat.completions.create(**kwargs)))
+
+    def create_transcription(self, file, **kwargs):
+        # Read on the calling thread; the event loop only does network I/O
+        upload = (os.path.basename(getattr(file, 'name', 'audio.wav')), file.read())
+        return self._run(self._call(kwargs['model'], 0,
+                                    lambda: self._client.audio.transcriptions.create(file=upload, **kwargs)))
+
+
+async def _traced(tracer, coroutine):
+    # Tasks start from the loop thread's context; count waits and retries against the caller's run
+    with tracing.using(tracer):
+        return await coroutine
+
+
+_gateway = None
+_gateway_lock = threading.Lock()
+
+
+def get_gateway():
+    """The process-wide gateway, created on first use"""
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = OpenAIGateway(api_key=os.getenv('OPENAI_API_KEY'))
+        return _gateway
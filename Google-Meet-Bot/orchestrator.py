@@ -0,0 +1,361 @@
+"""Run several meetings at once on one host.
+
+Each session gets its own Chrome and either in-tab audio capture
+(CAPTURE_BACKEND=browser) or, on Linux, its own PulseAudio null-sink, so
+recordings stay isolated. New sessions are only admitted while the host has CPU
+and memory headroom, and every session reports the resources its browser and
+capture processes used.
+
+    python orchestrator.py --meeting https://meet.google.com/aaa-bbbb-ccc \
+                           --meeting https://meet.google.com/ddd-eeee-fff --duration 1800
+"""
+import argparse
+import itertools
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import traceback
+
+from dotenv import load_dotenv
+
+import tracing
+from audio_sinks import PulseSink, pulse_available
+from join_google_meet import JoinGoogleMeet, session_profile_dir
+from openai_gateway import get_gateway
+from speech_to_text import SpeechToText
+
+try:
+    import psutil
+except ImportError:  # optional: falls back to /proc and the load average
+    psutil = None
+
+load_dotenv()
+
+
+def system_usage():
+    """Host CPU percent and available memory in MB"""
+    if psutil is not None:
+        memory = psutil.virtual_memory()
+        return {'cpu_percent': psutil.cpu_percent(interval=None),
+                'memory_available_mb': memory.available / 2**20}
+    cpu_percent = os.getloadavg()[0] / (os.cpu_count() or 1) * 100
+    memory_available_mb = 0.0
+    with open('/proc/meminfo') as f:
+        for line in f:
+            if line.startswith('MemAvailable:'):
+                memory_available_mb = int(line.split()[1]) / 1024
+                break
+    return {'cpu_percent': cpu_percent, 'memory_available_mb': memory_available_mb}
+
+
+def _proc_children():
+    children = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                # The command name may contain spaces; fields after it are space separated
+                fields = f.read().rsplit(')', 1)[1].split()
+        except OSError:
+            continue
+        children.setdefault(int(fields[1]), []).append(int(entry))
+    return children
+
+
+def process_tree_usage(root_pids):
+    """Resident memory (MB) and CPU seconds of the given processes and all their descendants"""
+    rss_mb = 0.0
+    cpu_seconds = 0.0
+    if psutil is not None:
+        for pid in root_pids:
+            try:
+                root = psutil.Process(pid)
+                for process in [root] + root.children(recursive=True):
+                    rss_mb += process.memory_info().rss / 2**20
+                    times = process.cpu_times()
+                    cpu_seconds += times.user + times.system
+            except psutil.Error:
+                continue
+        return rss_mb, cpu_seconds
+
+    children = _proc_children()
+    pending = list(root_pids)
+    ticks = os.sysconf('SC_CLK_TCK')
+    page_mb = os.sysconf('SC_PAGE_SIZE') / 2**20
+    while pending:
+        pid = pending.pop()
+        pending.extend(children.get(pid, []))
+        try:
+            with open(f'/proc/{pid}/stat') as f:
+                fields = f.read().rsplit(')', 1)[1].split()
+            with open(f'/proc/{pid}/statm') as f:
+                resident_pages = int(f.read().split()[1])
+        except OSError:
+            continue
+        cpu_seconds += (int(fields[11]) + int(fields[12])) / ticks
+        rss_mb += resident_pages * page_mb
+    return rss_mb, cpu_seconds
+
+
+class MeetingSession:
+    """One meeting: its own browser, audio sink, recording and resource figures"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, meet_link, duration, bot_name):
+        self.id = f"s{next(self._ids)}"
+        self.meet_link = meet_link
+        self.duration = duration
+        self.bot_name = bot_name
+        self.status = 'queued'
+        self.audio_path = os.path.join(tempfile.mkdtemp(prefix=f'meet_{self.id}_'), 'output.wav')
+        self.sink_name = None
+        self.bot = None
+        self.summary = None
+        self.error = None
+        self.queued_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.rss_mb = 0.0
+        self.peak_rss_mb = 0.0
+        self.cpu_seconds = 0.0
+
+    def pids(self):
+        pids = []
+        bot = self.bot
+        if bot is not None:
+            try:
+                pids.append(bot.driver.service.process.pid)
+            except AttributeError:
+                pass
+            if bot.recorder is not None and bot.recorder.capture_pid:
+                pids.append(bot.recorder.capture_pid)
+        return pids
+
+    def report(self):
+        wall = (self.finished_at or time.time()) - self.started_at if self.started_at else 0.0
+        return {
+            'id': self.id,
+            'meet_link': self.meet_link,
+            'status': self.status,
+            'error': self.error,
+            'audio_path': self.audio_path,
+            'audio_sink': self.sink_name,
+            'end_reason': self.bot.end_reason if self.bot is not None else None,
+            'waited_seconds': (self.started_at or time.time()) - self.queued_at,
+            'wall_seconds': wall,
+            'rss_mb': round(self.rss_mb, 1),
+            'peak_rss_mb': round(self.peak_rss_mb, 1),
+            'cpu_seconds': round(self.cpu_seconds, 1),
+            'cpu_percent': round(100 * self.cpu_seconds / wall, 1) if wall else 0.0,
+            'summary': self.summary,
+        }
+
+
+class MeetingOrchestrator:
+    """Admits meeting sessions while the host has headroom and runs each on its own thread"""
+
+    def __init__(self, max_sessions=None, analyze=True):
+        if max_sessions is None:
+            max_sessions = int(os.getenv('ORCHESTRATOR_MAX_SESSIONS', 4))
+        self.max_cpu_percent = float(os.getenv('ORCHESTRATOR_MAX_CPU_PERCENT', 80))
+        self.session_memory_mb = float(os.getenv('ORCHESTRATOR_SESSION_MEMORY_MB', 700))
+        self.min_free_memory_mb = float(os.getenv('ORCHESTRATOR_MIN_FREE_MEMORY_MB', 512))
+        self.admission_timeout = float(os.getenv('ORCHESTRATOR_ADMISSION_TIMEOUT', 600))
+        self.sample_seconds = float(os.getenv('ORCHESTRATOR_SAMPLE_SECONDS', 5))
+        self.analyze = analyze
+
+        # In-browser capture is per tab already; otherwise isolation needs one PulseAudio sink per session
+        self.browser_capture = os.getenv('CAPTURE_BACKEND', 'system').lower() == 'browser'
+        self.use_sinks = not self.browser_capture and pulse_available()
+        self.isolated = self.browser_capture or self.use_sinks
+        if not self.isolated and max_sessions > 1:
+            print("[ORCHESTRATOR] ⚠️ PulseAudio not available; sessions would share one capture device, "
+                  "running one at a time")
+            max_sessions = 1
+        self.max_sessions = max_sessions
+
+        self.sessions = []
+        self._threads = []
+        self._lock = threading.Lock()
+        self._starting = 0
+        self._running = 0
+        self._done = threading.Event()
+        self.openai_client = get_gateway() if analyze else None
+        if psutil is not None:
+            psutil.cpu_percent(interval=None)  # prime the CPU counter
+        self._sampler = threading.Thread(target=self._sample, name="orchestrator-sampler", daemon=True)
+        self._sampler.start()
+
+    def admission_check(self):
+        """None if another session may start now, otherwise the reason it has to wait"""
+        active = self._running + self._starting
+        if active >= self.max_sessions:
+            return f"{active}/{self.max_sessions} sessions running"
+        usage = system_usage()
+        if active and usage['cpu_percent'] > self.max_cpu_percent:
+            return f"CPU at {usage['cpu_percent']:.0f}% (limit {self.max_cpu_percent:.0f}%)"
+        # Sessions still starting have not allocated their browser memory yet
+        headroom = usage['memory_available_mb'] - self._starting * self.session_memory_mb
+        if headroom - self.session_memory_mb < self.min_free_memory_mb:
+            return f"{usage['memory_available_mb']:.0f} MB free, need {self.session_memory_mb + self.min_free_memory_mb:.0f} MB"
+        return None
+
+    def submit(self, meet_link, duration, bot_name="MeetMind Bot"):
+        session = MeetingSession(meet_link, duration, bot_name)
+        thread = threading.Thread(target=self._traced_run, args=(session,), name=f"meeting-{session.id}", daemon=True)
+        with self._lock:
+            self.sessions.append(session)
+            self._threads.append(thread)
+        thread.start()
+        return session
+
+    def _admit(self, session):
+        deadline = time.monotonic() + self.admission_timeout
+        last_reason = None
+        while True:
+            with self._lock:
+                reason = self.admission_check()
+                if reason is None:
+                    self._starting += 1
+                    return True
+            if reason != last_reason:
+                print(f"[ORCHESTRATOR] {session.id} waiting: {reason}")
+                last_reason = reason
+            if time.monotonic() >= deadline:
+                session.error = f"not admitted within {self.admission_timeout:.0f}s ({reason})"
+                return False
+            time.sleep(2)
+
+    def _traced_run(self, session):
+        # Each session traces into its own tracer, exported and released when the session ends
+        with tracing.run('meeting'):
+            self._run(session)
+
+    def _run(self, session):
+        if not self._admit(session):
+            session.status = 'rejected'
+            print(f"[ORCHESTRATOR] ❌ {session.id} rejected: {session.error}")
+            return
+        session.status = 'starting'
+        session.started_at = time.time()
+        sink = PulseSink(f"meetmind_{os.getpid()}_{session.id}") if self.use_sinks else None
+        launched = False
+        profile_dir = None
+        try:
+            if sink is not None:
+                sink.create()
+                session.sink_name = sink.name
+            # Sessions run side by side and Chrome will not share a user-data-dir
+            profile_dir = session_profile_dir(f'session-{session.id}')
+            session.bot = JoinGoogleMeet(profile_dir=profile_dir, audio_sink=session.sink_name)
+            session.bot.Glogin()
+            with self._lock:
+                self._starting -= 1
+                self._running += 1
+                launched = True
+            session.status = 'joining'
+            session.bot.joinMeetingWithName(session.meet_link, session.bot_name)
+            session.status = 'recording'
+            session.bot.recordMeeting(session.audio_path, session.duration)
+            session.status = 'leaving'
+            session.bot.leaveMeeting()
+            if self.analyze and os.path.exists(session.audio_path):
+                session.status = 'analyzing'
+                session.summary = SpeechToText(client=self.openai_client).transcribe(session.audio_path)
+            session.status = 'completed'
+        except Exception as e:
+            traceback.print_exc()
+            session.status = 'failed'
+            session.error = str(e)
+            if session.bot is not None:
+                try:
+                    session.bot.driver.quit()
+                except Exception:
+                    pass
+        finally:
+            with self._lock:
+                if launched:
+                    self._running -= 1
+                else:
+                    self._starting -= 1
+            if sink is not None:
+                sink.remove()
+            if profile_dir is not None:
+                shutil.rmtree(profile_dir, ignore_errors=True)
+            session.finished_at = time.time()
+            print(f"[ORCHESTRATOR] {session.id} {session.status}")
+
+    def _sample(self):
+        while not self._done.wait(self.sample_seconds):
+            with self._lock:
+                sessions = [session for session in self.sessions if session.bot is not None and not session.finished_at]
+            for session in sessions:
+                rss_mb, cpu_seconds = process_tree_usage(session.pids())
+                if rss_mb:
+                    session.rss_mb = rss_mb
+                    session.peak_rss_mb = max(session.peak_rss_mb, rss_mb)
+                    session.cpu_seconds = max(session.cpu_seconds, cpu_seconds)
+
+    def wait(self):
+        for thread in list(self._threads):
+            thread.join()
+        self._done.set()
+
+    def report(self):
+        with self._lock:
+            sessions = list(self.sessions)
+        return {
+            'host': system_usage(),
+            'isolated_audio': self.isolated,
+            'max_sessions': self.max_sessions,
+            'sessions': [session.report() for session in sessions],
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record several Google Meet meetings at once")
+    parser.add_argument("--meeting", dest="meetings", action="append", default=[],
+                        help="Google Meet link (repeat for more meetings)")
+    parser.add_argument("--manifest", help="JSON list of {\"meet_link\", \"duration\", \"bot_name\"} objects")
+    parser.add_argument("--duration", type=int, default=60, help="Default recording duration in seconds")
+    parser.add_argument("--bot-name", dest="bot_name", default="MeetMind Bot", help="Default bot display name")
+    parser.add_argument("--max-sessions", dest="max_sessions", type=int, default=None,
+                        help="Meetings recorded at the same time (default: ORCHESTRATOR_MAX_SESSIONS)")
+    parser.add_argument("--no-analysis", dest="no_analysis", action="store_true", help="Only record")
+    parser.add_argument("--report", help="Also write the final JSON report to this file")
+    args = parser.parse_args()
+
+    meetings = [{'meet_link': link} for link in args.meetings]
+    if args.manifest:
+        with open(args.manifest, 'r', encoding='utf-8') as f:
+            meetings.extend(json.load(f))
+    if not meetings:
+        parser.error("give at least one --meeting or a --manifest")
+
+    if sys.platform == 'win32':
+        try:
+            sys.stdout.reconfigure(encoding='utf-8')
+        except Exception:
+            pass
+
+    orchestrator = MeetingOrchestrator(args.max_sessions, analyze=not args.no_analysis)
+    for meeting in meetings:
+        orchestrator.submit(meeting['meet_link'], int(meeting.get('duration', args.duration)),
+                            meeting.get('bot_name', args.bot_name))
+    orchestrator.wait()
+
+    report = json.dumps(orchestrator.report(), indent=2, default=str)
+    print(report)
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            f.write(report)
+
+
+if __name__ == "__main__":
+    main()
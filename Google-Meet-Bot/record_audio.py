@@ -1,14 +1,157 @@
-import sounddevice as sd
+try:
+    import sounddevice as sd
+except (ImportError, OSError):  # no PortAudio (e.g. headless servers); only PulseAudio/browser capture works
+    sd = None
 from scipy.io.wavfile import write
 import os
+import queue
+import subprocess
+import threading
+import time
+import wave
 import numpy as np
 from dotenv import load_dotenv
 
+import tracing
+
 load_dotenv()
 
+
+class SegmentedWavWriter:
+    """Write int16 PCM blocks to disk, finalizing a new WAV segment every segment_seconds.
+
+    Only the segment currently being written is open, so memory stays constant and
+    every completed segment is a valid WAV file even if the process dies mid-meeting.
+    """
+
+    def __init__(self, base_path, sample_rate, channels, segment_seconds, on_segment=None):
+        stem = os.path.splitext(os.path.basename(base_path))[0]
+        self.segment_dir = os.path.join(os.path.dirname(os.path.abspath(base_path)), f"{stem}_segments")
+        os.makedirs(self.segment_dir, exist_ok=True)
+        self.stem = stem
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.segment_frames = max(1, int(segment_seconds * sample_rate))
+        self.on_segment = on_segment
+        self.segment_paths = []
+        self.frames_written = 0
+        self._wav = None
+        self._frames_in_segment = 0
+
+    def _open_segment(self):
+        path = os.path.join(self.segment_dir, f"{self.stem}_part{len(self.segment_paths):03d}.wav")
+        self._wav = wave.open(path, 'wb')
+        self._wav.setnchannels(self.channels)
+        self._wav.setsampwidth(2)
+        self._wav.setframerate(self.sample_rate)
+        self._frames_in_segment = 0
+        self.segment_paths.append(path)
+
+    def _finalize_segment(self):
+        if self._wav is None:
+            return
+        self._wav.close()
+        self._wav = None
+        path = self.segment_paths[-1]
+        print(f"[SEGMENT] Finalized {os.path.basename(path)} ({self._frames_in_segment / self.sample_rate:.1f}s)")
+        if self.on_segment is not None:
+            self.on_segment(len(self.segment_paths) - 1, path)
+
+    def write(self, block):
+        block = np.asarray(block, dtype=np.int16)
+        while len(block):
+            if self._wav is None:
+                self._open_segment()
+            room = self.segment_frames - self._frames_in_segment
+            part, block = block[:room], block[room:]
+            self._wav.writeframes(part.tobytes())
+            self._frames_in_segment += len(part)
+            self.frames_written += len(part)
+            if self._frames_in_segment >= self.segment_frames:
+                self._finalize_segment()
+
+    def close(self):
+        self._finalize_segment()
+        return list(self.segment_paths)
+
+
+def concatenate_wav_segments(segment_paths, output_path, block_frames=65536):
+    """Join finalized WAV segments into one file without loading them into memory"""
+    with wave.open(output_path, 'wb') as out:
+        for index, path in enumerate(segment_paths):
+            with wave.open(path, 'rb') as segment:
+                if index == 0:
+                    out.setparams(segment.getparams())
+                while True:
+                    frames = segment.readframes(block_frames)
+                    if not frames:
+                        break
+                    out.writeframes(frames)
+    return output_path
+
+
+class SilenceDetector:
+    """Running per-block RMS level that reports once audio stays quiet for grace_seconds.
+
+    The countdown only starts after the first block above the threshold, so a bot
+    that joins early or waits in a quiet lobby keeps recording until someone speaks.
+    """
+
+    def __init__(self, sample_rate, threshold_db=-50.0, grace_seconds=0.0):
+        self.sample_rate = sample_rate
+        self.threshold_db = threshold_db
+        self.grace_frames = int(grace_seconds * sample_rate)
+        self.silent_frames = 0
+        self.heard_sound = False
+        self.level_db = -120.0
+
+    def update(self, block):
+        """Feed one int16 block; returns True once the trailing silence reaches the grace period"""
+        if not len(block):
+            return False
+        samples = block.astype(np.float32) / 32768.0
+        rms = float(np.sqrt(np.mean(samples * samples)))
+        self.level_db = 20.0 * np.log10(max(rms, 1e-10))
+        if self.level_db >= self.threshold_db:
+            self.heard_sound = True
+            self.silent_frames = 0
+        elif self.heard_sound:
+            self.silent_frames += len(block)
+        return self.grace_frames > 0 and self.silent_frames >= self.grace_frames
+
+    @property
+    def silent_seconds(self):
+        return self.silent_frames / self.sample_rate
+
+
 class AudioRecorder:
-    def __init__(self):
+    def __init__(self, pulse_source=None, browser_tap=None):
         self.sample_rate = int(os.getenv('SAMPLE_RATE', 44100))
+        self.channels = 2
+        # Audio tapped inside the Meet tab arrives mono at the tap's own rate
+        self.browser_tap = browser_tap
+        if browser_tap is not None:
+            self.sample_rate = browser_tap.sample_rate
+            self.channels = 1
+        self.streaming = os.getenv('STREAMING_RECORDER', 'true').lower() == 'true'
+        self.segment_seconds = float(os.getenv('SEGMENT_MINUTES', 5)) * 60
+        self.queue_blocks = int(os.getenv('RECORDER_QUEUE_BLOCKS', 200))
+        self.block_frames = self.sample_rate // 10
+        self.segment_paths = []
+        self.dropped_frames = 0
+        self.stop_event = threading.Event()
+        self.stop_reason = None
+        self.silence_stop_seconds = float(os.getenv('SILENCE_STOP_SECONDS', 0))
+        self.silence_threshold_db = float(os.getenv('SILENCE_THRESHOLD_DB', -50))
+        self.auto_stopped = False
+        # A PulseAudio source (e.g. "<sink>.monitor") captured with parec instead of a sounddevice input
+        self.pulse_source = pulse_source
+        self.capture_pid = None
+
+    def stop(self, reason="stopped"):
+        """End a running recording early; the file is still finalized as usual"""
+        self.stop_reason = reason
+        self.stop_event.set()
         
     def list_audio_devices(self):
         """List all available audio devices for debugging"""
@@ -34,43 +177,46 @@ class AudioRecorder:
         print("[AUDIO_DEVICE] Using default input device")
         return None
     
-    def get_audio(self, filename, duration):
+    @tracing.traced('audio.record')
+    def get_audio(self, filename, duration, on_segment=None):
         try:
             print(f"\n{'='*60}")
             print(f"[RECORDING] Starting audio capture")
             print(f"{'='*60}")
             
-            # List available devices
-            self.list_audio_devices()
-            
-            # Find Stereo Mix device
-            input_device = self.find_stereo_mix_device()
-            
-            if input_device is None:
-                print("[WARNING] Stereo Mix not found! Using default device.")
-                print("[WARNING] Audio may not capture meeting sound!")
+            if self.browser_tap is not None:
+                input_device = None
+                print("[AUDIO_DEVICE] Meet tab audio (in-browser capture)")
+            elif self.pulse_source:
+                input_device = None
+                print(f"[AUDIO_DEVICE] PulseAudio source: {self.pulse_source}")
+            else:
+                if sd is None:
+                    raise RuntimeError("sounddevice/PortAudio is not available; use CAPTURE_BACKEND=browser")
+                # List available devices
+                self.list_audio_devices()
+                
+                # Find Stereo Mix device
+                input_device = self.find_stereo_mix_device()
+                
+                if input_device is None:
+                    print("[WARNING] Stereo Mix not found! Using default device.")
+                    print("[WARNING] Audio may not capture meeting sound!")
             
             print(f"[RECORDING] Duration: {duration} seconds ({duration//60}m {duration%60}s)")
             print(f"[RECORDING] Sample rate: {self.sample_rate} Hz")
             print(f"[RECORDING] File: {filename}")
             print(f"\n[RECORDING] Recording started... Please wait...")
             
-            # Record audio
-            recording = sd.rec(
-                int(duration * self.sample_rate), 
-                samplerate=self.sample_rate, 
-                channels=2,
-                dtype='int16',
-                device=input_device
-            )
-            
-            # Wait for recording to complete
-            sd.wait()
-            
-            print(f"\n[RECORDING] Recording completed!")
+            if self.streaming or self.pulse_source or self.browser_tap is not None:
+                audio_level = self.stream_audio(filename, duration, input_device, on_segment)
+            else:
+                audio_level = self.record_in_memory(filename, duration, input_device)
             
-            # Check audio level
-            audio_level = np.max(np.abs(recording))
+            if self.stop_reason:
+                print(f"\n[RECORDING] Recording stopped early: {self.stop_reason}")
+            else:
+                print(f"\n[RECORDING] Recording completed!")
             print(f"[AUDIO_LEVEL] Peak level: {audio_level}")
             
             if audio_level < 100:
@@ -82,10 +228,8 @@ class AudioRecorder:
             else:
                 print(f"[SUCCESS] ✅ Good audio level detected!")
             
-            # Save to WAV file
-            write(filename, self.sample_rate, recording)
-            
             # Get file size
+            tracing.count('audio.bytes_recorded', os.path.getsize(filename))
             file_size = os.path.getsize(filename) / (1024 * 1024)  # MB
             print(f"[FILE] Saved: {filename}")
             print(f"[FILE] Size: {file_size:.2f} MB")
@@ -96,4 +240,162 @@ class AudioRecorder:
             print(f"[RECORDING_ERROR] This usually means:")
             print(f"  1. Stereo Mix is not enabled")
             print(f"  2. Audio device is in use by another application")
-            print(f"  3. Permissions issue")
\ No newline at end of file
+            print(f"  3. Permissions issue")
+
+    def record_in_memory(self, filename, duration, input_device):
+        """Capture the whole meeting into one buffer, then write it (STREAMING_RECORDER=false)"""
+        recording = sd.rec(
+            int(duration * self.sample_rate), 
+            samplerate=self.sample_rate, 
+            channels=self.channels,
+            dtype='int16',
+            device=input_device
+        )
+        
+        # Wait for recording to complete (or for stop() to cut it short)
+        started = time.monotonic()
+        if self.stop_event.wait(duration):
+            sd.stop()
+            recording = recording[:int((time.monotonic() - started) * self.sample_rate)]
+        else:
+            sd.wait()
+        write(filename, self.sample_rate, recording)
+        return int(np.max(np.abs(recording))) if len(recording) else 0
+
+    def stream_audio(self, filename, duration, input_device=None, on_segment=None):
+        """Stream audio to rotating WAV segments on disk, then join them into filename.
+
+        The PortAudio callback only copies each block into a bounded queue; a writer
+        thread drains it to disk. If the writer falls behind, blocks are dropped and
+        counted rather than blocking the audio thread.
+        """
+        blocks = queue.Queue(maxsize=self.queue_blocks)
+        writer = SegmentedWavWriter(filename, self.sample_rate, self.channels,
+                                    self.segment_seconds, on_segment)
+        self.dropped_frames = 0
+        self.auto_stopped = False
+        silence = SilenceDetector(self.sample_rate, self.silence_threshold_db, self.silence_stop_seconds)
+        peak = [0]
+        writer_errors = []
+
+        def callback(indata, frames, time_info, status):
+            if status:
+                print(f"[RECORDING] ⚠️ Stream status: {status}")
+            try:
+                blocks.put_nowait(indata.copy())
+            except queue.Full:
+                self.dropped_frames += frames
+
+        def drain():
+            try:
+                while True:
+                    block = blocks.get()
+                    if block is None:
+                        break
+                    if len(block):
+                        peak[0] = max(peak[0], int(np.max(np.abs(block.astype(np.int32)))))
+                    writer.write(block)
+                    if silence.update(block) and not self.stop_event.is_set():
+                        self.auto_stopped = True
+                        self.stop(f"silent for {silence.silent_seconds:.0f}s")
+            except Exception as e:
+                # Nothing drains the queue any more; end the capture and report it from this thread
+                writer_errors.append(e)
+                self.stop(f"writing audio failed: {e}")
+
+        writer_thread = threading.Thread(target=tracing.bind(drain), name="segment-writer", daemon=True)
+        writer_thread.start()
+        print(f"[RECORDING] Streaming to {writer.segment_dir} "
+              f"(new segment every {self.segment_seconds / 60:g} min)")
+        if self.silence_stop_seconds > 0:
+            print(f"[RECORDING] Auto-stop after {self.silence_stop_seconds:g}s below {self.silence_threshold_db:g} dBFS")
+
+        try:
+            if self.browser_tap is not None:
+                self.capture_browser(duration, blocks)
+            elif self.pulse_source:
+                self.capture_pulse(duration, blocks)
+            else:
+                with sd.InputStream(samplerate=self.sample_rate, channels=self.channels,
+                                    dtype='int16', device=input_device,
+                                    blocksize=self.block_frames, callback=callback):
+                    self.wait_until_done(duration)
+        finally:
+            # A dead writer leaves the queue full, so never block on the end marker
+            while writer_thread.is_alive():
+                try:
+                    blocks.put(None, timeout=0.5)
+                    break
+                except queue.Full:
+                    pass
+            writer_thread.join()
+            self.segment_paths = writer.close()
+        if writer_errors:
+            raise RuntimeError(f"Audio writer failed: {writer_errors[0]}") from writer_errors[0]
+
+        tracing.count('audio.frames_dropped', self.dropped_frames)
+        if self.dropped_frames:
+            print(f"[RECORDING] ⚠️ Dropped {self.dropped_frames / self.sample_rate:.2f}s of audio (writer fell behind)")
+        if self.segment_paths:
+            concatenate_wav_segments(self.segment_paths, filename)
+        return peak[0]
+
+    def wait_until_done(self, duration):
+        deadline = time.monotonic() + duration
+        while time.monotonic() < deadline and not self.stop_event.is_set():
+            self.stop_event.wait(min(0.2, max(0.0, deadline - time.monotonic())))
+
+    def capture_pulse(self, duration, blocks):
+        """Read raw PCM from a PulseAudio source with parec and feed it to the writer queue"""
+        command = ['parec', f'--device={self.pulse_source}', '--format=s16le',
+                   f'--rate={self.sample_rate}', f'--channels={self.channels}', '--raw']
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        self.capture_pid = process.pid
+        block_bytes = self.block_frames * self.channels * 2
+
+        def read():
+            while True:
+                data = process.stdout.read(block_bytes)
+                if not data:
+                    break
+                block = np.frombuffer(data[:len(data) - len(data) % (self.channels * 2)], dtype=np.int16)
+                try:
+                    blocks.put_nowait(block.reshape(-1, self.channels))
+                except queue.Full:
+                    self.dropped_frames += len(block) // self.channels
+
+        reader = threading.Thread(target=read, name="parec-reader", daemon=True)
+        reader.start()
+        try:
+            self.wait_until_done(duration)
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                process.kill()
+            reader.join()
+
+    def capture_browser(self, duration, blocks):
+        """Poll the Meet tab for captured PCM and feed it to the writer queue"""
+        tap = self.browser_tap
+        tap.drain()  # discard anything buffered before the recording started
+        deadline = time.monotonic() + duration
+        while True:
+            stopping = time.monotonic() >= deadline or self.stop_event.is_set()
+            try:
+                block = tap.drain()
+            except Exception as e:
+                print(f"[RECORDING] ⚠️ Browser capture failed: {e}")
+                break
+            if len(block):
+                try:
+                    blocks.put_nowait(block)
+                except queue.Full:
+                    self.dropped_frames += len(block)
+            if stopping:
+                break
+            self.stop_event.wait(min(tap.poll_seconds, max(0.0, deadline - time.monotonic())))
+        self.dropped_frames += tap.dropped_frames
+        if not tap.tracks:
+            print("[RECORDING] ⚠️ No remote audio tracks were seen in the Meet tab")
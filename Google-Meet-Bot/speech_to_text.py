@@ -1,91 +1,428 @@
 # speech_to_text.py - FIXED VERSION WITH BETTER ERROR HANDLING
-from openai import OpenAI
 import json
 import os
-import subprocess
+import shutil
+import struct
 import tempfile
 import datetime
+import hashlib
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field, replace
+from math import gcd
+from typing import List
+import numpy as np
 from dotenv import load_dotenv
 
+import tracing
+from audio_chunker import AudioChunker, stitch_transcripts
+from disk_cache import DiskCache, file_digest, make_key
+from openai_gateway import get_gateway
+from transcript_compaction import TranscriptCompactor
+from transcript_windows import count_tokens, split_into_windows
+from transcription_backends import create_backend
+from voice_activity import VoiceActivityTrimmer
+
+try:
+    import soundfile as sf
+except (ImportError, OSError):  # optional: pip install google-meet-bot[flac]
+    sf = None
+
 load_dotenv()
 
+UPLOAD_FORMATS = {
+    # name: (soundfile format, subtype, extension)
+    'flac': ('FLAC', 'PCM_16', 'flac'),
+    'opus': ('OGG', 'OPUS', 'ogg'),
+}
+
+
+def read_wav_header(audio_file_path):
+    """Return (sample_rate, channels, bits_per_sample, data_bytes) from a WAV header"""
+    with open(audio_file_path, 'rb') as f:
+        riff, _, wave_id = struct.unpack('<4sI4s', f.read(12))
+        if riff not in (b'RIFF', b'RF64') or wave_id != b'WAVE':
+            raise ValueError(f"Not a WAV file: {audio_file_path}")
+        fmt = None
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                break
+            chunk_id, chunk_size = struct.unpack('<4sI', header)
+            if chunk_id == b'fmt ':
+                _, channels, sample_rate, _, _, bits = struct.unpack('<HHIIHH', f.read(16))
+                fmt = (sample_rate, channels, bits)
+                f.seek(chunk_size - 16 + (chunk_size & 1), os.SEEK_CUR)
+            elif chunk_id == b'data':
+                if fmt is None:
+                    break
+                # A header left unfinalized by a crash reports 0 bytes; trust the file size instead
+                available = os.path.getsize(audio_file_path) - f.tell()
+                data_bytes = chunk_size if 0 < chunk_size <= available else available
+                return fmt + (data_bytes,)
+            else:
+                f.seek(chunk_size + (chunk_size & 1), os.SEEK_CUR)
+    raise ValueError(f"WAV header incomplete: {audio_file_path}")
+
+
+def _to_float_mono(block):
+    """Downmix a PCM block to mono float32 in [-1, 1]"""
+    if block.dtype == np.uint8:
+        samples = (block.astype(np.float32) - 128.0) / 128.0
+    elif np.issubdtype(block.dtype, np.integer):
+        samples = block.astype(np.float32) / float(np.iinfo(block.dtype).max + 1)
+    else:
+        samples = block.astype(np.float32)
+    if samples.ndim > 1:
+        samples = samples.mean(axis=1)
+    return samples
+
+SUMMARY_PROMPT = (
+    "You are a highly skilled AI trained in language comprehension and summarization. I would like "
+    "you to read the following text and summarize it into a concise abstract paragraph. Aim to "
+    "retain the most important points, providing a coherent and readable summary that could help a "
+    "person understand the main points of the discussion without needing to read the entire text. "
+    "Please avoid unnecessary details or tangential points."
+)
+
+KEY_POINTS_PROMPT = (
+    "You are a proficient AI with a specialty in distilling information into key points. Based on "
+    "the following text, identify and list the main points that were discussed or brought up. These "
+    "should be the most important ideas, findings, or topics that are crucial to the essence of the "
+    "discussion. Your goal is to provide a list that someone could read to quickly understand what "
+    "was talked about."
+)
+
+ACTION_ITEMS_PROMPT = (
+    "You are an AI expert in analyzing conversations and extracting action items. Please review the "
+    "text and identify any tasks, assignments, or actions that were agreed upon or mentioned as "
+    "needing to be done. These could be tasks assigned to specific individuals, or general actions "
+    "that the group has decided to take. Please list these action items clearly and concisely."
+)
+
+SENTIMENT_PROMPT = (
+    "As an AI with expertise in language and emotion analysis, your task is to analyze the "
+    "sentiment of the following text. Please consider the overall tone of the discussion, the "
+    "emotion conveyed by the language used, and the context in which words and phrases are used. "
+    "Indicate whether the sentiment is generally positive, negative, or neutral, and provide brief "
+    "explanations for your analysis where possible."
+)
+
+REDUCE_PROMPT = (
+    "The user message contains partial results, in order, produced by applying the instructions "
+    "below to consecutive sections of one long meeting transcript. Merge them into a single result "
+    "that follows the same instructions for the meeting as a whole, combining duplicates and keeping "
+    "the original order. Keep the merged result under {max_words} words.\n\nInstructions: {instructions}"
+)
+
+MEETING_MINUTES_PROMPT = (
+    "You are an AI expert in analyzing meeting transcripts. Read the following text and return "
+    "the meeting minutes as JSON. 'abstract_summary' is a concise abstract paragraph that retains "
+    "the most important points without unnecessary details. 'key_points' lists the main ideas, "
+    "findings, or topics discussed, one per entry. 'action_items' lists the tasks, assignments, or "
+    "actions that were agreed upon or mentioned as needing to be done, one per entry, naming the "
+    "owner when known. 'sentiment' states whether the overall tone is positive, negative, or "
+    "neutral, with a brief explanation."
+)
+
+MEETING_MINUTES_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "abstract_summary": {"type": "string"},
+        "key_points": {"type": "array", "items": {"type": "string"}},
+        "action_items": {"type": "array", "items": {"type": "string"}},
+        "sentiment": {"type": "string"},
+    },
+    "required": ["abstract_summary", "key_points", "action_items", "sentiment"],
+    "additionalProperties": False,
+}
+
+# Span labels for chat completions (reduce steps use a formatted REDUCE_PROMPT)
+PROMPT_NAMES = {
+    SUMMARY_PROMPT: 'summary',
+    KEY_POINTS_PROMPT: 'key_points',
+    ACTION_ITEMS_PROMPT: 'action_items',
+    SENTIMENT_PROMPT: 'sentiment',
+    MEETING_MINUTES_PROMPT: 'structured',
+}
+
+
+@dataclass
+class MeetingMinutes:
+    """Structured meeting analysis produced by a single completion"""
+    abstract_summary: str
+    key_points: List[str] = field(default_factory=list)
+    action_items: List[str] = field(default_factory=list)
+    sentiment: str = "Neutral"
+
+    @classmethod
+    def from_json(cls, content):
+        data = json.loads(content)
+        return cls(
+            abstract_summary=str(data["abstract_summary"]).strip(),
+            key_points=[str(item).strip() for item in data.get("key_points", []) if str(item).strip()],
+            action_items=[str(item).strip() for item in data.get("action_items", []) if str(item).strip()],
+            sentiment=str(data.get("sentiment", "Neutral")).strip(),
+        )
+
+    def to_dict(self):
+        return asdict(self)
+
 class SpeechToText:
-    def __init__(self):
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise ValueError("❌ OPENAI_API_KEY not found in .env file")
+    def __init__(self, client=None):
+        if client is None:
+            api_key = os.getenv("OPENAI_API_KEY")
+            if not api_key:
+                raise ValueError("❌ OPENAI_API_KEY not found in .env file")
+            # Shared by every instance: pooled connections, one rate budget, retries
+            client = get_gateway()
             
-        self.client = OpenAI(api_key=api_key)
+        self.client = client
         self.MAX_AUDIO_SIZE_BYTES = int(os.getenv('MAX_AUDIO_SIZE_BYTES', 20 * 1024 * 1024))
         self.GPT_MODEL = os.getenv('GPT_MODEL', 'gpt-4')
         self.WHISPER_MODEL = os.getenv('WHISPER_MODEL', 'whisper-1')
+        self.PARALLEL_ANALYSIS = os.getenv('PARALLEL_ANALYSIS', 'true').lower() == 'true'
+        self.ANALYSIS_WORKERS = int(os.getenv('ANALYSIS_WORKERS', 4))
+        # 'structured' sends the transcript once; 'separate' runs the four prompts
+        self.ANALYSIS_MODE = os.getenv('ANALYSIS_MODE', 'separate').lower()
+        self.TRANSCRIBE_WORKERS = int(os.getenv('TRANSCRIBE_WORKERS', 4))
+        self.AUDIO_PREPROCESS = os.getenv('AUDIO_PREPROCESS', 'true').lower() == 'true'
+        self.TARGET_SAMPLE_RATE = int(os.getenv('TARGET_SAMPLE_RATE', 16000))
+        self.UPLOAD_FORMAT = os.getenv('UPLOAD_FORMAT', 'flac').lower()
+        self.VAD_TRIM = os.getenv('VAD_TRIM', 'true').lower() == 'true'
+        self.WHISPER_LANGUAGE = os.getenv('WHISPER_LANGUAGE', 'en')
+        self.transcription_backend = create_backend(client=self.client, openai_model=self.WHISPER_MODEL)
+        self.transcription_cache = None
+        if os.getenv('TRANSCRIPTION_CACHE', 'true').lower() == 'true':
+            self.transcription_cache = DiskCache(
+                os.getenv('TRANSCRIPTION_CACHE_DIR', '~/.cache/google-meet-bot/transcriptions'),
+                int(float(os.getenv('TRANSCRIPTION_CACHE_MAX_MB', 256)) * 1024 * 1024)
+            )
+        self.analysis_cache = None
+        if os.getenv('ANALYSIS_CACHE', 'true').lower() == 'true':
+            self.analysis_cache = DiskCache(
+                os.getenv('ANALYSIS_CACHE_DIR', '~/.cache/google-meet-bot/analyses'),
+                int(float(os.getenv('ANALYSIS_CACHE_MAX_MB', 64)) * 1024 * 1024),
+                ttl_seconds=float(os.getenv('ANALYSIS_CACHE_TTL_HOURS', 720)) * 3600
+            )
+        self.trimmer = VoiceActivityTrimmer()
+        self.last_trim = None
+        self.chunker = AudioChunker(self.MAX_AUDIO_SIZE_BYTES)
+        self.ANALYSIS_WINDOW_TOKENS = int(os.getenv('ANALYSIS_WINDOW_TOKENS', 6000))
+        self.TRANSCRIPT_COMPACTION = os.getenv('TRANSCRIPT_COMPACTION', 'true').lower() == 'true'
+        self.compactor = TranscriptCompactor()
+        self.last_compaction = None
+        self.analysis_timings = {}
         
         print(f"✅ OpenAI initialized")
         print(f"   GPT Model: {self.GPT_MODEL}")
         print(f"   Whisper Model: {self.WHISPER_MODEL}")
+        print(f"   Transcription: {self.transcription_backend.name}")
 
     def get_file_size(self, file_path):
         return os.path.getsize(file_path)
 
     def get_audio_duration(self, audio_file_path):
-        """Get audio duration using ffprobe"""
+        """Get audio duration from the WAV header"""
         try:
-            result = subprocess.run(
-                ['ffprobe', '-i', audio_file_path, '-show_entries', 
-                 'format=duration', '-v', 'quiet', '-of', 'csv=p=0'], 
-                stdout=subprocess.PIPE, 
-                stderr=subprocess.STDOUT,
-                timeout=10,
-                check=False
-            )
-            duration = float(result.stdout.decode('utf-8').strip())
+            sample_rate, channels, bits, data_bytes = read_wav_header(audio_file_path)
+            duration = data_bytes / float(sample_rate * channels * (bits // 8))
             print(f"📊 Audio duration: {duration:.2f} seconds ({duration/60:.2f} minutes)")
             return duration
         except Exception as e:
             print(f"⚠️ Could not get audio duration: {e}")
             return 0
 
-    def resize_audio_if_needed(self, audio_file_path):
-        """Compress audio if it exceeds size limit"""
+    @tracing.traced('audio.preprocess')
+    def downmix_resample(self, audio_file_path, output_dir=None, block_seconds=30):
+        """Downmix to mono and resample to TARGET_SAMPLE_RATE as 16-bit WAV, block by block.
+
+        Each block is filtered with enough context from its neighbours to cover half
+        of resample_poly's default filter (10 * max(up, down) taps at the upsampled
+        rate), so block edges match the whole-signal result to within int16 rounding.
+        """
+        # scipy.signal alone costs ~0.5s to import; transcript-only runs never need it
+        from scipy.io import wavfile
+        from scipy.signal import resample_poly
+
+        sample_rate, data = wavfile.read(audio_file_path, mmap=True)
+        target_rate = self.TARGET_SAMPLE_RATE
+        common = gcd(sample_rate, target_rate)
+        up, down = target_rate // common, sample_rate // common
+        if (data.ndim == 1 or data.shape[1] == 1) and up == down and data.dtype == np.int16:
+            return audio_file_path
+
+        block = max(down, (int(block_seconds * sample_rate) // down) * down)
+        # Half the filter in input samples plus one decimation step, kept a multiple
+        # of down so every block starts on the same polyphase phase
+        pad = -(-(10 * max(up, down) // up + down) // down) * down
+        total = len(data)
+
+        if output_dir is None:
+            output_dir = tempfile.mkdtemp(prefix='preprocessed_')
+        stem = os.path.splitext(os.path.basename(audio_file_path))[0]
+        output_path = os.path.join(output_dir, f'{stem}_{target_rate // 1000}k_mono.wav')
+        with wave.open(output_path, 'wb') as out:
+            out.setnchannels(1)
+            out.setsampwidth(2)
+            out.setframerate(target_rate)
+            for start in range(0, total, block):
+                end = min(start + block, total)
+                left = min(pad, start)
+                right = min(pad, total - end)
+                samples = _to_float_mono(np.asarray(data[start - left:end + right]))
+                resampled = resample_poly(samples, up, down) if up != down else samples
+                first = left * up // down
+                count = -(-(end - start) * up // down)
+                pcm = np.clip(resampled[first:first + count] * 32767.0, -32768, 32767).astype(np.int16)
+                out.writeframes(pcm.tobytes())
+
+        before = self.get_file_size(audio_file_path)
+        after = self.get_file_size(output_path)
+        print(f"🎛️ Preprocessed to {target_rate} Hz mono: {before / (1024*1024):.2f} MB → {after / (1024*1024):.2f} MB")
+        return output_path
+
+    @tracing.traced('audio.encode')
+    def encode_for_upload(self, wav_path):
+        """Encode a WAV chunk with UPLOAD_FORMAT; falls back to WAV if soundfile is missing"""
+        if self.UPLOAD_FORMAT not in UPLOAD_FORMATS:
+            return wav_path
+        if sf is None:
+            print("⚠️ soundfile not installed, uploading WAV (pip install google-meet-bot[flac])")
+            return wav_path
+        file_format, subtype, extension = UPLOAD_FORMATS[self.UPLOAD_FORMAT]
+        encoded_path = os.path.splitext(wav_path)[0] + '.' + extension
+        try:
+            info = sf.info(wav_path)
+            with sf.SoundFile(encoded_path, 'w', samplerate=info.samplerate, channels=info.channels,
+                              format=file_format, subtype=subtype) as out:
+                for block in sf.blocks(wav_path, blocksize=65536, dtype='int16'):
+                    out.write(block)
+            return encoded_path
+        except Exception as e:
+            print(f"⚠️ {self.UPLOAD_FORMAT} encoding failed, uploading WAV: {e}")
+            return wav_path
+
+    def _transcribe_chunk(self, wav_path):
+        upload_path = self.encode_for_upload(wav_path)
+        try:
+            return self.transcribe_audio(upload_path)
+        finally:
+            if upload_path != wav_path and os.path.exists(upload_path):
+                os.remove(upload_path)
+
+    def transcribe_chunks(self, chunks):
+        """Transcribe chunks concurrently and stitch the text back in order.
+
+        Returns (text, complete); complete is False when any chunk failed.
+        """
+        print(f"🧩 Transcribing {len(chunks)} chunks with {self.TRANSCRIBE_WORKERS} workers...")
+        with ThreadPoolExecutor(max_workers=max(1, self.TRANSCRIBE_WORKERS)) as pool:
+            texts = list(pool.map(tracing.bind(self._transcribe_chunk), [chunk.path for chunk in chunks]))
+        
+        failed = [chunk for chunk, text in zip(chunks, texts) if text is None]
+        for chunk in failed:
+            print(f"⚠️ Chunk {chunk.start_seconds:.0f}s-{chunk.end_seconds:.0f}s could not be transcribed")
+        if len(failed) == len(chunks):
+            return None, False
+        return stitch_transcripts(texts), not failed
+
+    def to_original_times(self, chunks):
+        """Chunks cut from trimmed audio, with their positions mapped back onto the recording"""
+        if self.last_trim is None:
+            return chunks
+        return [replace(chunk, start_seconds=self.last_trim.to_original(chunk.start_seconds),
+                        end_seconds=self.last_trim.to_original(chunk.end_seconds)) for chunk in chunks]
+
+    @tracing.traced('audio.vad_trim')
+    def trim_silence(self, audio_file_path, output_dir=None):
+        """Collapse silent spans and keep the time map for offset lookups"""
+        result = self.trimmer.trim(audio_file_path, output_dir)
+        self.last_trim = result
+        if result.original_seconds > 0:
+            share = 100.0 * result.removed_seconds / result.original_seconds
+            print(f"🔇 Silence trimmed: removed {result.removed_seconds:.1f}s of "
+                  f"{result.original_seconds:.1f}s ({share:.0f}%)")
+        return result
+
+    def _transcription_key(self, audio_file_path, stage):
+        """Cache key: audio content plus every setting that changes what Whisper returns"""
+        settings = {'model': self.WHISPER_MODEL, 'language': self.WHISPER_LANGUAGE}
+        if self.transcription_backend.name != 'openai':
+            settings['backend'] = self.transcription_backend.identity()
+        if stage == 'recording':
+            settings.update({
+                'preprocess': self.AUDIO_PREPROCESS,
+                'sample_rate': self.TARGET_SAMPLE_RATE,
+                'vad': self.VAD_TRIM and (self.trimmer.threshold_db,
+                                          self.trimmer.min_silence_seconds,
+                                          self.trimmer.keep_silence_seconds),
+            })
+        return make_key(stage, file_digest(audio_file_path), settings)
+
+    @tracing.traced('transcription')
+    def transcribe_recording(self, audio_file_path):
+        """Transcribe a recording of any length without dropping audio"""
         audio_size = self.get_file_size(audio_file_path)
         print(f"📦 Audio file size: {audio_size / (1024*1024):.2f} MB")
+        self.get_audio_duration(audio_file_path)
         
-        if audio_size > self.MAX_AUDIO_SIZE_BYTES:
-            print(f"⚠️ File too large! Compressing...")
-            current_duration = self.get_audio_duration(audio_file_path)
-            if current_duration <= 0:
-                return audio_file_path
-                
-            target_duration = current_duration * self.MAX_AUDIO_SIZE_BYTES / audio_size
+        cache_key = None
+        if self.transcription_cache is not None:
+            cache_key = self._transcription_key(audio_file_path, 'recording')
+            cached = self.transcription_cache.get(cache_key)
+            if cached is not None:
+                print("⚡ Transcript found in cache, skipping upload")
+                return cached['text']
+        
+        transcription, complete = self._transcribe_uncached_recording(audio_file_path)
+        if cache_key is not None and complete:
+            self.transcription_cache.set(cache_key, {'text': transcription})
+        return transcription
+
+    def _transcribe_uncached_recording(self, audio_file_path):
+        work_dir = tempfile.mkdtemp(prefix='transcribe_')
+        try:
+            if self.AUDIO_PREPROCESS:
+                audio_file_path = self.downmix_resample(audio_file_path, work_dir)
             
-            temp_dir = tempfile.mkdtemp()
-            print(f"📂 Temp dir: {temp_dir}")
+            self.last_trim = None
+            if self.VAD_TRIM:
+                trimmed = self.trim_silence(audio_file_path, work_dir)
+                if trimmed.trimmed_seconds == 0:
+                    print("⚠️ No voice activity detected, skipping upload")
+                    return "", True
+                audio_file_path = trimmed.path
             
-            compressed_audio_path = os.path.join(
-                temp_dir, 
-                f'compressed_audio_{datetime.datetime.now().strftime("%Y%m%d%H%M%S")}.wav'
-            )
+            if not self.transcription_backend.uploads:
+                # Local engines have no request size limit and window the audio themselves
+                text = self.transcribe_audio(audio_file_path)
+                return text, text is not None
             
-            try:
-                subprocess.run(
-                    ['ffmpeg', '-i', audio_file_path, '-ss', '0', 
-                     '-t', str(target_duration), compressed_audio_path],
-                    timeout=60,
-                    check=True,
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL
-                )
-                print(f"✅ Compressed to {target_duration:.2f} seconds")
-                return compressed_audio_path
-            except Exception as e:
-                print(f"⚠️ Compression failed: {e}")
-                return audio_file_path
-        
-        print("✅ File size OK, no compression needed")
-        return audio_file_path
+            with tracing.span('audio.chunk') as span:
+                chunks = self.to_original_times(self.chunker.split(audio_file_path, work_dir))
+                span['chunks'] = len(chunks)
+            if len(chunks) == 1:
+                print("✅ File size OK, no chunking needed")
+                text = self._transcribe_chunk(chunks[0].path)
+                return text, text is not None
+            print("⚠️ File over upload limit, split at quiet points")
+            return self.transcribe_chunks(chunks)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
 
     def transcribe_audio(self, audio_file_path):
-        """Transcribe audio using OpenAI Whisper"""
+        """Transcribe audio with the configured backend, reusing a cached transcript when the audio is known"""
+        cache_key = None
+        if self.transcription_cache is not None:
+            cache_key = self._transcription_key(audio_file_path, 'upload')
+            cached = self.transcription_cache.get(cache_key)
+            if cached is not None:
+                print(f"⚡ Cache hit for {os.path.basename(audio_file_path)}")
+                tracing.count('cache.transcription_hits')
+                return cached['text']
+        
         try:
             print(f"\n{'='*60}")
             print("🎤 STARTING TRANSCRIPTION")
@@ -93,22 +430,11 @@ class SpeechToText:
             print(f"📁 File: {audio_file_path}")
             print(f"📦 Size: {self.get_file_size(audio_file_path) / (1024*1024):.2f} MB")
             
-            with open(audio_file_path, 'rb') as audio_file:
-                print("🔄 Sending to OpenAI Whisper API...")
-                
-                # ✅ USE 'transcriptions' NOT 'translations'
-                transcript = self.client.audio.transcriptions.create(
-                    file=audio_file,
-                    model=self.WHISPER_MODEL,
-                    response_format="text",
-                    language="en"  # Specify English
-                )
-                
-                print("✅ Transcription completed!")
-                print(f"📝 Length: {len(transcript)} characters")
-                print(f"{'='*60}\n")
-                
-                return transcript
+            transcript = self.transcription_backend.transcribe(audio_file_path, self.WHISPER_LANGUAGE)
+            
+            print("✅ Transcription completed!")
+            print(f"📝 Length: {len(transcript)} characters")
+            print(f"{'='*60}\n")
                 
         except Exception as e:
             print(f"\n❌ TRANSCRIPTION ERROR!")
@@ -116,27 +442,125 @@ class SpeechToText:
             print(f"Error message: {str(e)}")
             print(f"{'='*60}\n")
             return None
+        
+        # Outside the try: the transcript is paid for, so a cache problem must not discard it
+        if cache_key is not None:
+            self.transcription_cache.set(cache_key, {'text': transcript})
+        return transcript
 
-    def abstract_summary_extraction(self, transcription):
-        """Generate summary using GPT"""
-        try:
-            print("📊 Generating summary...")
+    def _complete(self, system_prompt, transcription, response_format=None, max_tokens=None, parse=None):
+        """Run a temperature-0 chat completion, memoized on transcript, prompt and model.
+
+        With parse, the content must parse before it is cached; a truncated or invalid
+        structured response raises here and is retried on the next run instead of replayed.
+        """
+        cache_key = None
+        if self.analysis_cache is not None:
+            transcript_hash = hashlib.sha256(transcription.encode('utf-8')).hexdigest()
+            cache_key = make_key('chat', transcript_hash, system_prompt, self.GPT_MODEL, response_format,
+                                 *([max_tokens] if max_tokens is not None else []))
+            cached = self.analysis_cache.get(cache_key)
+            if cached is not None:
+                tracing.count('cache.analysis_hits')
+                return cached['content']
+        
+        request = {}
+        if response_format is not None:
+            request['response_format'] = response_format
+        if max_tokens is not None:
+            request['max_tokens'] = max_tokens
+        with tracing.span('openai.chat', model=self.GPT_MODEL, prompt=PROMPT_NAMES.get(system_prompt, 'reduce')) as span:
+            tracing.count('openai.chat_requests')
             response = self.client.chat.completions.create(
                 model=self.GPT_MODEL,
                 temperature=0,
                 messages=[
                     {
                         "role": "system",
-                        "content": "You are a highly skilled AI trained in language comprehension and summarization. I would like you to read the following text and summarize it into a concise abstract paragraph. Aim to retain the most important points, providing a coherent and readable summary that could help a person understand the main points of the discussion without needing to read the entire text. Please avoid unnecessary details or tangential points."
+                        "content": system_prompt
                     },
                     {
                         "role": "user",
                         "content": transcription
                     }
-                ]
+                ],
+                **request
             )
+            usage = getattr(response, 'usage', None)
+            if usage is not None:
+                span['prompt_tokens'] = usage.prompt_tokens
+                span['completion_tokens'] = usage.completion_tokens
+                tracing.count('tokens.prompt', usage.prompt_tokens)
+                tracing.count('tokens.completion', usage.completion_tokens)
+        content = response.choices[0].message.content
+        if parse is not None:
+            parse(content)
+        if cache_key is not None:
+            self.analysis_cache.set(cache_key, {'content': content})
+        return content
+
+    def _analyze(self, system_prompt, transcription, response_format=None, parse=None):
+        """Run one analysis, map-reducing over sentence windows when the transcript is too long.
+
+        Windows are analyzed concurrently, then their partial results are merged in a tree
+        of reduce calls until one result is left. Every reduce output is capped at half a
+        window, so any two results fit together and each level shrinks; no partial is
+        ever dropped.
+        """
+        tokens = count_tokens(transcription, self.GPT_MODEL)
+        if tokens <= self.ANALYSIS_WINDOW_TOKENS:
+            return self._complete(system_prompt, transcription, response_format, parse=parse)
+        
+        windows = split_into_windows(transcription, self.ANALYSIS_WINDOW_TOKENS, self.GPT_MODEL)
+        print(f"🪟 Transcript is ~{tokens} tokens, mapping over {len(windows)} windows")
+        def analyze_window(window):
+            return self._complete(system_prompt, window, response_format, parse=parse)
+
+        with ThreadPoolExecutor(max_workers=max(1, self.ANALYSIS_WORKERS)) as pool:
+            partials = list(pool.map(tracing.bind(analyze_window), windows))
+        return self._reduce(system_prompt, partials, response_format, parse)
+
+    def _reduce(self, system_prompt, partials, response_format=None, parse=None):
+        """Merge ordered partial results level by level, each group fitting one window"""
+        cap = max(1, self.ANALYSIS_WINDOW_TOKENS // 2)
+        # Roughly 0.75 words per token, with headroom for the "Part n:" labels
+        reduce_prompt = REDUCE_PROMPT.format(instructions=system_prompt, max_words=cap // 2)
+
+        def merge(group):
+            merged = "\n\n".join(f"Part {index}:\n{partial}" for index, partial in enumerate(group, 1))
+            return self._complete(reduce_prompt, merged, response_format, max_tokens=cap, parse=parse)
+
+        def condense(partial):
+            return merge([partial]) if count_tokens(partial, self.GPT_MODEL) > cap else partial
+
+        with ThreadPoolExecutor(max_workers=max(1, self.ANALYSIS_WORKERS)) as pool:
+            # A partial over the cap is condensed on its own first, so every group holds at least two
+            partials = list(pool.map(tracing.bind(condense), partials))
+            level = 0
+            while len(partials) > 1:
+                groups, group_tokens = [[]], 0
+                for partial in partials:
+                    partial_tokens = count_tokens(partial, self.GPT_MODEL)
+                    if groups[-1] and group_tokens + partial_tokens > self.ANALYSIS_WINDOW_TOKENS:
+                        groups.append([])
+                        group_tokens = 0
+                    groups[-1].append(partial)
+                    group_tokens += partial_tokens
+                if len(groups) == len(partials):
+                    # Token estimates ran over the cap; pair results anyway so every level shrinks
+                    groups = [partials[index:index + 2] for index in range(0, len(partials), 2)]
+                level += 1
+                print(f"🧮 Reduce level {level}: merging {len(partials)} partial results in {len(groups)} groups")
+                partials = list(pool.map(tracing.bind(merge), groups))
+        return partials[0]
+
+    def abstract_summary_extraction(self, transcription):
+        """Generate summary using GPT"""
+        try:
+            print("📊 Generating summary...")
+            content = self._analyze(SUMMARY_PROMPT, transcription)
             print("✅ Summary generated")
-            return response.choices[0].message.content
+            return content
         except Exception as e:
             print(f"❌ Summary error: {e}")
             return "Summary unavailable due to processing error."
@@ -145,22 +569,9 @@ class SpeechToText:
         """Extract key points using GPT"""
         try:
             print("🔑 Extracting key points...")
-            response = self.client.chat.completions.create(
-                model=self.GPT_MODEL,
-                temperature=0,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a proficient AI with a specialty in distilling information into key points. Based on the following text, identify and list the main points that were discussed or brought up. These should be the most important ideas, findings, or topics that are crucial to the essence of the discussion. Your goal is to provide a list that someone could read to quickly understand what was talked about."
-                    },
-                    {
-                        "role": "user",
-                        "content": transcription
-                    }
-                ]
-            )
+            content = self._analyze(KEY_POINTS_PROMPT, transcription)
             print("✅ Key points extracted")
-            return response.choices[0].message.content
+            return content
         except Exception as e:
             print(f"❌ Key points error: {e}")
             return "Key points unavailable due to processing error."
@@ -169,22 +580,9 @@ class SpeechToText:
         """Extract action items using GPT"""
         try:
             print("✅ Extracting action items...")
-            response = self.client.chat.completions.create(
-                model=self.GPT_MODEL,
-                temperature=0,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an AI expert in analyzing conversations and extracting action items. Please review the text and identify any tasks, assignments, or actions that were agreed upon or mentioned as needing to be done. These could be tasks assigned to specific individuals, or general actions that the group has decided to take. Please list these action items clearly and concisely."
-                    },
-                    {
-                        "role": "user",
-                        "content": transcription
-                    }
-                ]
-            )
+            content = self._analyze(ACTION_ITEMS_PROMPT, transcription)
             print("✅ Action items extracted")
-            return response.choices[0].message.content
+            return content
         except Exception as e:
             print(f"❌ Action items error: {e}")
             return "Action items unavailable due to processing error."
@@ -193,47 +591,101 @@ class SpeechToText:
         """Analyze sentiment using GPT"""
         try:
             print("😊 Analyzing sentiment...")
-            response = self.client.chat.completions.create(
-                model=self.GPT_MODEL,
-                temperature=0,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "As an AI with expertise in language and emotion analysis, your task is to analyze the sentiment of the following text. Please consider the overall tone of the discussion, the emotion conveyed by the language used, and the context in which words and phrases are used. Indicate whether the sentiment is generally positive, negative, or neutral, and provide brief explanations for your analysis where possible."
-                    },
-                    {
-                        "role": "user",
-                        "content": transcription
-                    }
-                ]
-            )
+            content = self._analyze(SENTIMENT_PROMPT, transcription)
             print("✅ Sentiment analyzed")
-            return response.choices[0].message.content
+            return content
         except Exception as e:
             print(f"❌ Sentiment error: {e}")
             return "Neutral (analysis unavailable)"
 
+    def _timed_analysis(self, analysis, transcription):
+        """Run one analysis and return (result, elapsed seconds)"""
+        started = time.perf_counter()
+        result = analysis(transcription)
+        return result, time.perf_counter() - started
+
+    def structured_meeting_minutes(self, transcription):
+        """Generate all meeting minutes fields in one schema-constrained completion"""
+        try:
+            print("🧩 Generating structured meeting minutes (single request)...")
+            content = self._analyze(MEETING_MINUTES_PROMPT, transcription, response_format={
+                "type": "json_schema",
+                "json_schema": {
+                    "name": "meeting_minutes",
+                    "strict": True,
+                    "schema": MEETING_MINUTES_SCHEMA,
+                },
+            }, parse=MeetingMinutes.from_json)
+            minutes = MeetingMinutes.from_json(content)
+            print("✅ Structured minutes generated")
+            return minutes
+        except Exception as e:
+            print(f"❌ Structured minutes error: {e}")
+            return None
+
+    def _print_analysis_cache_stats(self):
+        if self.analysis_cache is not None:
+            stats = self.analysis_cache.stats()
+            print(f"   💾 analysis cache: {stats['hits']} hits, {stats['misses']} misses")
+
+    @tracing.traced('analysis')
     def meeting_minutes(self, transcription):
         """Generate complete meeting minutes"""
         print(f"\n{'='*60}")
         print("📋 GENERATING MEETING ANALYSIS")
         print(f"{'='*60}\n")
         
-        abstract_summary = self.abstract_summary_extraction(transcription)
-        key_points = self.key_points_extraction(transcription)
-        action_items = self.action_item_extraction(transcription)
-        sentiment = self.sentiment_analysis(transcription)
+        if self.ANALYSIS_MODE == 'structured':
+            started = time.perf_counter()
+            minutes = self.structured_meeting_minutes(transcription)
+            elapsed = time.perf_counter() - started
+            if minutes is not None:
+                self.analysis_timings = {'structured': elapsed, 'total': elapsed}
+                print(f"\n{'='*60}")
+                print("✅ ANALYSIS COMPLETE")
+                print(f"   ⏱️ wall time (structured): {elapsed:.2f}s")
+                self._print_analysis_cache_stats()
+                print(f"{'='*60}\n")
+                return minutes.to_dict()
+            print("⚠️ Falling back to separate analysis requests")
+        
+        analyses = {
+            'abstract_summary': self.abstract_summary_extraction,
+            'key_points': self.key_points_extraction,
+            'action_items': self.action_item_extraction,
+            'sentiment': self.sentiment_analysis,
+        }
+        
+        started = time.perf_counter()
+        if self.PARALLEL_ANALYSIS:
+            # Each analysis catches its own errors and returns a fallback string,
+            # so the futures never raise and one failure can't sink the others.
+            with ThreadPoolExecutor(max_workers=max(1, self.ANALYSIS_WORKERS)) as pool:
+                futures = {
+                    key: pool.submit(tracing.bind(self._timed_analysis), analysis, transcription)
+                    for key, analysis in analyses.items()
+                }
+                outcomes = {key: future.result() for key, future in futures.items()}
+        else:
+            outcomes = {
+                key: self._timed_analysis(analysis, transcription)
+                for key, analysis in analyses.items()
+            }
+        wall_time = time.perf_counter() - started
+        
+        self.analysis_timings = {key: elapsed for key, (_, elapsed) in outcomes.items()}
+        self.analysis_timings['total'] = wall_time
         
         print(f"\n{'='*60}")
         print("✅ ANALYSIS COMPLETE")
+        for key, (_, elapsed) in outcomes.items():
+            print(f"   ⏱️ {key}: {elapsed:.2f}s")
+        mode = "parallel" if self.PARALLEL_ANALYSIS else "sequential"
+        print(f"   ⏱️ wall time ({mode}): {wall_time:.2f}s")
+        self._print_analysis_cache_stats()
         print(f"{'='*60}\n")
         
-        return {
-            'abstract_summary': abstract_summary,
-            'key_points': key_points,
-            'action_items': action_items,
-            'sentiment': sentiment
-        }
+        return {key: result for key, (result, _) in outcomes.items()}
 
     def store_in_json_file(self, data):
         """Save meeting data to JSON file"""
@@ -259,6 +711,44 @@ class SpeechToText:
             'sentiment': 'Neutral'
         }
 
+    @tracing.traced('transcript.compact')
+    def compact_transcript(self, transcription):
+        """Strip hallucinated lines, fillers and repeats so GPT is billed only for content"""
+        result = self.compactor.compact(transcription, self.GPT_MODEL)
+        self.last_compaction = result
+        tracing.count('tokens.transcript_original', result.original_tokens)
+        tracing.count('tokens.transcript_compacted', result.compacted_tokens)
+        removed = ', '.join(f"{count} {name.replace('_', ' ')}" for name, count in result.removed.items() if count)
+        print(f"🧹 Transcript compacted: {result.original_tokens} → {result.compacted_tokens} tokens "
+              f"(-{result.saved_share * 100:.0f}%){': ' + removed if removed else ''}")
+        return result.text
+
+    def analyze_transcription(self, transcription, save=True):
+        """Analyze an already-transcribed meeting and (unless save is False) save the result"""
+        if not transcription or len(transcription.strip()) == 0:
+            print("⚠️ No transcription - no speech detected")
+            return self._create_fallback_summary("No speech detected in recording")
+        
+        print(f"✅ Transcription successful: {len(transcription)} characters")
+        print(f"📝 First 200 chars: {transcription[:200]}...")
+        
+        if self.TRANSCRIPT_COMPACTION:
+            transcription = self.compact_transcript(transcription)
+            if not transcription:
+                print("⚠️ Transcript was only filler or hallucinated text")
+                return self._create_fallback_summary("No speech detected in recording")
+        
+        # Generate summary
+        summary = self.meeting_minutes(transcription)
+        if save:
+            self.store_in_json_file(summary)
+        
+        print(f"\n{'='*70}")
+        print("🎉 TRANSCRIPTION WORKFLOW COMPLETE")
+        print(f"{'='*70}\n")
+        
+        return summary
+
     def transcribe(self, audio_file_path):
         """Main transcription workflow"""
         try:
@@ -278,28 +768,10 @@ class SpeechToText:
             
             print(f"✅ Audio file found: {file_size / (1024*1024):.2f} MB")
             
-            # Resize if needed
-            audio_file_path = self.resize_audio_if_needed(audio_file_path)
-            
-            # Transcribe
-            transcription = self.transcribe_audio(audio_file_path)
-            
-            if not transcription or len(transcription.strip()) == 0:
-                print("⚠️ No transcription - no speech detected")
-                return self._create_fallback_summary("No speech detected in recording")
-            
-            print(f"✅ Transcription successful: {len(transcription)} characters")
-            print(f"📝 First 200 chars: {transcription[:200]}...")
-            
-            # Generate summary
-            summary = self.meeting_minutes(transcription)
-            self.store_in_json_file(summary)
-            
-            print(f"\n{'='*70}")
-            print("🎉 TRANSCRIPTION WORKFLOW COMPLETE")
-            print(f"{'='*70}\n")
+            # Transcribe (oversized recordings are chunked, never truncated)
+            transcription = self.transcribe_recording(audio_file_path)
             
-            return summary
+            return self.analyze_transcription(transcription)
             
         except Exception as e:
             print(f"\n{'='*70}")
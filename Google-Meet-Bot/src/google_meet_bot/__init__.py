@@ -1,11 +1,24 @@
 """Google Meet Bot package.
 
 Automate joining Google Meet, record audio, transcribe with Whisper, and summarize using GPT.
+
+Exports are resolved on first access, so importing the package (or running
+``google-meet-bot analyze``) does not load selenium, sounddevice or openai.
 """
 
-from .record_audio import AudioRecorder
-from .speech_to_text import SpeechToText
-from .join_google_meet import JoinGoogleMeet
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .join_google_meet import JoinGoogleMeet
+    from .record_audio import AudioRecorder
+    from .speech_to_text import SpeechToText
+
+_EXPORTS = {
+    "AudioRecorder": ".record_audio",
+    "SpeechToText": ".speech_to_text",
+    "JoinGoogleMeet": ".join_google_meet",
+}
 
 __all__ = [
     "AudioRecorder",
@@ -14,3 +27,13 @@ __all__ = [
 ]
 
 
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
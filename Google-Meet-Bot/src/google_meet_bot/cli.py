@@ -1,30 +1,110 @@
 import argparse
+import json
 import os
+import sys
 import tempfile
 
-from .join_google_meet import JoinGoogleMeet
-from .speech_to_text import SpeechToText
+from .events import open_event_stream
+
+
+def _add_event_arguments(parser):
+    parser.add_argument("--events", dest="events", choices=["none", "json"], default=os.getenv("CLI_EVENTS", "none"),
+                        help="Also write NDJSON progress events and the final result to --events-fd")
+    parser.add_argument("--events-fd", dest="events_fd", type=int, default=int(os.getenv("CLI_EVENTS_FD", 3)),
+                        help="File descriptor for --events json (1 moves the log to stderr)")
+
+
+def analyze(argv):
+    """Summarize an existing recording or transcript; never loads selenium or sounddevice"""
+    parser = argparse.ArgumentParser(prog="google-meet-bot analyze",
+                                     description="Summarize an existing recording or transcript without joining a meeting.")
+    parser.add_argument("input", help="Audio recording, or a transcript text file (.txt/.md or --transcript)")
+    parser.add_argument("--transcript", dest="transcript", action="store_true", help="Treat the input as a transcript")
+    parser.add_argument("--output", dest="output", help="Also write the result JSON to this path")
+    _add_event_arguments(parser)
+    args = parser.parse_args(argv)
+
+    events = open_event_stream(args.events, args.events_fd)
+    is_transcript = args.transcript or args.input.lower().endswith((".txt", ".md"))
+    events.emit("started", input=args.input, transcript=is_transcript)
+
+    try:
+        from .speech_to_text import SpeechToText
+
+        stt = SpeechToText()
+        if is_transcript:
+            with open(args.input, "r", encoding="utf-8") as f:
+                transcription = f.read()
+        else:
+            with events.stage("transcribing"):
+                transcription = stt.transcribe_recording(args.input)
+            if transcription is None:
+                raise RuntimeError(f"Transcription failed for {args.input}")
+        with events.stage("analysis"):
+            result = stt.meeting_minutes(transcription)
+        stt.store_in_json_file(result)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(result, f, indent=2, ensure_ascii=False)
+        events.emit("result", input=args.input, timings=events.timings, **result)
+        events.emit("complete", status="ok", timings=events.timings)
+        if not events.enabled:
+            print(json.dumps(result, indent=2, ensure_ascii=False))
+    except Exception as e:
+        events.emit("complete", status="failed", error=str(e), timings=events.timings)
+        raise
+    finally:
+        events.close()
 
 
 def main():
-    parser = argparse.ArgumentParser(description="Join a Google Meet, record audio, and summarize it.")
+    if len(sys.argv) > 1 and sys.argv[1] == "analyze":
+        return analyze(sys.argv[2:])
+
+    parser = argparse.ArgumentParser(description="Join a Google Meet, record audio, and summarize it.",
+                                     epilog="Use 'google-meet-bot analyze --help' to summarize an existing recording or transcript.")
     parser.add_argument("--meet-link", dest="meet_link", default=os.getenv("MEET_LINK"), help="Google Meet link")
     parser.add_argument("--duration", dest="duration", type=int, default=int(os.getenv("RECORDING_DURATION", 60)), help="Recording duration in seconds")
     parser.add_argument("--no-analysis", dest="no_analysis", action="store_true", help="Skip analysis phase")
+    _add_event_arguments(parser)
     args = parser.parse_args()
 
     if not args.meet_link:
         raise SystemExit("--meet-link (or MEET_LINK env) is required")
 
+    from .join_google_meet import JoinGoogleMeet
+    from .speech_to_text import SpeechToText
+
+    events = open_event_stream(args.events, args.events_fd)
     temp_dir = tempfile.mkdtemp()
     audio_path = os.path.join(temp_dir, "output.wav")
+    events.emit("started", audio_path=audio_path, duration=args.duration, meet_link=args.meet_link)
 
-    bot = JoinGoogleMeet()
-    bot.Glogin()
-    bot.turnOffMicCam(args.meet_link)
-    bot.AskToJoin(audio_path, args.duration)
-
-    if not args.no_analysis:
-        SpeechToText().transcribe(audio_path)
-
+    try:
+        with events.stage("login"):
+            bot = JoinGoogleMeet()
+            bot.Glogin()
+        with events.stage("joining"):
+            bot.turnOffMicCam(args.meet_link)
+        with events.stage("recording", duration=args.duration), events.ticker("recording", total=args.duration):
+            bot.AskToJoin(audio_path, args.duration)
 
+        if not args.no_analysis:
+            if events.enabled:
+                stt = SpeechToText()
+                with events.stage("transcribing"):
+                    transcription = stt.transcribe_recording(audio_path)
+                if transcription is None:
+                    raise RuntimeError(f"Transcription failed for {audio_path}")
+                with events.stage("analysis"):
+                    result = stt.meeting_minutes(transcription)
+                stt.store_in_json_file(result)
+                events.emit("result", audio_path=audio_path, timings=events.timings, **result)
+            else:
+                SpeechToText().transcribe(audio_path)
+        events.emit("complete", status="ok", timings=events.timings)
+    except Exception as e:
+        events.emit("complete", status="failed", error=str(e), timings=events.timings)
+        raise
+    finally:
+        events.close()
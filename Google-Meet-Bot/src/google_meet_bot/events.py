@@ -0,0 +1,101 @@
+"""Machine-readable progress events for the CLI.
+
+With ``--events json`` every stage transition, progress tick, timing and the final
+result is written as one JSON object per line to a separate file descriptor
+(3 by default), so consumers never have to scrape the human-readable log:
+
+    {"event": "stage", "stage": "recording", "status": "started", "time": ...}
+    {"event": "progress", "stage": "recording", "elapsed": 30.0, "total": 3600, ...}
+    {"event": "timing", "stage": "recording", "seconds": 3601.2, ...}
+    {"event": "result", "abstract_summary": ..., "key_points": "1. ...", ...}
+
+The flat scripts and the installed package each ship this module; keep it in
+sync with the top-level events.py (used by cli.py).
+"""
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+
+
+class EventStream:
+    """Thread-safe NDJSON writer; a stream without a target silently drops events"""
+
+    def __init__(self, stream=None):
+        self.stream = stream
+        self.timings = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.stream is not None
+
+    def emit(self, event, **fields):
+        if self.stream is None:
+            return
+        record = {'event': event, 'time': time.time()}
+        record.update(fields)
+        line = json.dumps(record, default=str, ensure_ascii=False)
+        with self._lock:
+            self.stream.write(line + '\n')
+            self.stream.flush()
+
+    @contextlib.contextmanager
+    def stage(self, name, **fields):
+        """Emit started/finished (or failed) around a block and record how long it took"""
+        self.emit('stage', stage=name, status='started', **fields)
+        started = time.perf_counter()
+        try:
+            yield
+        except BaseException as e:
+            self.timings[name] = time.perf_counter() - started
+            self.emit('stage', stage=name, status='failed', error=str(e))
+            raise
+        self.timings[name] = time.perf_counter() - started
+        self.emit('stage', stage=name, status='finished')
+        self.emit('timing', stage=name, seconds=self.timings[name])
+
+    @contextlib.contextmanager
+    def ticker(self, stage, total=None, interval=5.0):
+        """Emit a progress event every interval seconds while the block runs"""
+        if self.stream is None:
+            yield
+            return
+        done = threading.Event()
+        started = time.monotonic()
+
+        def tick():
+            while not done.wait(interval):
+                self.emit('progress', stage=stage, elapsed=round(time.monotonic() - started, 1), total=total)
+
+        thread = threading.Thread(target=tick, name=f"{stage}-progress", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            done.set()
+            thread.join()
+
+    def close(self):
+        if self.stream is not None:
+            try:
+                self.stream.close()
+            except OSError:
+                pass
+
+
+def open_event_stream(mode, fd=3):
+    """EventStream for --events/--events-fd; events on fd 1 push diagnostic prints to stderr"""
+    if mode != 'json':
+        return EventStream()
+    if fd == 1:
+        stream = os.fdopen(os.dup(1), 'w', encoding='utf-8', buffering=1)
+        sys.stdout = sys.stderr
+        return EventStream(stream)
+    try:
+        stream = os.fdopen(fd, 'w', encoding='utf-8', buffering=1)
+    except OSError as e:
+        raise SystemExit(f"--events json needs file descriptor {fd} to be open for writing ({e})")
+    return EventStream(stream)
@@ -1,4 +1,5 @@
 from openai import OpenAI
+import glob
 import json
 import os
 import subprocess
@@ -51,6 +52,31 @@ class SpeechToText:
             print("Transcribe: Done")
             return transcript.text
 
+    def split_audio(self, audio_file_path):
+        """Cut a recording into consecutive pieces that each fit the upload limit"""
+        audio_size = self.get_file_size(audio_file_path)
+        if audio_size <= self.MAX_AUDIO_SIZE_BYTES:
+            return [audio_file_path]
+        duration = self.get_audio_duration(audio_file_path)
+        # A little under the limit: every piece gets its own header
+        segment_seconds = max(1, int(duration * self.MAX_AUDIO_SIZE_BYTES / audio_size * 0.95))
+
+        temp_dir = tempfile.mkdtemp()
+        print(f"Splitting audio into {segment_seconds}s pieces in {temp_dir}")
+        subprocess.run(['ffmpeg', '-v', 'quiet', '-i', audio_file_path, '-f', 'segment',
+                        '-segment_time', str(segment_seconds), '-c', 'copy',
+                        os.path.join(temp_dir, 'chunk_%03d.wav')], check=True)
+        return sorted(glob.glob(os.path.join(temp_dir, 'chunk_*.wav')))
+
+    def transcribe_recording(self, audio_file_path):
+        """Transcribe the whole recording, piece by piece; None if any piece fails"""
+        try:
+            texts = [self.transcribe_audio(path).strip() for path in self.split_audio(audio_file_path)]
+        except Exception as e:
+            print(f"Transcribe failed: {e}")
+            return None
+        return ' '.join(text for text in texts if text)
+
     def abstract_summary_extraction(self, transcription):
         response = self.client.chat.completions.create(
             model=self.GPT_MODEL,
@@ -144,8 +170,10 @@ class SpeechToText:
         print("JSON file created successfully.")
 
     def transcribe(self, audio_file_path):
-        audio_file_path = self.resize_audio_if_needed(audio_file_path)
-        transcription = self.transcribe_audio(audio_file_path)
+        transcription = self.transcribe_recording(audio_file_path)
+        if transcription is None:
+            print("Transcription failed; no summary generated")
+            return None
         summary = self.meeting_minutes(transcription)
         self.store_in_json_file(summary)
 
@@ -0,0 +1,10 @@
+import os
+import sys
+
+# The bot's modules live next to this folder and are imported flat, as cli.py does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Never touch the user's caches or the network from tests
+os.environ['TRANSCRIPTION_CACHE'] = 'false'
+os.environ['ANALYSIS_CACHE'] = 'false'
+os.environ.setdefault('OPENAI_API_KEY', 'test')
@@ -0,0 +1,53 @@
+import os
+
+import numpy as np
+from scipy.io import wavfile
+
+from audio_chunker import WAV_HEADER_ALLOWANCE, AudioChunker, stitch_transcripts
+
+RATE = 16000
+
+
+def test_stitch_drops_words_repeated_across_the_overlap():
+    texts = ["we agreed to ship the release on Friday.", "on friday, and Bob owns the rollout"]
+    assert stitch_transcripts(texts) == "we agreed to ship the release on Friday. and Bob owns the rollout"
+
+
+def test_stitch_keeps_single_word_coincidences_and_skips_empty_chunks():
+    assert stitch_transcripts(["that is fine", "", None, "fine by me"]) == "that is fine fine by me"
+
+
+def test_small_recording_is_not_split(tmp_path):
+    path = tmp_path / 'short.wav'
+    wavfile.write(path, RATE, np.zeros(RATE, dtype=np.int16))
+    chunks = AudioChunker(max_chunk_bytes=10 * 1024 * 1024).split(str(path))
+    assert len(chunks) == 1
+    assert chunks[0].path == str(path)
+    assert chunks[0].end_seconds == 1.0
+
+
+def test_split_cuts_at_quiet_points_within_the_size_limit(tmp_path, monkeypatch):
+    monkeypatch.setenv('CHUNK_OVERLAP_SECONDS', '0.5')
+    monkeypatch.setenv('CHUNK_SEARCH_SECONDS', '2')
+    # 4s of tone with a 0.3s pause every 4.3s; each chunk may hold 5s of audio
+    tone = (np.sin(np.arange(RATE * 4) * 0.2) * 8000).astype(np.int16)
+    pause = np.zeros(int(RATE * 0.3), dtype=np.int16)
+    data = np.concatenate([tone, pause] * 4)
+    path = tmp_path / 'long.wav'
+    wavfile.write(path, RATE, data)
+
+    max_bytes = 5 * RATE * 2 + WAV_HEADER_ALLOWANCE
+    chunks = AudioChunker(max_chunk_bytes=max_bytes).split(str(path), str(tmp_path))
+
+    assert len(chunks) > 1
+    assert chunks[0].start_seconds == 0.0
+    assert abs(chunks[-1].end_seconds - len(data) / RATE) < 1e-6
+    for previous, chunk in zip(chunks, chunks[1:]):
+        # Consecutive chunks overlap, and every cut lands in a pause
+        assert chunk.start_seconds < previous.end_seconds
+        assert (chunk.start_seconds % 4.3) >= 4.0 - 1e-6
+    for chunk in chunks:
+        assert os.path.getsize(chunk.path) <= max_bytes
+        rate, samples = wavfile.read(chunk.path)
+        assert rate == RATE
+        assert abs(len(samples) / RATE - (chunk.end_seconds - chunk.start_seconds)) < 1e-3
@@ -0,0 +1,80 @@
+import json
+
+import batch_processor
+from batch_processor import run_batch
+
+
+class FakeSpeechToText:
+    """Analyzes transcripts without GPT; an input containing 'broken' fails"""
+
+    def __init__(self):
+        self.analysis_timings = {}
+        self.last_compaction = None
+        self.analyzed = []
+
+    def analyze_transcription(self, transcription, save=True):
+        if 'broken' in transcription:
+            raise RuntimeError("GPT is down")
+        self.analyzed.append(transcription)
+        return {'abstract_summary': transcription.upper()}
+
+
+def transcripts(tmp_path, **texts):
+    source = tmp_path / 'transcripts'
+    source.mkdir()
+    for name, text in texts.items():
+        (source / f'{name}.txt').write_text(text, encoding='utf-8')
+    return str(source), sorted(str(source / f'{name}.txt') for name in texts)
+
+
+def fake_pipeline(monkeypatch, fingerprint='settings-a'):
+    stt = FakeSpeechToText()
+    monkeypatch.setattr(batch_processor, '_worker_stt', lambda: stt)
+    monkeypatch.setattr(batch_processor, 'settings_fingerprint', lambda _: fingerprint)
+    return stt
+
+
+def read_result(output_dir, name):
+    return json.loads((output_dir / f'{name}.txt.json').read_text(encoding='utf-8'))
+
+
+def test_rerun_skips_inputs_already_done(tmp_path, monkeypatch):
+    base, paths = transcripts(tmp_path, first="hello team", second="ship it")
+    output_dir = tmp_path / 'results'
+    stt = fake_pipeline(monkeypatch)
+    run_batch(paths[:1], base, str(output_dir), workers=2)
+    assert stt.analyzed == ["hello team"]
+
+    stats = run_batch(paths, base, str(output_dir), workers=2)
+    assert stats['skipped'] == 1
+    assert stats['processed'] == 1
+    assert stt.analyzed == ["hello team", "ship it"]
+    assert read_result(output_dir, 'second')['summary'] == {'abstract_summary': "SHIP IT"}
+
+
+def test_changed_settings_reprocess_everything(tmp_path, monkeypatch):
+    base, paths = transcripts(tmp_path, first="hello team")
+    output_dir = tmp_path / 'results'
+    fake_pipeline(monkeypatch, 'settings-a')
+    run_batch(paths, base, str(output_dir), workers=1)
+    stt = fake_pipeline(monkeypatch, 'settings-b')
+    stats = run_batch(paths, base, str(output_dir), workers=1)
+    assert stats['skipped'] == 0
+    assert stt.analyzed == ["hello team"]
+
+
+def test_failed_item_is_recorded_and_retried_next_run(tmp_path, monkeypatch):
+    base, paths = transcripts(tmp_path, good="all fine", bad="broken transcript")
+    output_dir = tmp_path / 'results'
+    stt = fake_pipeline(monkeypatch)
+    stats = run_batch(paths, base, str(output_dir), workers=2)
+    assert (stats['ok'], stats['failed']) == (1, 1)
+    failed = read_result(output_dir, 'bad')
+    assert failed['status'] == 'failed'
+    assert failed['error'] == "RuntimeError: GPT is down"
+    assert read_result(output_dir, 'good')['status'] == 'ok'
+
+    # Only the failed input runs again
+    stats = run_batch(paths, base, str(output_dir), workers=2)
+    assert (stats['skipped'], stats['failed']) == (1, 1)
+    assert stt.analyzed == ["all fine"]
@@ -0,0 +1,29 @@
+from bot_worker import BotWorker, Job
+
+
+def make_worker(monkeypatch, ttl, keep):
+    monkeypatch.setenv('BOT_WORKER_JOB_TTL', str(ttl))
+    monkeypatch.setenv('BOT_WORKER_MAX_FINISHED_JOBS', str(keep))
+    worker = BotWorker(max_jobs=1, browsers=0)
+    jobs = [Job({'type': 'analyze'}) for _ in range(5)]
+    for job in jobs:
+        worker.jobs[job.id] = job
+    return worker, jobs
+
+
+def test_finished_jobs_expire_after_ttl(monkeypatch):
+    worker, jobs = make_worker(monkeypatch, ttl=60, keep=100)
+    for job in jobs[:2]:
+        job.finish('completed', result={})
+    jobs[0].finished_at -= 120
+    assert worker.get(jobs[0].id) is None
+    assert worker.get(jobs[1].id) is jobs[1]
+
+
+def test_only_the_newest_finished_jobs_are_kept(monkeypatch):
+    worker, jobs = make_worker(monkeypatch, ttl=3600, keep=2)
+    for job in jobs[:4]:
+        job.finish('failed', error='boom')
+    worker.get(jobs[0].id)
+    # Running and queued jobs are never evicted
+    assert list(worker.jobs) == [job.id for job in jobs[2:]]
@@ -0,0 +1,108 @@
+import os
+import shutil
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from disk_cache import DiskCache, make_key
+from speech_to_text import SpeechToText
+
+
+def test_values_round_trip_and_count_hits(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=1024 * 1024)
+    key = make_key('chat', 'abc')
+    assert cache.get(key) is None
+    assert cache.set(key, {'text': 'hello'})
+    assert cache.get(key) == {'text': 'hello'}
+    assert cache.stats() == {'hits': 1, 'misses': 1}
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=1024 * 1024, ttl_seconds=60)
+    cache.set('old', 1)
+    path = os.path.join(str(tmp_path), 'old.json')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{"created_at": %f, "value": 1}' % (time.time() - 120))
+    assert cache.get('old') is None
+    assert not os.path.exists(path)
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=250)
+    for index, key in enumerate(['a', 'b', 'c']):
+        cache.set(key, 'x' * 50)
+        os.utime(os.path.join(str(tmp_path), f'{key}.json'), (index, index))
+    cache.set('d', 'x' * 50)
+    assert cache.get('a') is None
+    assert cache.get('d') == 'x' * 50
+
+
+def test_directory_that_cannot_be_created_disables_the_cache(tmp_path):
+    blocker = tmp_path / 'file'
+    blocker.write_text('not a directory')
+    cache = DiskCache(str(blocker / 'cache'), max_bytes=1024)
+    assert cache.set('key', 'value') is False
+    assert cache.get('key') is None
+
+
+@pytest.mark.skipif(hasattr(os, 'geteuid') and os.geteuid() == 0, reason="root ignores directory permissions")
+def test_read_only_directory_is_a_miss_not_an_error(tmp_path):
+    directory = tmp_path / 'cache'
+    directory.mkdir()
+    directory.chmod(0o500)
+    try:
+        cache = DiskCache(str(directory), max_bytes=1024)
+        assert cache.set('key', 'value') is False
+        assert cache.get('key') is None
+    finally:
+        directory.chmod(0o700)
+
+
+@pytest.fixture
+def unwritable_caches(tmp_path, monkeypatch):
+    """SpeechToText with both caches enabled on a directory that stops being writable"""
+    monkeypatch.setenv('TRANSCRIPTION_CACHE', 'true')
+    monkeypatch.setenv('ANALYSIS_CACHE', 'true')
+    monkeypatch.setenv('TRANSCRIPTION_CACHE_DIR', str(tmp_path / 'transcriptions'))
+    monkeypatch.setenv('ANALYSIS_CACHE_DIR', str(tmp_path / 'analyses'))
+    reply = SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content='summary'))], usage=None)
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=lambda **kwargs: reply)))
+    stt = SpeechToText(client=client)
+    stt.transcription_backend = SimpleNamespace(name='openai', transcribe=lambda path, language: 'paid for')
+    for name in ('transcriptions', 'analyses'):
+        shutil.rmtree(str(tmp_path / name))
+        (tmp_path / name).write_text('now a file')
+    return stt
+
+
+def test_failed_cache_write_keeps_the_transcript(tmp_path, unwritable_caches):
+    audio = tmp_path / 'meeting.flac'
+    audio.write_bytes(b'audio')
+    assert unwritable_caches.transcribe_audio(str(audio)) == 'paid for'
+
+
+def test_failed_cache_write_keeps_the_completion(unwritable_caches):
+    assert unwritable_caches._complete('Summarize.', 'We ship Friday.') == 'summary'
+
+
+def test_invalid_structured_response_is_not_cached(tmp_path, monkeypatch):
+    monkeypatch.setenv('ANALYSIS_CACHE', 'true')
+    monkeypatch.setenv('ANALYSIS_CACHE_DIR', str(tmp_path))
+    monkeypatch.setenv('ANALYSIS_MODE', 'structured')
+    replies = ['{"abstract_summary": "We ship Fri', '{"abstract_summary": "We ship Friday.", "key_points": []}']
+    calls = []
+
+    def create(**kwargs):
+        calls.append(kwargs)
+        content = replies[min(len(calls), len(replies)) - 1]
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))], usage=None)
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    # The truncated first reply fails to parse and is not memoized...
+    assert SpeechToText(client=client).structured_meeting_minutes("We ship Friday.") is None
+    # ...so a rerun asks again and caches the valid reply
+    minutes = SpeechToText(client=client).structured_meeting_minutes("We ship Friday.")
+    assert minutes.abstract_summary == "We ship Friday."
+    assert SpeechToText(client=client).structured_meeting_minutes("We ship Friday.") == minutes
+    assert len(calls) == 2
@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+from scipy.io import wavfile
+
+from speech_to_text import SpeechToText
+
+
+@pytest.mark.parametrize('rate', [48000, 44100])
+def test_blockwise_resample_matches_whole_signal(tmp_path, rate):
+    rng = np.random.default_rng(0)
+    t = np.arange(int(rate * 1.7)) / rate
+    left = np.sin(2 * np.pi * 440 * t) * 9000 + rng.normal(0, 2000, len(t))
+    right = np.sin(2 * np.pi * 3100 * t) * 6000 + rng.normal(0, 2000, len(t))
+    source = tmp_path / 'meeting.wav'
+    wavfile.write(source, rate, np.stack([left, right], axis=1).astype(np.int16))
+
+    stt = SpeechToText()
+    (tmp_path / 'whole').mkdir()
+    (tmp_path / 'blocks').mkdir()
+    _, whole = wavfile.read(stt.downmix_resample(str(source), str(tmp_path / 'whole'), block_seconds=60))
+    _, blocks = wavfile.read(stt.downmix_resample(str(source), str(tmp_path / 'blocks'), block_seconds=0.05))
+
+    assert len(blocks) == len(whole) == -(-len(t) * stt.TARGET_SAMPLE_RATE // rate)
+    # Only float rounding may differ between the two, never filter edge effects
+    assert np.abs(blocks.astype(np.int32) - whole.astype(np.int32)).max() <= 1
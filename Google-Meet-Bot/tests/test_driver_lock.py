@@ -0,0 +1,44 @@
+import threading
+import time
+
+from browser_audio import BrowserAudioTap
+from meeting_monitor import probe_meeting_state
+
+
+class OneCommandAtATimeDriver:
+    """Fails like a WebDriver session would if two commands overlap"""
+
+    def __init__(self):
+        self.busy = threading.Lock()
+        self.calls = 0
+
+    def execute_script(self, script, *args):
+        assert self.busy.acquire(blocking=False), "overlapping WebDriver commands"
+        try:
+            time.sleep(0.001)
+            self.calls += 1
+            return None if 'drain' in script else {'in_call': True}
+        finally:
+            self.busy.release()
+
+
+def test_audio_drain_and_meeting_probe_never_overlap():
+    driver = OneCommandAtATimeDriver()
+    tap = BrowserAudioTap(driver)
+    errors = []
+
+    def repeat(call):
+        try:
+            for _ in range(50):
+                call()
+        except AssertionError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=repeat, args=(tap.drain,)),
+               threading.Thread(target=repeat, args=(lambda: probe_meeting_state(driver),))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert driver.calls == 100
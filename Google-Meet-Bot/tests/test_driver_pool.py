@@ -0,0 +1,72 @@
+import os
+import threading
+import time
+from types import SimpleNamespace
+
+import driver_pool
+from driver_pool import DriverPool
+
+
+class FlakyBot:
+    """Stand-in for JoinGoogleMeet whose login fails a set number of times.
+
+    Like the real Glogin, a failed login is reported by returning False, not raised.
+    """
+    failures = 0
+    quits = 0
+
+    def __init__(self, profile_dir=None):
+        self.profile_dir = profile_dir
+        self.driver = SimpleNamespace(get=lambda url: None, quit=self._quit)
+
+    def _quit(self):
+        FlakyBot.quits += 1
+
+    def Glogin(self):
+        if FlakyBot.failures:
+            FlakyBot.failures -= 1
+            return False
+        return True
+
+
+def test_slot_that_fails_to_start_is_retried(monkeypatch, tmp_path):
+    monkeypatch.setattr(driver_pool, 'JoinGoogleMeet', FlakyBot)
+    monkeypatch.setenv('DRIVER_POOL_RETRY_SECONDS', '0.01')
+    FlakyBot.failures, FlakyBot.quits = 2, 0
+    pool = DriverPool(1, profile_root=str(tmp_path))
+    pool.start(background=False)
+    bot = pool.checkout(timeout=1)
+    assert bot.pool_slot == 0
+    # Each failed attempt closed its half-started browser
+    assert FlakyBot.quits == 2
+    pool.close()
+
+
+def test_closing_the_pool_stops_retrying(monkeypatch, tmp_path):
+    monkeypatch.setattr(driver_pool, 'JoinGoogleMeet', FlakyBot)
+    monkeypatch.setenv('DRIVER_POOL_RETRY_SECONDS', '60')
+    FlakyBot.failures = 1
+    pool = DriverPool(1, profile_root=str(tmp_path))
+    launcher = threading.Thread(target=pool._launch_safely, args=(0,))
+    launcher.start()
+    while FlakyBot.failures:
+        time.sleep(0.01)
+    pool.close()
+    launcher.join(timeout=5)
+    assert not launcher.is_alive()
+    assert pool._idle.empty()
+
+
+def test_fallback_browsers_get_their_own_profiles(monkeypatch, tmp_path):
+    monkeypatch.setattr(driver_pool, 'JoinGoogleMeet', FlakyBot)
+    FlakyBot.failures = 0
+    pool = DriverPool(1, profile_root=str(tmp_path))
+    first = pool.checkout(timeout=0)
+    second = pool.checkout(timeout=0)
+    assert first.pool_slot is None and second.pool_slot is None
+    assert first.profile_dir != second.profile_dir
+    assert os.path.dirname(first.profile_dir) == str(tmp_path)
+    pool.release(first)
+    assert not os.path.exists(first.profile_dir)
+    assert os.path.isdir(second.profile_dir)
+    pool.release(second)
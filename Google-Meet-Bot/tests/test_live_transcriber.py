@@ -0,0 +1,38 @@
+from live_transcriber import LiveTranscriber
+
+
+class FakeSpeechToText:
+    def __init__(self, texts):
+        self.texts = texts
+        self.calls = []
+
+    def transcribe_recording(self, path):
+        self.calls.append(path)
+        text = self.texts[path]
+        if isinstance(text, list):
+            text = text.pop(0)
+        return text
+
+
+def run(texts):
+    stt = FakeSpeechToText(texts)
+    live = LiveTranscriber(stt)
+    for index, path in enumerate(sorted(texts)):
+        live.submit(index, path)
+    return live.finish(), stt
+
+
+def test_segments_are_joined_without_dropping_repeated_words():
+    transcript, _ = run({'a.wav': 'We agreed on the plan. ', 'b.wav': 'We agreed on the plan. Then lunch.'})
+    assert transcript == 'We agreed on the plan. We agreed on the plan. Then lunch.'
+
+
+def test_failed_segment_is_retried_once():
+    transcript, stt = run({'a.wav': 'First part.', 'b.wav': [None, 'Second part.']})
+    assert transcript == 'First part. Second part.'
+    assert stt.calls.count('b.wav') == 2
+
+
+def test_segment_failing_twice_means_no_live_transcript():
+    transcript, _ = run({'a.wav': 'First part.', 'b.wav': [None, None], 'c.wav': 'Third part.'})
+    assert transcript is None
@@ -0,0 +1,67 @@
+import re
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from speech_to_text import SpeechToText
+
+MARKER = re.compile(r'\bW\d+\b')
+
+
+class NonShrinkingClient:
+    """Chat stand-in whose answers are never shorter than the input.
+
+    Each answer lists the window markers it was shown, then pads to the input length,
+    and is cut at max_tokens (about 4 characters per token) like the real API.
+    """
+
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, model, messages, max_tokens=None, **kwargs):
+        user = messages[-1]['content']
+        markers = sorted(set(MARKER.findall(user)), key=lambda marker: int(marker[1:]))
+        content = ' '.join(markers) + ' ' + 'x' * len(user)
+        if max_tokens is not None:
+            content = content[:max_tokens * 4]
+        with self._lock:
+            self.calls.append({'system': messages[0]['content'], 'user': user,
+                               'max_tokens': max_tokens, 'content': content})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))], usage=None)
+
+
+@pytest.fixture
+def stt(monkeypatch):
+    monkeypatch.setenv('ANALYSIS_WINDOW_TOKENS', '200')
+    monkeypatch.setenv('TRANSCRIPTION_BACKEND', 'openai')
+    return SpeechToText(client=NonShrinkingClient())
+
+
+def long_transcript(windows):
+    return ' '.join(f"W{index} " + "lorem ipsum dolor sit amet " * 27 + "end." for index in range(windows))
+
+
+@pytest.mark.parametrize('windows', [2, 3, 7, 20])
+def test_reduce_keeps_every_partial_when_partials_do_not_shrink(stt, windows):
+    result = stt._analyze("Summarize the meeting.", long_transcript(windows))
+
+    client = stt.client
+    map_calls = [call for call in client.calls if call['max_tokens'] is None]
+    reduce_calls = [call for call in client.calls if call['max_tokens'] is not None]
+    assert len(map_calls) == windows
+    # Every map result reaches a reduce call
+    reduce_inputs = '\n'.join(call['user'] for call in reduce_calls)
+    for call in map_calls:
+        assert MARKER.findall(call['content'])[0] in reduce_inputs
+    # ... and every window is represented in the final result
+    assert MARKER.findall(result) == [f"W{index}" for index in range(windows)]
+    assert result == reduce_calls[-1]['content']
+    assert all(call['max_tokens'] == 100 for call in reduce_calls)
+
+
+def test_short_transcript_is_a_single_call(stt):
+    assert MARKER.findall(stt._analyze("Summarize the meeting.", "W0 short meeting.")) == ['W0']
+    assert len(stt.client.calls) == 1
@@ -0,0 +1,47 @@
+from meeting_monitor import MEETING_STATE_JS, MeetingMonitor
+
+
+def monitor(alone_grace_seconds=60):
+    return MeetingMonitor(driver=None, on_end=lambda reason: None,
+                          poll_seconds=1, alone_grace_seconds=alone_grace_seconds)
+
+
+def test_waiting_in_the_lobby_is_not_an_end():
+    m = monitor()
+    for _ in range(5):
+        assert m.check({'in_call': False, 'participants': 0}) is None
+
+
+def test_leaving_after_joining_ends_the_meeting():
+    m = monitor()
+    assert m.check({'in_call': False}) is None
+    assert m.check({'in_call': True, 'participants': 1}) is None
+    assert m.check({'in_call': False}) == "no longer in the call"
+
+
+def test_end_message_ends_the_meeting_even_from_the_lobby():
+    m = monitor()
+    assert m.check({'ended': 'you have been removed from the meeting'}) == \
+        "meeting ended (you have been removed from the meeting)"
+
+
+def test_alone_only_counts_after_others_were_present():
+    m = monitor(alone_grace_seconds=0)
+    assert m.check({'in_call': True, 'participants': 1}) is None
+    assert m.check({'in_call': True, 'participants': 3}) is None
+    assert m.check({'in_call': True, 'participants': 1}) == "no other participants left"
+
+
+def test_alone_grace_restarts_when_someone_rejoins():
+    m = monitor(alone_grace_seconds=3600)
+    m.check({'in_call': True, 'participants': 2})
+    assert m.check({'in_call': True, 'participants': 1}) is None
+    assert m.alone_since is not None
+    assert m.check({'in_call': True, 'participants': 2}) is None
+    assert m.alone_since is None
+
+
+def test_end_phrases_are_only_read_from_dialogs_and_alerts():
+    assert 'role="dialog"' in MEETING_STATE_JS
+    assert 'role="alert"' in MEETING_STATE_JS
+    assert 'root.innerText' not in MEETING_STATE_JS
@@ -0,0 +1,31 @@
+import numpy as np
+
+from record_audio import SilenceDetector
+
+RATE = 1000
+QUIET = np.zeros(RATE, dtype=np.int16)
+LOUD = (np.sin(np.arange(RATE) / 3.0) * 8000).astype(np.int16)
+
+
+def feed(detector, blocks):
+    return [detector.update(block) for block in blocks]
+
+
+def test_disabled_by_default():
+    assert not any(feed(SilenceDetector(RATE), [LOUD] + [QUIET] * 10))
+
+
+def test_silence_before_anyone_speaks_never_stops():
+    detector = SilenceDetector(RATE, grace_seconds=3)
+    assert not any(feed(detector, [QUIET] * 10))
+    assert detector.silent_seconds == 0
+
+
+def test_stops_after_grace_once_sound_was_heard():
+    detector = SilenceDetector(RATE, grace_seconds=3)
+    assert feed(detector, [QUIET] * 5 + [LOUD, QUIET, QUIET, QUIET]) == [False] * 8 + [True]
+
+
+def test_sound_resets_the_countdown():
+    detector = SilenceDetector(RATE, grace_seconds=3)
+    assert not any(feed(detector, [LOUD, QUIET, QUIET, LOUD, QUIET, QUIET]))
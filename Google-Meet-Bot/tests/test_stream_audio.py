@@ -0,0 +1,52 @@
+import threading
+
+import numpy as np
+import pytest
+
+import record_audio
+from record_audio import AudioRecorder
+
+
+class FakeTap:
+    """Browser tap that always has a block of audio ready"""
+    sample_rate = 1000
+    poll_seconds = 0.001
+    dropped_frames = 0
+    tracks = 1
+
+    def drain(self):
+        return np.full((100, 1), 1000, dtype=np.int16)
+
+
+def test_recording_streams_to_segments_and_joins_them(tmp_path, monkeypatch):
+    monkeypatch.setenv('SEGMENT_MINUTES', str(0.5 / 60))
+    recorder = AudioRecorder(browser_tap=FakeTap())
+    threading.Timer(0.2, recorder.stop).start()
+    peak = recorder.stream_audio(str(tmp_path / 'meeting.wav'), duration=30)
+    assert peak == 1000
+    assert len(recorder.segment_paths) >= 2
+    assert (tmp_path / 'meeting.wav').exists()
+
+
+def test_writer_failure_ends_the_recording_and_is_reported(tmp_path, monkeypatch):
+    def broken_write(self, block):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(record_audio.SegmentedWavWriter, 'write', broken_write)
+    monkeypatch.setenv('RECORDER_QUEUE_BLOCKS', '2')
+    recorder = AudioRecorder(browser_tap=FakeTap())
+    result = {}
+
+    def record():
+        try:
+            recorder.stream_audio(str(tmp_path / 'meeting.wav'), duration=30)
+        except Exception as e:
+            result['error'] = e
+
+    thread = threading.Thread(target=record, daemon=True)
+    thread.start()
+    thread.join(timeout=5)
+    assert not thread.is_alive(), "stream_audio hung after the writer died"
+    assert isinstance(result['error'], RuntimeError)
+    assert isinstance(result['error'].__cause__, OSError)
+    assert recorder.stop_reason.startswith("writing audio failed")
@@ -0,0 +1,55 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import tracing
+
+
+def test_concurrent_runs_keep_their_own_spans_and_counters(monkeypatch):
+    monkeypatch.delenv('TRACE_DIR', raising=False)
+    monkeypatch.delenv('PROMETHEUS_TEXTFILE', raising=False)
+    baseline = len(tracing.tracer.spans)
+    tracers = {}
+    barrier = threading.Barrier(3)
+
+    def job(name):
+        with tracing.run(name) as run_tracer:
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                list(pool.map(tracing.bind(lambda _: tracing.count('items')), range(3)))
+            barrier.wait()
+            with tracing.span('work'):
+                tracing.count('items')
+            tracers[name] = run_tracer
+
+    threads = [threading.Thread(target=job, args=(f'job{index}',)) for index in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for name, run_tracer in tracers.items():
+        assert run_tracer.run_name == name
+        assert run_tracer.counters['items'] == 4
+        assert [record['name'] for record in run_tracer.spans] == ['work']
+    assert len(tracing.tracer.spans) == baseline
+    assert tracing.current() is tracing.tracer
+
+
+def test_each_run_writes_its_own_textfile_and_old_ones_are_pruned(tmp_path, monkeypatch):
+    monkeypatch.delenv('TRACE_DIR', raising=False)
+    monkeypatch.setenv('PROMETHEUS_TEXTFILE', str(tmp_path / 'meetmind.prom'))
+    monkeypatch.setenv('PROMETHEUS_TEXTFILE_KEEP', '2')
+    run_ids = []
+    for index in range(3):
+        with tracing.run('meeting') as run_tracer:
+            tracing.count('items', index)
+        run_ids.append(run_tracer.run_id)
+        # Pruning goes by modification time
+        path = tmp_path / f'meetmind-{run_tracer.run_id}.prom'
+        os.utime(path, (index, index))
+
+    files = sorted(os.listdir(tmp_path))
+    assert files == sorted(f'meetmind-{run_id}.prom' for run_id in run_ids[1:])
+    text = (tmp_path / f'meetmind-{run_ids[2]}.prom').read_text()
+    assert 'run="meeting"' in text
+    assert 'run_id=' not in text
@@ -0,0 +1,60 @@
+import pytest
+
+from transcript_compaction import TranscriptCompactor
+
+CASES = [
+    # (transcript, compacted)
+    ("So, um, we need, uh, a new plan.", "So we need a new plan."),
+    ("Um, the budget is approved.", "The budget is approved."),
+    ("Hmm. Let's move on.", "Let's move on."),
+    # All-caps tokens are acronyms, not fillers
+    ("ER visit was fine.", "ER visit was fine."),
+    ("The UM campus and the HMM paper.", "The UM campus and the HMM paper."),
+    ("AH is out today.", "AH is out today."),
+    # "er" and "mm" are words and units unless set off on their own
+    ("The bolt is 5 mm wide.", "The bolt is 5 mm wide."),
+    ("To err is human.", "To err is human."),
+    ("We need, er, a new plan.", "We need a new plan."),
+    ("Er, we ship Friday.", "We ship Friday."),
+    ("Mm-hmm. We ship Friday.", "We ship Friday."),
+    # Stutters collapse, grammatical doubles and numbers stay
+    ("I I I think we should ship.", "I think we should ship."),
+    ("I know that that is true.", "I know that that is true."),
+    ("He has 20 20 vision.", "He has 20 20 vision."),
+    ("Call extension 1 1 2.", "Call extension 1 1 2."),
+    ("No no no, that's wrong.", "No no no, that's wrong."),
+    ("and then we and then we and then we left.", "And then we left."),
+    ("We agreed. We agreed. Ship it Friday.", "We agreed. Ship it Friday."),
+    # Credit and subscribe lines never come from a meeting
+    ("Ship it Friday. Subtitles by the Amara.org community", "Ship it Friday."),
+    ("Ship it Friday. Thanks for watching!", "Ship it Friday."),
+    # Stock phrases: one is speech, a run next to real content is a hallucination
+    ("Thank you. Ship it Friday.", "Thank you. Ship it Friday."),
+    ("Ship it Friday. Thank you. Thank you. Thank you.", "Ship it Friday."),
+    ("Ship it Friday. Thank you. Bye.", "Ship it Friday."),
+    # Discourse markers are speech, even back to back
+    ("Okay. So. Let's start with the budget.", "Okay. So. Let's start with the budget."),
+    # ...but a short run that is the whole transcript is the meeting
+    ("Thank you. Bye.", "Thank you. Bye."),
+    ("Okay.", "Okay."),
+    ("Bye. Bye.", "Bye."),
+    ("Thank you. Thank you. Thank you. Thank you.", ""),
+    ("", ""),
+]
+
+
+@pytest.mark.parametrize("transcript, expected", CASES)
+def test_compact(transcript, expected):
+    assert TranscriptCompactor().compact(transcript).text == expected
+
+
+def test_fillers_can_be_kept(monkeypatch):
+    monkeypatch.setenv('COMPACTION_REMOVE_FILLERS', 'false')
+    assert TranscriptCompactor().compact("So, um, we ship.").text == "So, um, we ship."
+
+
+def test_counts_what_was_removed():
+    result = TranscriptCompactor().compact("Um, I I think so. We ship. We ship. Thank you. Thank you. Thank you.")
+    assert result.text == "I think so. We ship."
+    assert result.removed == {'hallucinations': 3, 'fillers': 1, 'stutters': 1, 'loops': 0, 'repeated_sentences': 1}
+    assert result.compacted_tokens < result.original_tokens
@@ -0,0 +1,38 @@
+import pytest
+
+import transcription_backends
+from transcription_backends import FasterWhisperBackend, TranscriptionBackend
+
+
+class FakeWhisperModel:
+    loads = 0
+
+    def __init__(self, name, **kwargs):
+        FakeWhisperModel.loads += 1
+
+
+@pytest.fixture
+def fake_faster_whisper(monkeypatch):
+    monkeypatch.setattr(transcription_backends, '_import_faster_whisper', lambda: (FakeWhisperModel, None))
+    monkeypatch.setattr(FasterWhisperBackend, '_models', {})
+    FakeWhisperModel.loads = 0
+
+
+def test_base_backend_is_abstract():
+    with pytest.raises(TypeError):
+        TranscriptionBackend()
+
+
+def test_instances_share_one_model_and_one_decode_lock(fake_faster_whisper):
+    first_model, first_lock = FasterWhisperBackend().model()
+    second_model, second_lock = FasterWhisperBackend().model()
+    assert first_model is second_model
+    assert first_lock is second_lock
+    assert FakeWhisperModel.loads == 1
+
+
+def test_batch_size_is_part_of_the_cache_identity(fake_faster_whisper, monkeypatch):
+    monkeypatch.setenv('LOCAL_WHISPER_BATCH_SIZE', '8')
+    batched = FasterWhisperBackend().identity()
+    monkeypatch.setenv('LOCAL_WHISPER_BATCH_SIZE', '1')
+    assert FasterWhisperBackend().identity() != batched
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+from scipy.io import wavfile
+
+from audio_chunker import AudioChunk
+from speech_to_text import SpeechToText
+from voice_activity import TrimResult, VoiceActivityTrimmer
+
+RATE = 16000
+
+
+def tone(seconds):
+    return (np.sin(np.arange(int(RATE * seconds)) * 0.1) * 8000).astype(np.int16)
+
+
+def silence(seconds):
+    return np.zeros(int(RATE * seconds), dtype=np.int16)
+
+
+@pytest.fixture
+def trimmer(monkeypatch):
+    monkeypatch.setenv('VAD_MIN_SILENCE_SECONDS', '2')
+    monkeypatch.setenv('VAD_KEEP_SILENCE_SECONDS', '0.5')
+    return VoiceActivityTrimmer()
+
+
+def test_long_silence_collapses_and_offsets_map_back(tmp_path, trimmer):
+    path = str(tmp_path / 'meeting.wav')
+    wavfile.write(path, RATE, np.concatenate([tone(2), silence(10), tone(3)]))
+
+    result = trimmer.trim(path, str(tmp_path))
+
+    assert result.path != path
+    assert result.original_seconds == pytest.approx(15)
+    # 5 s of speech plus the padding kept around it
+    assert 5.0 < result.trimmed_seconds <= 6.5
+    assert wavfile.read(result.path)[1].shape[0] / RATE == pytest.approx(result.trimmed_seconds)
+    # Before the cut nothing moves; after it, offsets shift by the removed silence
+    assert result.to_original(1.0) == pytest.approx(1.0)
+    assert result.to_original(result.trimmed_seconds - 1.0) == pytest.approx(14.0, abs=0.05)
+    assert result.to_original(result.trimmed_seconds) == pytest.approx(15.0, abs=0.05)
+
+
+def test_short_pauses_are_left_alone(tmp_path, trimmer):
+    path = str(tmp_path / 'meeting.wav')
+    wavfile.write(path, RATE, np.concatenate([tone(2), silence(1), tone(2)]))
+
+    result = trimmer.trim(path, str(tmp_path))
+
+    assert result.path == path
+    assert result.removed_seconds == 0
+    assert result.to_original(3.5) == pytest.approx(3.5)
+
+
+def test_all_silence_keeps_nothing(tmp_path, trimmer):
+    path = str(tmp_path / 'meeting.wav')
+    wavfile.write(path, RATE, silence(5))
+    assert trimmer.trim(path, str(tmp_path)).trimmed_seconds == 0
+
+
+def test_chunk_positions_are_reported_on_the_original_recording():
+    stt = SpeechToText()
+    stt.last_trim = TrimResult('trimmed.wav', 20.0, 8.0, [(0.0, 0.0, 3.0), (3.0, 15.0, 5.0)])
+    chunks = stt.to_original_times([AudioChunk('a.wav', 0.0, 4.0), AudioChunk('b.wav', 4.0, 8.0)])
+    assert [(chunk.start_seconds, chunk.end_seconds) for chunk in chunks] == [(0.0, 16.0), (16.0, 20.0)]
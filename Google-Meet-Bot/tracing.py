@@ -0,0 +1,413 @@
+"""Stage-level tracing and metrics for the bot pipeline.
+
+Spans time every stage and API call, counters track bytes and tokens, a sampler
+records peak RSS, and an opt-in sampling profiler collects stacks. A run is
+exported as a JSON trace and/or a Prometheus textfile (node_exporter's textfile
+collector picks it up):
+
+    tracing.start_run('meeting')
+    with tracing.span('openai.transcription', bytes=size):
+        ...
+    tracing.count('upload.bytes', size)
+    tracing.finish_run()          # writes TRACE_DIR/<run>.json and a PROMETHEUS_TEXTFILE per run
+
+A one-shot process (cli.py) traces into the module-wide tracer. Long-lived
+services run many jobs at once, so each job gets its own tracer with
+``with tracing.run('meeting'):``; it is exported and dropped when the job ends.
+Work handed to another thread keeps counting against the job that started it
+when the callable is wrapped with ``tracing.bind()``.
+
+Spans are always collected (they are a few dicts per stage); nothing is
+written unless TRACE_DIR or PROMETHEUS_TEXTFILE is set.
+"""
+import collections
+import contextlib
+import contextvars
+import functools
+import glob
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+from dotenv import load_dotenv
+
+try:
+    import psutil
+except ImportError:  # optional: falls back to /proc or getrusage
+    psutil = None
+
+try:
+    import resource
+except ImportError:  # Windows without psutil: no RSS figures
+    resource = None
+
+load_dotenv()
+
+
+def current_rss_bytes():
+    """Resident set size of this process, or None when it cannot be read"""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+    return None
+
+
+class Tracer:
+    """Collects spans, counters and gauges for one run at a time"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._sampler_stop = None
+        self.profiler = None
+        self.reset()
+
+    def reset(self, name='run'):
+        with self._lock:
+            self.run_id = f"{name}-{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+            self.run_name = name
+            self.started_at = time.time()
+            self._origin = time.perf_counter()
+            self.spans = []
+            self.counters = collections.Counter()
+            self.gauges = {}
+            self._ids = 0
+
+    # --- spans -------------------------------------------------------------
+
+    @contextlib.contextmanager
+    def span(self, name, **attrs):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        with self._lock:
+            self._ids += 1
+            span_id = self._ids
+        record = {
+            'id': span_id,
+            'parent': stack[-1] if stack else None,
+            'name': name,
+            'thread': threading.current_thread().name,
+            'start': time.perf_counter() - self._origin,
+            'attrs': attrs,
+        }
+        stack.append(span_id)
+        try:
+            yield record['attrs']
+            record['status'] = 'ok'
+        except BaseException as e:
+            record['status'] = 'error'
+            record['error'] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            stack.pop()
+            record['duration'] = time.perf_counter() - self._origin - record['start']
+            with self._lock:
+                self.spans.append(record)
+
+    def traced(self, name):
+        """Decorator form of span()"""
+        def decorate(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    # --- counters and gauges -----------------------------------------------
+
+    def count(self, name, value=1):
+        with self._lock:
+            self.counters[name] += value
+
+    def gauge(self, name, value):
+        with self._lock:
+            self.gauges[name] = value
+
+    def gauge_max(self, name, value):
+        with self._lock:
+            if value is not None and value > self.gauges.get(name, float('-inf')):
+                self.gauges[name] = value
+
+    def sample_rss(self):
+        self.gauge_max('process.peak_rss_bytes', current_rss_bytes())
+
+    def start_rss_sampler(self, interval=None):
+        if interval is None:
+            interval = float(os.getenv('TRACE_RSS_INTERVAL', 1.0))
+        self.stop_rss_sampler()
+        stop = self._sampler_stop = threading.Event()
+
+        def sample():
+            while True:
+                self.sample_rss()
+                if stop.wait(interval):
+                    break
+
+        threading.Thread(target=sample, name="rss-sampler", daemon=True).start()
+
+    def stop_rss_sampler(self):
+        if self._sampler_stop is not None:
+            self._sampler_stop.set()
+            self._sampler_stop = None
+        self.sample_rss()
+
+    # --- export ------------------------------------------------------------
+
+    def stage_summary(self):
+        """Per span name: call count, total and max seconds"""
+        summary = {}
+        with self._lock:
+            spans = list(self.spans)
+        for record in spans:
+            entry = summary.setdefault(record['name'], {'count': 0, 'seconds': 0.0, 'max_seconds': 0.0, 'errors': 0})
+            entry['count'] += 1
+            entry['seconds'] += record['duration']
+            entry['max_seconds'] = max(entry['max_seconds'], record['duration'])
+            entry['errors'] += record['status'] == 'error'
+        return summary
+
+    def to_dict(self):
+        with self._lock:
+            spans = sorted(self.spans, key=lambda record: record['start'])
+            counters = dict(self.counters)
+            gauges = dict(self.gauges)
+        return {
+            'run_id': self.run_id,
+            'name': self.run_name,
+            'started_at': self.started_at,
+            'duration': time.perf_counter() - self._origin,
+            'stages': self.stage_summary(),
+            'counters': counters,
+            'gauges': gauges,
+            'spans': spans,
+        }
+
+    def write_json(self, path):
+        _atomic_write(path, json.dumps(self.to_dict(), indent=2, default=str))
+        return path
+
+    def prometheus_text(self, prefix='meetmind'):
+        lines = []
+        # run_id only names the file; as a label it would mint a new series every run
+        labels = f'run="{self.run_name}"'
+        stages = self.stage_summary()
+        lines.append(f'# HELP {prefix}_stage_seconds Wall time spent in each pipeline stage during the last run')
+        lines.append(f'# TYPE {prefix}_stage_seconds summary')
+        for name, entry in sorted(stages.items()):
+            stage_labels = f'{labels},stage="{name}"'
+            lines.append(f'{prefix}_stage_seconds_sum{{{stage_labels}}} {entry["seconds"]:.6f}')
+            lines.append(f'{prefix}_stage_seconds_count{{{stage_labels}}} {entry["count"]}')
+        lines.append(f'# HELP {prefix}_stage_errors Spans that ended in an exception during the last run')
+        lines.append(f'# TYPE {prefix}_stage_errors gauge')
+        for name, entry in sorted(stages.items()):
+            lines.append(f'{prefix}_stage_errors{{{labels},stage="{name}"}} {entry["errors"]}')
+        with self._lock:
+            counters = sorted(self.counters.items())
+            gauges = sorted(self.gauges.items())
+        for name, value in counters:
+            metric = f'{prefix}_{_metric_name(name)}'
+            lines.append(f'# TYPE {metric} gauge')
+            lines.append(f'{metric}{{{labels}}} {value}')
+        for name, value in gauges:
+            metric = f'{prefix}_{_metric_name(name)}'
+            lines.append(f'# TYPE {metric} gauge')
+            lines.append(f'{metric}{{{labels}}} {value}')
+        lines.append(f'{prefix}_last_run_timestamp_seconds{{{labels}}} {time.time():.0f}')
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path):
+        _atomic_write(path, self.prometheus_text())
+        return path
+
+    # --- runs --------------------------------------------------------------
+
+    def start(self, name='run'):
+        """Clear spans and counters, start RSS sampling and, if asked, the profiler"""
+        self.reset(name)
+        self.start_rss_sampler()
+        if os.getenv('TRACE_PROFILE', 'false').lower() == 'true':
+            self.profiler = SamplingProfiler().start()
+        return self.run_id
+
+    def finish(self):
+        """Stop sampling and write whichever exports are configured; returns the written paths"""
+        self.stop_rss_sampler()
+        written = []
+        trace_dir = os.getenv('TRACE_DIR')
+        if self.profiler is not None:
+            self.profiler.stop()
+            if trace_dir:
+                written.append(self.profiler.write_folded(
+                    os.path.join(os.path.expanduser(trace_dir), f'{self.run_id}.folded')))
+            self.profiler = None
+        if trace_dir:
+            written.append(self.write_json(os.path.join(os.path.expanduser(trace_dir), f'{self.run_id}.json')))
+        textfile = os.getenv('PROMETHEUS_TEXTFILE')
+        if textfile:
+            written.append(self.write_prometheus(run_textfile(os.path.expanduser(textfile), self.run_id)))
+            prune_textfiles(os.path.expanduser(textfile), int(os.getenv('PROMETHEUS_TEXTFILE_KEEP', 20)))
+        for path in written:
+            print(f"[TRACE] Wrote {path}")
+        return written
+
+
+class SamplingProfiler:
+    """Samples every thread's stack at a fixed interval and writes folded stacks.
+
+    The output (one "frame;frame;frame count" line per stack) feeds straight into
+    flamegraph.pl or speedscope. Overhead is one sys._current_frames() call per tick.
+    """
+
+    def __init__(self, interval=None):
+        if interval is None:
+            interval = float(os.getenv('TRACE_PROFILE_INTERVAL', 0.01))
+        self.interval = interval
+        self.stacks = collections.Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def write_folded(self, path):
+        _atomic_write(path, ''.join(f"{stack} {count}\n" for stack, count in self.stacks.most_common()))
+        return path
+
+
+def _metric_name(name):
+    return ''.join(char if char.isalnum() else '_' for char in name).strip('_').lower()
+
+
+def _atomic_write(path, text):
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def run_textfile(textfile, run_id):
+    """Per-run textfile next to PROMETHEUS_TEXTFILE, so concurrent runs never overwrite each other"""
+    stem, extension = os.path.splitext(textfile)
+    return f"{stem}-{run_id}{extension or '.prom'}"
+
+
+def prune_textfiles(textfile, keep):
+    """Delete all but the newest `keep` per-run textfiles"""
+    stem, extension = os.path.splitext(textfile)
+    paths = sorted(glob.glob(f"{glob.escape(stem)}-*{extension or '.prom'}"), key=os.path.getmtime, reverse=True)
+    for path in paths[max(0, keep):]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+tracer = Tracer()
+_current = contextvars.ContextVar('tracer', default=None)
+
+
+def current():
+    """The tracer of the job running in this context, else the module-wide one"""
+    return _current.get() or tracer
+
+
+@contextlib.contextmanager
+def using(run_tracer):
+    token = _current.set(run_tracer)
+    try:
+        yield run_tracer
+    finally:
+        _current.reset(token)
+
+
+def bind(function):
+    """Wrap function so it records into the caller's tracer on whichever thread runs it"""
+    run_tracer = current()
+
+    @functools.wraps(function)
+    def bound(*args, **kwargs):
+        with using(run_tracer):
+            return function(*args, **kwargs)
+    return bound
+
+
+def span(name, **attrs):
+    return current().span(name, **attrs)
+
+
+def traced(name):
+    """Decorator form of span(), resolving the tracer on every call"""
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with current().span(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def count(name, value=1):
+    current().count(name, value)
+
+
+def gauge(name, value):
+    current().gauge(name, value)
+
+
+def start_run(name='run'):
+    """Begin a fresh trace: clears spans and counters, starts RSS sampling and, if asked, the profiler"""
+    return current().start(name)
+
+
+def finish_run():
+    """Stop sampling and write whichever exports are configured; returns the written paths"""
+    return current().finish()
+
+
+@contextlib.contextmanager
+def run(name='run'):
+    """Trace one job or session on its own tracer, exported and released when the block exits"""
+    run_tracer = Tracer()
+    with using(run_tracer):
+        run_tracer.start(name)
+        try:
+            yield run_tracer
+        finally:
+            run_tracer.finish()
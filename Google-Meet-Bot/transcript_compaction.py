@@ -0,0 +1,191 @@
+"""Deterministic clean-up of Whisper transcripts before they are sent to GPT.
+
+Whisper invents text over silence ("Thank you." over and over, "Thanks for
+watching!", subtitle credits) and transcribes every "um" and stutter. None of
+it changes the meeting minutes, but all of it is billed as prompt tokens. The
+compactor removes it in three passes:
+
+1. disfluencies: filler words (um, uh, erm, ...), stuttered words ("I I I think")
+   and looping phrases ("and then we and then we and then we") collapse; fillers
+   that are also real words or units ("er", "mm") only go when they stand alone
+   between commas or sentence breaks
+2. hallucinations: credit/subscribe lines are always dropped; short stock
+   phrases ("Thank you.", "you", "Bye.") are dropped when they repeat back to
+   back, unless they are all the transcript says (a run of two or fewer)
+3. repeats: identical consecutive sentences collapse to a single copy
+
+The same transcript always compacts to the same text, so analysis caching is
+unaffected.
+"""
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Dict
+
+from dotenv import load_dotenv
+
+from transcript_windows import count_tokens, split_sentences
+
+load_dotenv()
+
+# Lines Whisper emits over silence or music that never come from a meeting
+ALWAYS_HALLUCINATED = re.compile(
+    r"^(?:"
+    r".*\bamara\.org\b.*"
+    r"|.*\bsubtitles? by\b.*"
+    r"|(?:please )?(?:like and )?subscribe(?: to (?:my|the|our) channel)?"
+    r"|thanks? (?:you )?for watching"
+    r"|\[(?:music|applause|silence|blank_audio|inaudible)\]"
+    r"|[♪♫\s]+"
+    r")[.!?]*$",
+    re.IGNORECASE,
+)
+# Stock phrases that are real speech once, but hallucination when they repeat back to back
+REPEATED_HALLUCINATION = re.compile(
+    r"^(?:thank you(?: very much| so much)?|thanks|you|bye(?:[- ]bye)?)[.!?,]*$",
+    re.IGNORECASE,
+)
+# Lower-case, or capitalised at a sentence start; all-caps tokens are acronyms ("ER", "UM", "HMM")
+FILLER = re.compile(r"(?:,\s*)?(?<![\w'-])(?:[uU]u*m+|[uU]u*h+|[eE]e*r+m+|[aA]a*h+|[hH]h*m+)(?![\w'-]),?")
+# "er" and "mm" are also words and units ("to err", "5 mm"); only drop them set off by punctuation
+DELIMITED_FILLER = re.compile(r"(?:^|,|(?<=[.!?]))\s*(?:[eE]r+|[mM]+h*m+(?:-hmm)?)(?:,|(?=[.!?])|$)")
+# Punctuation left dangling once a filler is gone: "we need, um." -> "we need ." -> "we need."
+DANGLING_PUNCTUATION = re.compile(r"\s+([,.!?])")
+# Doubled words that are usually grammatical ("I know that that is ...")
+LEGITIMATE_DOUBLES = {'that', 'had', 'is', 'was', 'do', 'so'}
+# Words repeated for emphasis ("no no no"), kept however often they repeat
+EMPHATIC_REPEATS = {'no', 'yes', 'yeah', 'very', 'really', 'bye'}
+
+
+def _normalized(text):
+    return re.sub(r"[^\w\s']", '', text).lower().strip()
+
+
+@dataclass
+class CompactionResult:
+    """Compacted transcript plus what was removed, in tokens and by pass"""
+    text: str
+    original_tokens: int
+    compacted_tokens: int
+    removed: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def saved_tokens(self):
+        return self.original_tokens - self.compacted_tokens
+
+    @property
+    def saved_share(self):
+        return self.saved_tokens / self.original_tokens if self.original_tokens else 0.0
+
+    def to_dict(self):
+        return {
+            'original_tokens': self.original_tokens,
+            'compacted_tokens': self.compacted_tokens,
+            'saved_tokens': self.saved_tokens,
+            'removed': dict(self.removed),
+        }
+
+
+class TranscriptCompactor:
+    """Strips hallucinated lines, fillers and repeats from a transcript"""
+
+    def __init__(self):
+        self.remove_fillers = os.getenv('COMPACTION_REMOVE_FILLERS', 'true').lower() == 'true'
+        self.min_loop_repeats = int(os.getenv('COMPACTION_MIN_LOOP_REPEATS', 3))
+        self.max_loop_words = int(os.getenv('COMPACTION_MAX_LOOP_WORDS', 8))
+
+    def drop_hallucinations(self, sentences, removed):
+        has_content = any(not ALWAYS_HALLUCINATED.match(sentence.strip())
+                          and not REPEATED_HALLUCINATION.match(sentence.strip()) for sentence in sentences)
+        kept = []
+        index = 0
+        while index < len(sentences):
+            sentence = sentences[index].strip()
+            if ALWAYS_HALLUCINATED.match(sentence):
+                removed['hallucinations'] += 1
+                index += 1
+                continue
+            if REPEATED_HALLUCINATION.match(sentence):
+                run_end = index + 1
+                while run_end < len(sentences) and REPEATED_HALLUCINATION.match(sentences[run_end].strip()):
+                    run_end += 1
+                run = run_end - index
+                # "Thank you. Bye." on its own is a real (if short) meeting; keep it
+                if run > 2 or (run > 1 and has_content):
+                    removed['hallucinations'] += run
+                    index = run_end
+                    continue
+            kept.append(sentence)
+            index += 1
+        return kept
+
+    def strip_disfluencies(self, sentence, removed):
+        if self.remove_fillers:
+            sentence, fillers = FILLER.subn(' ', sentence)
+            sentence, delimited = DELIMITED_FILLER.subn(' ', sentence)
+            fillers += delimited
+            if fillers:
+                sentence = DANGLING_PUNCTUATION.sub(r'\1', sentence)
+                removed['fillers'] += fillers
+        words = sentence.split()
+        kept = []
+        for word in words:
+            key = _normalized(word)
+            # Repeated numbers are usually meant ("20 20 vision", "1 1 2")
+            if (kept and key and key not in EMPHATIC_REPEATS and not any(char.isdigit() for char in key)
+                    and key == _normalized(kept[-1])):
+                repeats = 1
+                for previous in reversed(kept[:-1]):
+                    if _normalized(previous) != key:
+                        break
+                    repeats += 1
+                if repeats >= 2 or key not in LEGITIMATE_DOUBLES:
+                    # Keep the last copy: it carries the sentence's punctuation
+                    kept[-1] = word
+                    removed['stutters'] += 1
+                    continue
+            kept.append(word)
+        text = ' '.join(kept)
+        # Removing a leading filler leaves "so, we..." lower-cased; restore the capital
+        return text[:1].upper() + text[1:]
+
+    def collapse_loops(self, sentence, removed):
+        """Collapse a phrase of 2..max_loop_words words repeated min_loop_repeats+ times in a row"""
+        words = sentence.split()
+        keys = [_normalized(word) for word in words]
+        kept = []
+        index = 0
+        while index < len(words):
+            for length in range(min(self.max_loop_words, (len(words) - index) // 2), 1, -1):
+                phrase = keys[index:index + length]
+                repeats = 1
+                while keys[index + repeats * length:index + (repeats + 1) * length] == phrase:
+                    repeats += 1
+                if repeats >= self.min_loop_repeats:
+                    kept.extend(words[index:index + length])
+                    removed['loops'] += repeats - 1
+                    index += repeats * length
+                    break
+            else:
+                kept.append(words[index])
+                index += 1
+        return ' '.join(kept)
+
+    def collapse_repeated_sentences(self, sentences, removed):
+        kept = []
+        for sentence in sentences:
+            if kept and _normalized(sentence) == _normalized(kept[-1]):
+                removed['repeated_sentences'] += 1
+                continue
+            kept.append(sentence)
+        return kept
+
+    def compact(self, transcript, model='gpt-4') -> CompactionResult:
+        removed = {'hallucinations': 0, 'fillers': 0, 'stutters': 0, 'loops': 0, 'repeated_sentences': 0}
+        sentences = [self.collapse_loops(self.strip_disfluencies(sentence, removed), removed)
+                     for sentence in split_sentences(transcript or '')]
+        # After disfluencies, so "you you you." is recognised as the hallucinated "You."
+        sentences = self.drop_hallucinations([sentence for sentence in sentences if _normalized(sentence)], removed)
+        sentences = self.collapse_repeated_sentences(sentences, removed)
+        text = ' '.join(sentences)
+        return CompactionResult(text, count_tokens(transcript, model), count_tokens(text, model), removed)
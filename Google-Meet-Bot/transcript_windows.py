@@ -0,0 +1,73 @@
+import re
+
+try:
+    import tiktoken
+except ImportError:  # optional: falls back to a character-based estimate
+    tiktoken = None
+
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+')
+
+_encodings = {}
+
+
+def _encoding(model):
+    if model not in _encodings:
+        try:
+            _encodings[model] = tiktoken.encoding_for_model(model)
+        except KeyError:
+            _encodings[model] = tiktoken.get_encoding('cl100k_base')
+    return _encodings[model]
+
+
+def count_tokens(text, model='gpt-4'):
+    """Token count for text; roughly 4 characters per token when tiktoken is unavailable"""
+    if not text:
+        return 0
+    if tiktoken is None:
+        return len(text) // 4 + 1
+    return len(_encoding(model).encode(text, disallowed_special=()))
+
+
+def split_sentences(text):
+    return [sentence for sentence in SENTENCE_BOUNDARY.split(text.strip()) if sentence]
+
+
+def split_into_windows(text, max_tokens, model='gpt-4'):
+    """Pack whole sentences into windows of at most max_tokens.
+
+    A single sentence longer than the window (Whisper sometimes emits long runs
+    without punctuation) is broken on word boundaries instead.
+    """
+    windows = []
+    current, current_tokens = [], 0
+    for sentence in split_sentences(text):
+        tokens = count_tokens(sentence, model)
+        if tokens > max_tokens:
+            pieces = _split_words(sentence, max_tokens, model)
+        else:
+            pieces = [(sentence, tokens)]
+        for piece, piece_tokens in pieces:
+            if current and current_tokens + piece_tokens > max_tokens:
+                windows.append(' '.join(current))
+                current, current_tokens = [], 0
+            current.append(piece)
+            current_tokens += piece_tokens
+    if current:
+        windows.append(' '.join(current))
+    return windows
+
+
+def _split_words(sentence, max_tokens, model):
+    # Per-word counts summed up: slightly over-estimates, but stays linear in length
+    pieces = []
+    words, tokens = [], 0
+    for word in sentence.split():
+        word_tokens = count_tokens(' ' + word, model)
+        if words and tokens + word_tokens > max_tokens:
+            pieces.append((' '.join(words), tokens))
+            words, tokens = [], 0
+        words.append(word)
+        tokens += word_tokens
+    if words:
+        pieces.append((' '.join(words), tokens))
+    return pieces
@@ -0,0 +1,144 @@
+"""Speech-to-text engines behind SpeechToText.transcribe_audio.
+
+TRANSCRIPTION_BACKEND selects one:
+
+    openai          Whisper API (default); audio is encoded and uploaded, 25 MB per request
+    faster-whisper  local CTranslate2 Whisper on CPU (int8), no upload and no size limit
+"""
+import abc
+import os
+import threading
+
+from dotenv import load_dotenv
+
+import tracing
+
+load_dotenv()
+
+
+def _import_faster_whisper():
+    """(WhisperModel, BatchedInferencePipeline), imported on first use: CTranslate2 is slow to load"""
+    try:
+        from faster_whisper import WhisperModel
+    except ImportError:  # optional: pip install google-meet-bot[local]
+        return None, None
+    try:
+        from faster_whisper import BatchedInferencePipeline
+    except ImportError:  # faster-whisper < 1.1 decodes one window at a time
+        BatchedInferencePipeline = None
+    return WhisperModel, BatchedInferencePipeline
+
+
+class TranscriptionBackend(abc.ABC):
+    """Turns one audio file into text"""
+
+    name = 'base'
+    # Backends that upload want compact FLAC/Opus and files under the request size limit
+    uploads = True
+
+    def identity(self):
+        """Settings that change the transcript; part of the transcription cache key"""
+        return {'backend': self.name}
+
+    @abc.abstractmethod
+    def transcribe(self, audio_file_path, language):
+        """Transcript text of the whole file"""
+
+
+class OpenAIBackend(TranscriptionBackend):
+    name = 'openai'
+    uploads = True
+
+    def __init__(self, client, model):
+        self.client = client
+        self.model = model
+
+    def identity(self):
+        return {'backend': self.name, 'model': self.model}
+
+    def transcribe(self, audio_file_path, language):
+        upload_bytes = os.path.getsize(audio_file_path)
+        with open(audio_file_path, 'rb') as audio_file, \
+                tracing.span('openai.transcription', model=self.model, bytes=upload_bytes):
+            print("🔄 Sending to OpenAI Whisper API...")
+            tracing.count('openai.transcription_requests')
+            tracing.count('upload.bytes', upload_bytes)
+
+            # ✅ USE 'transcriptions' NOT 'translations'
+            return self.client.audio.transcriptions.create(
+                file=audio_file,
+                model=self.model,
+                response_format="text",
+                language=language
+            )
+
+
+class FasterWhisperBackend(TranscriptionBackend):
+    """Local Whisper through faster-whisper (CTranslate2), int8 on CPU by default.
+
+    The model is loaded once per process and shared, so a resident worker pays the
+    load only for its first meeting. Decodes on a shared model run one at a time:
+    CTranslate2 already uses every configured thread. With faster-whisper >= 1.1, speech segments
+    are decoded in batches of LOCAL_WHISPER_BATCH_SIZE.
+    """
+
+    name = 'faster-whisper'
+    uploads = False
+
+    # (model name, device, compute type, threads) -> (model, decode lock)
+    _models = {}
+    _models_lock = threading.Lock()
+
+    def __init__(self):
+        self.WhisperModel, self.BatchedInferencePipeline = _import_faster_whisper()
+        if self.WhisperModel is None:
+            raise RuntimeError("faster-whisper is not installed (pip install google-meet-bot[local])")
+        self.model_name = os.getenv('LOCAL_WHISPER_MODEL', 'small')
+        self.device = os.getenv('LOCAL_WHISPER_DEVICE', 'cpu')
+        self.compute_type = os.getenv('LOCAL_WHISPER_COMPUTE_TYPE', 'int8')
+        self.threads = int(os.getenv('LOCAL_WHISPER_THREADS', os.cpu_count() or 4))
+        self.batch_size = int(os.getenv('LOCAL_WHISPER_BATCH_SIZE', 8))
+        self.beam_size = int(os.getenv('LOCAL_WHISPER_BEAM_SIZE', 1))
+
+    def identity(self):
+        return {'backend': self.name, 'model': self.model_name, 'compute_type': self.compute_type,
+                'beam_size': self.beam_size, 'batch_size': self.batch_size}
+
+    def model(self):
+        """The shared model for these settings and the lock that serialises its decodes"""
+        key = (self.model_name, self.device, self.compute_type, self.threads)
+        with self._models_lock:
+            if key not in self._models:
+                print(f"🧠 Loading local Whisper '{self.model_name}' ({self.device}, {self.compute_type}, "
+                      f"{self.threads} threads)...")
+                with tracing.span('local.model_load', model=self.model_name):
+                    model = self.WhisperModel(self.model_name, device=self.device,
+                                              compute_type=self.compute_type, cpu_threads=self.threads)
+                self._models[key] = (model, threading.Lock())
+            return self._models[key]
+
+    def transcribe(self, audio_file_path, language):
+        model, decode_lock = self.model()
+        with decode_lock, tracing.span('local.transcription', model=self.model_name) as span:
+            print(f"🖥️ Transcribing locally with faster-whisper '{self.model_name}'...")
+            if self.BatchedInferencePipeline is not None and self.batch_size > 1:
+                segments, info = self.BatchedInferencePipeline(model=model).transcribe(
+                    audio_file_path, language=language, beam_size=self.beam_size, batch_size=self.batch_size)
+            else:
+                segments, info = model.transcribe(audio_file_path, language=language, beam_size=self.beam_size)
+            # Segments are generated lazily; decoding happens while joining them
+            text = ' '.join(segment.text.strip() for segment in segments).strip()
+            span['audio_seconds'] = info.duration
+        return text
+
+
+def create_backend(name=None, client=None, openai_model='whisper-1'):
+    """Backend named by TRANSCRIPTION_BACKEND (or name)"""
+    if name is None:
+        name = os.getenv('TRANSCRIPTION_BACKEND', 'openai')
+    name = name.lower()
+    if name == 'openai':
+        return OpenAIBackend(client, openai_model)
+    if name in ('faster-whisper', 'local'):
+        return FasterWhisperBackend()
+    raise ValueError(f"Unknown TRANSCRIPTION_BACKEND: {name}")
@@ -0,0 +1,143 @@
+import bisect
+import os
+import tempfile
+import wave
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+import numpy as np
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+@dataclass
+class TrimResult:
+    """Outcome of a silence-trimming pass.
+
+    ``time_map`` holds ``(trimmed_start, original_start, length)`` spans in seconds,
+    so any offset in the trimmed audio can be mapped back to the original recording.
+    """
+    path: str
+    original_seconds: float
+    trimmed_seconds: float
+    time_map: List[Tuple[float, float, float]] = field(default_factory=list)
+
+    @property
+    def removed_seconds(self):
+        return self.original_seconds - self.trimmed_seconds
+
+    def to_original(self, trimmed_seconds):
+        """Map an offset in the trimmed audio back to the original recording"""
+        if not self.time_map:
+            return trimmed_seconds
+        starts = [span[0] for span in self.time_map]
+        index = max(0, bisect.bisect_right(starts, trimmed_seconds) - 1)
+        trimmed_start, original_start, length = self.time_map[index]
+        return original_start + min(trimmed_seconds - trimmed_start, length)
+
+
+def frame_levels_db(data, frame_length, block_frames=2000):
+    """Per-frame RMS level in dBFS, computed block by block over (possibly memory-mapped) PCM"""
+    if np.issubdtype(data.dtype, np.integer):
+        scale = float(np.iinfo(data.dtype).max + 1)
+    else:
+        scale = 1.0
+    total_frames = len(data) // frame_length
+    levels = np.empty(total_frames, dtype=np.float32)
+    for first in range(0, total_frames, block_frames):
+        last = min(first + block_frames, total_frames)
+        block = np.asarray(data[first * frame_length:last * frame_length], dtype=np.float32) / scale
+        if block.ndim > 1:
+            block = block.mean(axis=1)
+        framed = block.reshape(last - first, frame_length)
+        rms = np.sqrt(np.mean(framed * framed, axis=1))
+        levels[first:last] = 20.0 * np.log10(np.maximum(rms, 1e-10))
+    return levels
+
+
+def silent_runs(speech):
+    """Return (start, end) frame indices of every run of False in a boolean mask"""
+    padded = np.concatenate(([True], speech, [True])).astype(np.int8)
+    edges = np.diff(padded)
+    return np.flatnonzero(edges == -1), np.flatnonzero(edges == 1)
+
+
+class VoiceActivityTrimmer:
+    """Frame-energy VAD that collapses long silent spans before upload"""
+
+    def __init__(self):
+        self.threshold_db = float(os.getenv('VAD_THRESHOLD_DB', -45))
+        self.min_silence_seconds = float(os.getenv('VAD_MIN_SILENCE_SECONDS', 2.0))
+        self.keep_silence_seconds = float(os.getenv('VAD_KEEP_SILENCE_SECONDS', 0.5))
+        self.frame_ms = 30
+
+    def speech_mask(self, levels_db, frame_seconds):
+        """Frames above threshold, widened by the kept padding on both sides"""
+        speech = levels_db > self.threshold_db
+        pad = int(round(self.keep_silence_seconds / 2 / frame_seconds))
+        if pad and speech.any():
+            speech = np.convolve(speech.astype(np.int8), np.ones(2 * pad + 1, dtype=np.int8), mode='same') > 0
+        return speech
+
+    def keep_ranges(self, speech, frame_length, total_samples, frame_seconds):
+        """Sample ranges to keep: everything except silent runs, which shrink to the kept padding"""
+        min_frames = int(round(self.min_silence_seconds / frame_seconds))
+        keep_frames = int(round(self.keep_silence_seconds / frame_seconds))
+        starts, ends = silent_runs(speech)
+        long_runs = (ends - starts) >= max(min_frames, keep_frames + 1)
+
+        ranges = []
+        position = 0
+        for start, end in zip(starts[long_runs].tolist(), ends[long_runs].tolist()):
+            cut_start = (start + keep_frames // 2) * frame_length
+            cut_end = (end - (keep_frames - keep_frames // 2)) * frame_length
+            if cut_start > position:
+                ranges.append((position, cut_start))
+            position = cut_end
+        if position < total_samples:
+            ranges.append((position, total_samples))
+        return ranges
+
+    def trim(self, audio_file_path, output_dir=None) -> TrimResult:
+        """Collapse silent spans; returns the original path untouched if nothing is removed"""
+        from scipy.io import wavfile
+
+        sample_rate, data = wavfile.read(audio_file_path, mmap=True)
+        total_samples = len(data)
+        original_seconds = total_samples / sample_rate
+        frame_length = max(1, int(sample_rate * self.frame_ms / 1000))
+        frame_seconds = frame_length / sample_rate
+
+        levels = frame_levels_db(data, frame_length)
+
+        speech = self.speech_mask(levels, frame_seconds)
+        if not speech.any():
+            return TrimResult(audio_file_path, original_seconds, 0.0, [])
+        ranges = self.keep_ranges(speech, frame_length, total_samples, frame_seconds)
+        if ranges == [(0, total_samples)]:
+            return TrimResult(audio_file_path, original_seconds, original_seconds,
+                              [(0.0, 0.0, original_seconds)])
+
+        if output_dir is None:
+            output_dir = tempfile.mkdtemp(prefix='vad_')
+        stem = os.path.splitext(os.path.basename(audio_file_path))[0]
+        output_path = os.path.join(output_dir, f'{stem}_voiced.wav')
+
+        time_map = []
+        written = 0
+        for start, end in ranges:
+            time_map.append((written / sample_rate, start / sample_rate, (end - start) / sample_rate))
+            written += end - start
+
+        if np.issubdtype(data.dtype, np.integer):
+            with wave.open(output_path, 'wb') as out:
+                out.setnchannels(1 if data.ndim == 1 else data.shape[1])
+                out.setsampwidth(data.dtype.itemsize)
+                out.setframerate(sample_rate)
+                for start, end in ranges:
+                    out.writeframes(np.ascontiguousarray(data[start:end]).tobytes())
+        else:
+            # The wave module only writes integer PCM; float recordings go through scipy
+            wavfile.write(output_path, sample_rate, np.concatenate([data[start:end] for start, end in ranges]))
+        return TrimResult(output_path, original_seconds, written / sample_rate, time_map)
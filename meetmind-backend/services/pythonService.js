@@ -1,6 +1,7 @@
 // backend/services/pythonService.js - COMPLETE FIXED VERSION
 const { spawn } = require('child_process');
 const path = require('path');
+const readline = require('readline');
 
 class PythonBotService {
   constructor() {
@@ -31,7 +32,9 @@ class PythonBotService {
         cliPath,
         '--meet-link', meetLink,
         '--duration', durationInSeconds.toString(),
-        '--bot-name', botName
+        '--bot-name', botName,
+        '--events', 'json',
+        '--events-fd', '3'
       ];
 
       console.log('🔧 Command:', this.venvPython);
@@ -46,7 +49,9 @@ class PythonBotService {
         env: {
           ...process.env,
           PYTHONUNBUFFERED: '1'
-        }
+        },
+        // fd 3 carries NDJSON events; stdout stays a human-readable log
+        stdio: ['pipe', 'pipe', 'pipe', 'pipe']
       });
 
       let output = '';
@@ -55,13 +60,42 @@ class PythonBotService {
       let summary = null;
       let keyPoints = null;
       let actionItems = null;
+      let result = null;
+      const events = [];
+
+      const formatField = (value) => Array.isArray(value)
+        ? value.map((item, i) => `${i + 1}. ${item}`).join('\n')
+        : value;
+
+      readline.createInterface({ input: pythonProcess.stdio[3] }).on('line', (line) => {
+        if (!line.trim()) return;
+        let event;
+        try {
+          event = JSON.parse(line);
+        } catch (err) {
+          console.error('⚠️  Unparseable bot event:', line);
+          return;
+        }
+        events.push(event);
+        if (event.event === 'started') {
+          audioPath = event.audio_path;
+        } else if (event.event === 'stage') {
+          console.log(`📍 Stage ${event.stage}: ${event.status}`);
+        } else if (event.event === 'result') {
+          result = event;
+          summary = formatField(event.abstract_summary);
+          keyPoints = formatField(event.key_points);
+          actionItems = formatField(event.action_items);
+          console.log('✅ Received structured result');
+        }
+      });
 
       pythonProcess.stdout.on('data', (data) => {
         const text = data.toString();
         console.log(text.trim());
         output += text;
 
-        // IMPROVED: Better parsing - check each line
+        // Marker scraping is only a fallback for bots that don't write the event stream
         const lines = text.split('\n');
         lines.forEach(line => {
           const trimmedLine = line.trim();
@@ -71,17 +105,17 @@ class PythonBotService {
             console.log('✅ Extracted audio path:', audioPath);
           }
           
-          if (trimmedLine.includes('[SUMMARY]')) {
+          if (!result && trimmedLine.includes('[SUMMARY]')) {
             summary = trimmedLine.split('[SUMMARY]')[1].trim();
             console.log('✅ Extracted summary');
           }
           
-          if (trimmedLine.includes('[KEY_POINTS]')) {
+          if (!result && trimmedLine.includes('[KEY_POINTS]')) {
             keyPoints = trimmedLine.split('[KEY_POINTS]')[1].trim();
             console.log('✅ Extracted key points');
           }
           
-          if (trimmedLine.includes('[ACTION_ITEMS]')) {
+          if (!result && trimmedLine.includes('[ACTION_ITEMS]')) {
             actionItems = trimmedLine.split('[ACTION_ITEMS]')[1].trim();
             console.log('✅ Extracted action items');
           }
@@ -110,6 +144,8 @@ class PythonBotService {
             summary,
             keyPoints,
             actionItems,
+            result,
+            events,
             exitCode: code
           });
         } else {